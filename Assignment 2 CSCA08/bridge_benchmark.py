@@ -0,0 +1,193 @@
+"""Benchmark harness for bridge_functions on synthetic bridge inventories.
+
+Synthetic inventories are written as CSV files in the same column layout
+as the provincial bridge data (two header lines followed by one line per
+bridge), with bridges clustered around Ontario cities. Timings are
+printed and written as JSON so that a run can be compared against an
+earlier baseline:
+
+    python bridge_benchmark.py --sizes 1000 10000 --output new.json
+    python bridge_benchmark.py --baseline new.json
+"""
+import argparse
+import csv
+import os
+import platform
+import random
+import sys
+import tempfile
+
+from bridge_functions import (read_data, format_data, get_closest_bridge,
+                              get_bridges_in_radius, assign_inspectors)
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_INSPECTOR_COUNTS = [1, 10, 50]
+DEFAULT_MAX_BRIDGES = 25
+
+# (latitude, longitude) of the cities bridges are clustered around, and
+# the standard deviation in degrees of each cluster.
+CITIES = [(43.6532, -79.3832), (45.4215, -75.6972), (43.2557, -79.8711),
+          (42.9849, -81.2453), (42.3149, -83.0364), (44.2312, -76.4860),
+          (46.4917, -80.9930), (48.3809, -89.2477), (44.3894, -79.6903),
+          (46.3091, -79.4608)]
+CLUSTER_SPREAD = 0.35
+
+HIGHWAYS = ['401', '403', '400', '417', '416', '11', '17', '69', '6', '7',
+            '35', '115', '427', '404', '402', '10', '24', '3', '8', '21']
+BCI_YEARS = 14
+
+
+def make_bridge_row(rng: random.Random, number: int) -> list[str]:
+    """Return an uncleaned row for a synthetic bridge numbered number, in the
+    column layout expected by format_data, using random numbers from rng.
+
+    >>> row = make_bridge_row(random.Random(0), 1)
+    >>> len(row)
+    27
+    >>> row[0]
+    '1 -   1/'
+    """
+    lat, lon = rng.choice(CITIES)
+    num_spans = rng.choice([1, 1, 2, 3, 4, 4, 5])
+    spans = [round(rng.uniform(6, 40), 1) for _ in range(num_spans)]
+    span_details = 'Total={}  {}'.format(
+        round(sum(spans), 1),
+        ''.join('({})={};'.format(index, span)
+                for index, span in enumerate(spans, 1)))
+    built = rng.randint(1930, 2015)
+    bci = rng.uniform(55, 95)
+    history = []
+    for _ in range(BCI_YEARS):
+        if rng.random() < 0.45:
+            history.append('')
+        else:
+            history.append(str(round(bci, 1)))
+            bci = min(100.0, bci + rng.uniform(-0.5, 2.5))
+    current = next((value for value in history if value != ''), '')
+    return ['{} - {:>3}/'.format(number // 1000 + 1, number % 1000),
+            'SYNTHETIC BRIDGE {}'.format(number), rng.choice(HIGHWAYS),
+            str(round(rng.gauss(lat, CLUSTER_SPREAD), 6)),
+            str(round(rng.gauss(lon, CLUSTER_SPREAD), 6)), str(built),
+            str(rng.randint(built, 2020)) if rng.random() < 0.6 else '',
+            str(rng.randint(built, 2020)) if rng.random() < 0.7 else '',
+            str(num_spans), span_details, str(round(sum(spans) + 2, 1)),
+            '{:02}/{:02}/{}'.format(rng.randint(1, 12), rng.randint(1, 28),
+                                    rng.randint(2010, 2013)),
+            current] + history
+
+
+def write_bridge_csv(path: str, size: int, seed: int = 0) -> None:
+    """Write a synthetic inventory of size bridges to the CSV file at path,
+    generated from the random seed seed.
+
+    Docstring examples not given since the function writes to a file.
+    """
+    rng = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(['ID', 'STRUCTURE', 'HWY NAME', 'LATITUDE',
+                         'LONGITUDE', 'YEAR BUILT', 'LAST MAJOR REHAB',
+                         'LAST MINOR REHAB', 'NUMBER OF SPANS',
+                         'SPAN DETAILS (m)', 'DECK / CULVERTS LENGTH (m)',
+                         'LAST INSPECTION DATE', 'CURRENT BCI',
+                         'HISTORICAL BCI'] + [''] * (BCI_YEARS - 1))
+        writer.writerow([''] * 13 + [str(2013 - i) for i in range(BCI_YEARS)])
+        for number in range(1, size + 1):
+            writer.writerow(make_bridge_row(rng, number))
+
+
+def load_bridges(path: str) -> list[list]:
+    """Return the formatted bridge data in the CSV file at path.
+
+    Docstring examples not given since the function reads from a file.
+    """
+    with open(path, encoding='utf-8') as csv_file:
+        bridges = read_data(csv_file)
+    format_data(bridges)
+    return bridges
+
+
+def run_size(path: str, size: int, inspector_counts: list[int],
+             max_bridges: int, seed: int, repeat: int) -> list[dict]:
+    """Return the benchmark results for the synthetic inventory of size
+    bridges stored at path, timing each case repeat times and keeping the
+    fastest (see benchmark_tools.time_repeated).
+
+    Precondition: benchmark_tools can be imported (see main)
+
+    Docstring examples not given since the function reads from a file.
+    """
+    from benchmark_tools import time_repeated
+    rng = random.Random(seed)
+    results = []
+
+    seconds, bridges = time_repeated(load_bridges, lambda: (path,), repeat)
+    results.append({'case': 'read_data+format_data', 'size': size,
+                    'seconds': seconds})
+
+    bridge_ids = [rng.randint(1, size) for _ in range(5)]
+    seconds = sum(time_repeated(get_closest_bridge,
+                                lambda: (bridges, bridge_id), repeat)[0]
+                  for bridge_id in bridge_ids)
+    results.append({'case': 'get_closest_bridge', 'size': size,
+                    'seconds': seconds / len(bridge_ids)})
+
+    centres = [rng.choice(CITIES) for _ in range(5)]
+    seconds = sum(time_repeated(get_bridges_in_radius,
+                                lambda: (bridges, lat, lon, 50), repeat)[0]
+                  for lat, lon in centres)
+    results.append({'case': 'get_bridges_in_radius', 'size': size,
+                    'seconds': seconds / len(centres)})
+
+    for count in inspector_counts:
+        inspectors = [[round(rng.gauss(lat, CLUSTER_SPREAD), 4),
+                       round(rng.gauss(lon, CLUSTER_SPREAD), 4)]
+                      for lat, lon in (rng.choice(CITIES)
+                                       for _ in range(count))]
+        seconds = time_repeated(assign_inspectors,
+                                lambda: (bridges, inspectors, max_bridges),
+                                repeat)[0]
+        results.append({'case': 'assign_inspectors[{}]'.format(count),
+                        'size': size, 'seconds': seconds})
+    return results
+
+
+def main(argv: list[str] = None) -> int:
+    """Run the benchmarks described by the command line arguments argv and
+    return the exit status: 1 if a regression against the baseline was
+    found, 0 otherwise.
+    """
+    # benchmark_tools is in the repository root, which is not a package.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+        __file__))))
+    from benchmark_tools import add_report_arguments, finish_report
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--inspectors', type=int, nargs='+',
+                        default=DEFAULT_INSPECTOR_COUNTS)
+    parser.add_argument('--max-bridges', type=int,
+                        default=DEFAULT_MAX_BRIDGES)
+    parser.add_argument('--seed', type=int, default=0)
+    add_report_arguments(parser)
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            path = os.path.join(directory, 'bridges_{}.csv'.format(size))
+            write_bridge_csv(path, size, args.seed)
+            for result in run_size(path, size, args.inspectors,
+                                   args.max_bridges, args.seed,
+                                   args.repeat):
+                print('{case} @ {size}: {seconds:.4f}s'.format(**result))
+                results.append(result)
+
+    report = {'python': platform.python_version(), 'seed': args.seed,
+              'max_bridges': args.max_bridges, 'repeat': args.repeat,
+              'results': results}
+    return finish_report(report, args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""Deterioration forecasts over the BCI histories of bridge data.
+
+A straight line is fitted by least squares to every bridge's BCI history
+against the years in which the BCIs were recorded. Those years are the
+historical BCI columns of the bridge CSV file (see read_bci_years), and
+format_bcis drops the blank columns of each bridge, so they are taken
+from the uncleaned data by get_inspection_years before format_data runs.
+The fitted trend projects the calendar year in which each bridge's BCI
+reaches the priority thresholds used by assign_inspectors.
+
+The trends are fitted one bridge at a time, by a plain loop over the
+bridges. Only the crossing years are computed column by column: one
+list comprehension per threshold over the whole inventory, rather than a
+function call per bridge and threshold.
+"""
+import csv
+from typing import TextIO
+
+from bridge_functions import THREE_BRIDGES, THREE_BRIDGES_UNCLEANED
+from constants import (ID_INDEX, BCIS_INDEX, HIGH_PRIORITY_BCI,
+                       MEDIUM_PRIORITY_BCI, LOW_PRIORITY_BCI)
+
+THRESHOLDS = [HIGH_PRIORITY_BCI, MEDIUM_PRIORITY_BCI, LOW_PRIORITY_BCI]
+
+# The years of the historical BCI columns of the provincial bridge data.
+EXAMPLE_BCI_YEARS = list(range(2013, 1999, -1))
+
+
+def read_bci_years(csv_file: TextIO) -> list[int]:
+    """Return the years of the historical BCI columns of the open bridge
+    CSV file csv_file, most recent first, read from its second header
+    line.
+
+    Precondition: csv_file is at its start, and the years of its
+                  historical BCI columns are all given
+
+    Docstring examples not given since the function reads from a file.
+    """
+    reader = csv.reader(csv_file)
+    next(reader)
+    return [int(year) for year in next(reader)[BCIS_INDEX + 1:] if year]
+
+
+def get_inspection_years(data: list[list[str]],
+                         column_years: list[int]) -> list[list[int]]:
+    """Return, for each bridge in the uncleaned bridge data data, the
+    years in which its historical BCIs were recorded, in the order of the
+    BCI history built by format_bcis, where column_years are the years of
+    the historical BCI columns (see read_bci_years).
+
+    >>> years = get_inspection_years(THREE_BRIDGES_UNCLEANED,
+    ...                              EXAMPLE_BCI_YEARS)
+    >>> years[0]
+    [2012, 2010, 2008, 2006, 2004, 2002, 2001]
+    >>> years[2]
+    [2013, 2011, 2009, 2007, 2006, 2005, 2003, 2001]
+    """
+    return [[year for year, bci in zip(column_years, bridge[BCIS_INDEX + 1:])
+             if bci != ''] for bridge in data]
+
+
+THREE_BRIDGES_YEARS = get_inspection_years(THREE_BRIDGES_UNCLEANED,
+                                           EXAMPLE_BCI_YEARS)
+
+
+def fit_bci_trends(bridge_data: list[list],
+                   inspection_years: list[list[int]]) -> list[list[float]]:
+    """Return [intercept, rate] for each bridge in bridge_data, where the
+    least-squares line through the bridge's BCI history, recorded in the
+    years in the corresponding list of inspection_years (see
+    get_inspection_years), has value intercept in the most recent of
+    those years and changes by rate BCI points per year. Bridges with
+    BCIs from fewer than two years have rate 0.
+
+    Raise ValueError if a bridge's BCI history and inspection years have
+    different lengths.
+
+    >>> trends = fit_bci_trends(THREE_BRIDGES, THREE_BRIDGES_YEARS)
+    >>> [[round(value, 3) for value in trend] for trend in trends]
+    [[70.457, -0.073], [69.142, -0.171], [71.09, -0.54]]
+    """
+    trends = []
+    for bridge, years in zip(bridge_data, inspection_years):
+        bcis = bridge[BCIS_INDEX]
+        count = len(bcis)
+        if count != len(years):
+            raise ValueError('bridge {} has {} BCIs but {} inspection '
+                             'years'.format(bridge[ID_INDEX], count,
+                                            len(years)))
+        if count == 0:
+            trends.append([0.0, 0.0])
+            continue
+        # Measure years from the most recent inspection, so that the
+        # intercept is the fitted BCI in that year.
+        latest = years[0]
+        sum_x = sum_y = sum_xx = sum_xy = 0.0
+        for year, bci in zip(years, bcis):
+            x = year - latest
+            sum_x += x
+            sum_y += bci
+            sum_xx += x * x
+            sum_xy += x * bci
+        denominator = count * sum_xx - sum_x * sum_x
+        rate = ((count * sum_xy - sum_x * sum_y) / denominator
+                if denominator else 0.0)
+        trends.append([(sum_y - rate * sum_x) / count, rate])
+    return trends
+
+
+def get_crossing_year(bci: float, intercept: float, rate: float,
+                      year: float, threshold: float) -> float:
+    """Return the year in which a bridge last inspected in year year, with
+    current BCI bci and BCI trend (intercept, rate), reaches BCI threshold,
+    as a float rounded to one decimal place. Return year if bci is already
+    at or below threshold, and None if the trend never reaches threshold
+    or year is None.
+
+    >>> get_crossing_year(72.0, 72.0, -0.5, 2012, 70)
+    2016.0
+    >>> get_crossing_year(65.0, 66.0, -0.5, 2012, 70)
+    2012.0
+    >>> get_crossing_year(90.0, 90.0, 0.1, 2012, 70) is None
+    True
+    """
+    return get_crossing_years([bci], [intercept], [rate],
+                              [None if year is None else float(year)],
+                              threshold)[0]
+
+
+def get_crossing_years(bcis: list[float], intercepts: list[float],
+                       rates: list[float], years: list[float],
+                       threshold: float) -> list[float]:
+    """Return get_crossing_year(bcis[i], intercepts[i], rates[i], years[i],
+    threshold) for each index i of the equally long lists bcis,
+    intercepts, rates and years, where each year is a float or None.
+
+    >>> get_crossing_years([72.0, 65.0, 72.0], [72.0, 66.0, 72.0],
+    ...                    [-0.5, -0.5, -0.5], [2012.0, 2013.0, None], 70)
+    [2016.0, 2013.0, None]
+    """
+    return [None if year is None
+            else year if bci <= threshold
+            else None if rate >= 0
+            else year if intercept <= threshold
+            else round(year + (threshold - intercept) / rate, 1)
+            for bci, intercept, rate, year
+            in zip(bcis, intercepts, rates, years)]
+
+
+def forecast_priority_years(bridge_data: list[list],
+                            inspection_years: list[list[int]]
+                            ) -> dict[int, list]:
+    """Return a dict that maps the ID of each bridge in bridge_data to the
+    calendar years in which its BCI is projected to reach
+    HIGH_PRIORITY_BCI, MEDIUM_PRIORITY_BCI and LOW_PRIORITY_BCI, in that
+    order (see get_crossing_year), counting from the year of its most
+    recent BCI in inspection_years (see get_inspection_years). Bridges
+    without a BCI get [None, None, None].
+
+    >>> forecasts = forecast_priority_years(THREE_BRIDGES,
+    ...                                     THREE_BRIDGES_YEARS)
+    >>> forecasts[1]
+    [2154.8, 2018.2, 2012.0]
+    >>> forecasts[3]
+    [2033.5, 2015.0, 2013.0]
+    """
+    trends = fit_bci_trends(bridge_data, inspection_years)
+    bcis = [bridge[BCIS_INDEX][0] if bridge[BCIS_INDEX] else 0.0
+            for bridge in bridge_data]
+    intercepts = [intercept for intercept, _ in trends]
+    rates = [rate for _, rate in trends]
+    years = [float(bridge_years[0]) if bridge_years else None
+             for bridge_years in inspection_years]
+    columns = [get_crossing_years(bcis, intercepts, rates, years, threshold)
+               for threshold in THRESHOLDS]
+    return dict(zip([bridge[ID_INDEX] for bridge in bridge_data],
+                    map(list, zip(*columns))))
+
+
+def get_bridges_due_by(bridge_data: list[list],
+                       inspection_years: list[list[int]], year: float,
+                       level: int = 0) -> list[int]:
+    """Return the IDs of the bridges in bridge_data, with BCIs recorded in
+    inspection_years (see get_inspection_years), projected to reach the
+    priority threshold THRESHOLDS[level] by year year.
+
+    >>> get_bridges_due_by(THREE_BRIDGES, THREE_BRIDGES_YEARS, 2035, 1)
+    [1, 2, 3]
+    >>> get_bridges_due_by(THREE_BRIDGES, THREE_BRIDGES_YEARS, 2035)
+    [3]
+    """
+    forecasts = forecast_priority_years(bridge_data, inspection_years)
+    return [bridge_id for bridge_id, years in forecasts.items()
+            if years[level] is not None and years[level] <= year]
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
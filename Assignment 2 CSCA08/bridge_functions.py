@@ -1,4 +1,4 @@
-CA"""Program for formatting and assigning values to Ontario Bridges"""
+"""Program for formatting and assigning values to Ontario Bridges"""
 import csv
 from copy import deepcopy
 from math import sin, cos, asin, radians, sqrt, inf
@@ -144,6 +144,136 @@ def get_total_length_on_hwy(bridge_data: list[list], hwy: str) -> float:
     return total_length
 
 
+def make_highway_summary(bridge_data: list[list]) -> dict[str, dict]:
+    """Return a dict that maps each highway in bridge_data to the aggregate
+    statistics of the bridges on it, computed in a single pass over
+    bridge_data.
+
+    >>> summary = make_highway_summary(THREE_BRIDGES)
+    >>> sorted(summary)
+    ['403', '6']
+    >>> summary['403'] == {'count': 2, 'length': 126.0, 'spans': 8,
+    ...                    'span_length': 124.4, 'bci_total': 143.8,
+    ...                    'bci_count': 2, 'last_rehab': '2014'}
+    True
+    """
+    summary = {}
+    for bridge in bridge_data:
+        stats = summary.get(bridge[HIGHWAY_INDEX])
+        if stats is None:
+            stats = {'count': 0, 'length': 0.0, 'spans': 0,
+                     'span_length': 0.0, 'bci_total': 0.0, 'bci_count': 0,
+                     'last_rehab': ''}
+            summary[bridge[HIGHWAY_INDEX]] = stats
+        stats['count'] += 1
+        stats['length'] += bridge[LENGTH_INDEX]
+        stats['spans'] += bridge[NUM_SPANS_INDEX]
+        stats['span_length'] += sum(bridge[SPAN_DETAILS_INDEX])
+        if bridge[BCIS_INDEX]:
+            stats['bci_total'] += bridge[BCIS_INDEX][0]
+            stats['bci_count'] += 1
+        stats['last_rehab'] = max(stats['last_rehab'],
+                                  bridge[LAST_MAJOR_INDEX],
+                                  bridge[LAST_MINOR_INDEX])
+    return summary
+
+
+# Summaries computed by get_highway_summary, keyed on id(bridge_data).
+# Each entry is [bridge_data, number of bridges, summary]: keeping
+# bridge_data itself in the entry means its id cannot be reused by
+# another list while the entry is cached.
+HIGHWAY_CACHE_SIZE = 8
+_highway_cache = {}
+
+
+def _get_highway_summary(bridge_data: list[list]) -> dict[str, dict]:
+    """Return the cached highway summary of bridge_data, computing and
+    caching it first if bridge_data has no up-to-date summary. The
+    summary is shared with the cache, and must not be modified.
+    """
+    entry = _highway_cache.pop(id(bridge_data), None)
+    if (entry is None or entry[0] is not bridge_data
+            or entry[1] != len(bridge_data)):
+        entry = [bridge_data, len(bridge_data),
+                 make_highway_summary(bridge_data)]
+    _highway_cache[id(bridge_data)] = entry
+    if len(_highway_cache) > HIGHWAY_CACHE_SIZE:
+        del _highway_cache[next(iter(_highway_cache))]
+    return entry[2]
+
+
+def get_highway_summary(bridge_data: list[list]) -> dict[str, dict]:
+    """Return a copy of the highway summary of bridge_data (see
+    make_highway_summary), reusing the cached summary if bridge_data was
+    summarized before.
+
+    The cached summary is kept up to date by inspect_bridges and
+    add_rehab, and is discarded by format_data. Call clear_highway_cache
+    after changing bridge_data in any other way.
+
+    >>> bridges = deepcopy(THREE_BRIDGES)
+    >>> summary = get_highway_summary(bridges)
+    >>> summary['6']['count']
+    1
+    >>> summary['6']['count'] = 0
+    >>> get_highway_summary(bridges)['6']['count']
+    1
+    """
+    return {hwy: dict(stats)
+            for hwy, stats in _get_highway_summary(bridge_data).items()}
+
+
+def get_highway_stats(bridge_data: list[list], hwy: str) -> dict:
+    """Return the aggregate statistics of the bridges on highway hwy in
+    bridge_data, including the average of their most recent BCIs. If no
+    bridge is on highway hwy, return {}.
+
+    >>> stats = get_highway_stats(THREE_BRIDGES, '403')
+    >>> stats['count'], stats['length'], stats['average_bci']
+    (2, 126.0, 71.9)
+    >>> get_highway_stats(THREE_BRIDGES, '401')
+    {}
+    """
+    stats = _get_highway_summary(bridge_data).get(hwy)
+    if stats is None:
+        return {}
+    stats = dict(stats)
+    if stats['bci_count'] == 0:
+        stats['average_bci'] = 0
+    else:
+        stats['average_bci'] = round(stats['bci_total'] / stats['bci_count'],
+                                     4)
+    return stats
+
+
+def _get_cached_highway_summary(bridge_data: list[list]
+                                ) -> dict[str, dict]:
+    """Return the cached highway summary of bridge_data, for updating in
+    place, or None if bridge_data has no up-to-date summary in the cache.
+    """
+    entry = _highway_cache.get(id(bridge_data))
+    if (entry is None or entry[0] is not bridge_data
+            or entry[1] != len(bridge_data)):
+        return None
+    return entry[2]
+
+
+def clear_highway_cache(bridge_data: list[list] = None) -> None:
+    """Discard the cached highway summary of bridge_data, or every cached
+    highway summary if bridge_data is None.
+
+    >>> bridges = deepcopy(THREE_BRIDGES)
+    >>> summary = get_highway_summary(bridges)
+    >>> clear_highway_cache(bridges)
+    >>> _get_cached_highway_summary(bridges) is None
+    True
+    """
+    if bridge_data is None:
+        _highway_cache.clear()
+    else:
+        _highway_cache.pop(id(bridge_data), None)
+
+
 def get_distance_between(bridge1: list, bridge2: list) -> int:
     """Returns the distance between two bridges, bridge1 and bridge2.
     
@@ -353,8 +483,16 @@ def inspect_bridges(bridge_data: list[list], bridge_ids: list[int], date: str,
     True
     """
     new_bridge_data = []
+    summary = _get_cached_highway_summary(bridge_data)
     for bridge in bridge_data:
         if bridge[ID_INDEX] in bridge_ids:
+            if summary is not None:
+                stats = summary[bridge[HIGHWAY_INDEX]]
+                if bridge[BCIS_INDEX]:
+                    stats['bci_total'] += bci - bridge[BCIS_INDEX][0]
+                else:
+                    stats['bci_total'] += bci
+                    stats['bci_count'] += 1
             bridge[LAST_INSPECTED_INDEX] = date
             bridge[BCIS_INDEX].insert(0, bci)
             new_bridge_data.append(bridge)
@@ -382,12 +520,16 @@ def add_rehab(bridge_data: list[list], bridge_id: int, date: str, major:
     ...               70.0, 70.3, 70.5, 70.7, 72.9]]
     False
     """
+    summary = _get_cached_highway_summary(bridge_data)
     for bridge in bridge_data:
         if bridge[ID_INDEX] == bridge_id:
             if major:
                 bridge[LAST_MAJOR_INDEX] = date[-4:]
             else:
                 bridge[LAST_MINOR_INDEX] = date[-4:]
+            if summary is not None:
+                stats = summary[bridge[HIGHWAY_INDEX]]
+                stats['last_rehab'] = max(stats['last_rehab'], date[-4:])
 
 
 # We provide the header and doctring for this function to help get you started.
@@ -414,6 +556,7 @@ def format_data(data: list[list[str]]) -> None:
         count = count + 1
     data.clear()
     data.extend(updated_bridges)
+    clear_highway_cache(data)
 
 
 # This is a suggested helper function for format_data. We provide the
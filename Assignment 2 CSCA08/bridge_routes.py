@@ -0,0 +1,164 @@
+"""Route-ordered inspection itineraries for the bridges assigned to
+inspectors by bridge_functions.assign_inspectors.
+
+Each inspector starts at their own location and visits their bridges in
+an order found with the nearest-neighbour heuristic, improved with 2-opt
+moves restricted to each bridge's closest neighbours.
+"""
+from math import asin, cos, radians, sin, sqrt
+
+from bridge_functions import THREE_BRIDGES, calculate_distance
+from constants import LAT_INDEX, LON_INDEX, EARTH_RADIUS
+
+# Number of closest neighbours considered for each stop by 2-opt.
+NEIGHBOURS = 8
+
+
+def make_distance_matrix(points: list[list[float]]) -> list[list[float]]:
+    """Return the matrix of haversine distances in kilometers between the
+    (latitude, longitude) pairs in points, as calculate_distance computes
+    them but without rounding.
+
+    >>> matrix = make_distance_matrix([[43.167233, -80.275567],
+    ...                                [43.164531, -80.251582]])
+    >>> matrix[0][0]
+    0.0
+    >>> round(matrix[0][1], 3) == round(matrix[1][0], 3) == 1.968
+    True
+    """
+    # Distances are computed from points on the unit sphere: half the
+    # chord length between two points is the square root of the
+    # haversine of the angle between them.
+    vectors = []
+    for lat, lon in points:
+        lat, lon = radians(lat), radians(lon)
+        vectors.append((cos(lat) * cos(lon), cos(lat) * sin(lon), sin(lat)))
+    diameter = 2 * EARTH_RADIUS
+    matrix = []
+    for i, (x1, y1, z1) in enumerate(vectors):
+        # The matrix is symmetric, so only distances to later points are
+        # computed; earlier ones are copied from the rows already built.
+        row = [matrix[j][i] for j in range(i)]
+        row.extend(diameter * asin(min(1.0, sqrt(
+            (x1 - x2) * (x1 - x2) + (y1 - y2) * (y1 - y2)
+            + (z1 - z2) * (z1 - z2)) / 2))
+                   for x2, y2, z2 in vectors[i:])
+        matrix.append(row)
+    return matrix
+
+
+def order_nearest_neighbour(matrix: list[list[float]]) -> list[int]:
+    """Return an ordering of the points in distance matrix matrix that
+    starts at point 0 and always moves to the closest unvisited point.
+
+    >>> order_nearest_neighbour([[0, 5, 1], [5, 0, 3], [1, 3, 0]])
+    [0, 2, 1]
+    """
+    unvisited = set(range(1, len(matrix)))
+    order = [0]
+    while unvisited:
+        row = matrix[order[-1]]
+        closest = min(unvisited, key=row.__getitem__)
+        unvisited.remove(closest)
+        order.append(closest)
+    return order
+
+
+def improve_two_opt(order: list[int], matrix: list[list[float]]) -> None:
+    """Modify the open path order over distance matrix matrix by reversing
+    segments until no reversal between a stop and one of its closest
+    neighbours makes the path shorter. The first stop never moves.
+
+    >>> matrix = make_distance_matrix([[0, 0], [0, 3], [0, 1], [0, 2]])
+    >>> order = [0, 1, 2, 3]
+    >>> improve_two_opt(order, matrix)
+    >>> order
+    [0, 2, 3, 1]
+    """
+    size = len(order)
+    if size < 4:
+        return
+    closest = [sorted(range(size), key=row.__getitem__)[1:NEIGHBOURS + 1]
+               for row in matrix]
+    position = [0] * size
+    for index, point in enumerate(order):
+        position[point] = index
+
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, size):
+            before, point = order[i - 1], order[i]
+            removed = matrix[before][point]
+            for other in closest[before]:
+                j = position[other]
+                if j > i:
+                    # Reverse order[i..j]: before-other, point-after.
+                    start, end = i, j
+                    gain = removed - matrix[before][other]
+                    if j + 1 < size:
+                        after = order[j + 1]
+                        gain += matrix[other][after] - matrix[point][after]
+                elif 0 < j < i - 1:
+                    # Reverse order[j + 1..i - 1]: other-before, next-point.
+                    start, end = j + 1, i - 1
+                    following = order[j + 1]
+                    gain = (removed + matrix[other][following]
+                            - matrix[other][before]
+                            - matrix[following][point])
+                else:
+                    continue
+                if gain > 1e-9:
+                    order[start:end + 1] = order[start:end + 1][::-1]
+                    for index in range(start, end + 1):
+                        position[order[index]] = index
+                    improved = True
+                    break
+
+
+def plan_route(bridge_data: list[list], start: list[float],
+               bridge_ids: list[int]) -> tuple[list[int], float]:
+    """Return the bridge IDs bridge_ids from bridge_data in the order an
+    inspector at location start should visit them, and the length in
+    kilometers of that route.
+
+    >>> plan_route(THREE_BRIDGES, [45.0, -81.3], [1, 2, 3])
+    ([3, 1, 2], 231.379)
+    >>> plan_route(THREE_BRIDGES, [43.10, -80.15], [])
+    ([], 0.0)
+    """
+    points = [start]
+    for bridge_id in bridge_ids:
+        bridge = bridge_data[bridge_id - 1]
+        points.append([bridge[LAT_INDEX], bridge[LON_INDEX]])
+    matrix = make_distance_matrix(points)
+    order = order_nearest_neighbour(matrix)
+    improve_two_opt(order, matrix)
+
+    route = [bridge_ids[point - 1] for point in order[1:]]
+    length = 0.0
+    for index in range(1, len(order)):
+        lat1, lon1 = points[order[index - 1]]
+        lat2, lon2 = points[order[index]]
+        length += calculate_distance(lat1, lon1, lat2, lon2)
+    return route, round(length, 3)
+
+
+def plan_itineraries(bridge_data: list[list], inspectors: list[list[float]],
+                     assignments: list[list[int]]
+                     ) -> list[tuple[list[int], float]]:
+    """Return a route for each inspector in inspectors, ordering the bridges
+    from bridge_data assigned to them in assignments (as returned by
+    assign_inspectors), together with the length of each route.
+
+    >>> plan_itineraries(THREE_BRIDGES, [[43.20, -80.35], [45.0368, -81.34]],
+    ...                  [[2, 1], [3]])
+    [([1, 2], 9.018), ([3], 0.331)]
+    """
+    return [plan_route(bridge_data, inspector, bridge_ids)
+            for inspector, bridge_ids in zip(inspectors, assignments)]
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
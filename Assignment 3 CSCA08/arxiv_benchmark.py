@@ -0,0 +1,230 @@
+"""Benchmark and profiling harness for arxiv_functions on synthetic dumps.
+
+Synthetic dumps are written in the same text format as the arxiv data
+(ID, title, created and modified dates, one author per line, a blank
+line, the abstract and END), with the number of articles per author
+following a power law, as in the real data. Timings and throughputs are
+printed and written as JSON so that a run can be compared against an
+earlier baseline, and cProfile reports of the slowest functions can be
+written for each case:
+
+    python arxiv_benchmark.py --sizes 1000 10000 --output new.json
+    python arxiv_benchmark.py --baseline new.json --profile reports
+"""
+import argparse
+import copy
+import cProfile
+import io
+import os
+import platform
+import pstats
+import random
+import sys
+import tempfile
+from typing import Callable
+
+from arxiv_functions import (read_arxiv_file, make_author_to_articles,
+                             get_coauthors, suggest_collaborators,
+                             get_most_published_authors,
+                             keep_prolific_authors)
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_QUERIES = 5
+DEFAULT_MIN_PUBLICATIONS = 3
+PROFILE_LINES = 15
+
+# The number of distinct authors per article in the dump.
+AUTHORS_PER_ARTICLE = [1, 1, 2, 2, 2, 3, 3, 4, 5, 8]
+ABSTRACT_WORDS = ['we', 'present', 'a', 'proof', 'that', 'the', 'graph',
+                  'model', 'is', 'optimal', 'under', 'mild', 'assumptions',
+                  'and', 'study', 'its', 'spectrum', 'in', 'high',
+                  'dimensions']
+
+
+def make_author(rng: random.Random, size: int) -> tuple[str, str]:
+    """Return a random author for a dump of size articles, using random
+    numbers from rng: author number k, from 0 to size - 1, is chosen with
+    probability about proportional to 1 / (k + 1), so that a few authors
+    write many articles and most write one.
+
+    >>> make_author(random.Random(0), 1000)
+    ('Author340', 'First49')
+    """
+    number = int(size ** rng.random()) - 1
+    return 'Author' + str(number), 'First' + str(number % 97)
+
+
+def make_article_text(rng: random.Random, number: int, size: int) -> str:
+    """Return the text of a synthetic article numbered number for a dump
+    of size articles, using random numbers from rng.
+
+    >>> lines = make_article_text(random.Random(1), 7, 10).splitlines()
+    >>> lines[:4]
+    ['0000007', 'Synthetic article 7', '2002-05-04', '']
+    >>> lines[4:6]
+    ['Author2,First2', 'Author5,First5']
+    >>> lines[-3:-2] + lines[-1:]
+    ['', 'END']
+    """
+    authors = set()
+    for _ in range(rng.choice(AUTHORS_PER_ARTICLE)):
+        authors.add(make_author(rng, size))
+    created = '{}-{:02}-{:02}'.format(rng.randint(2000, 2023),
+                                      rng.randint(1, 12), rng.randint(1, 28))
+    modified = created if rng.random() < 0.3 else ''
+    abstract = ' '.join(rng.choices(ABSTRACT_WORDS,
+                                    k=rng.randint(2, 60)))
+    lines = ['{:07}'.format(number), 'Synthetic article ' + str(number),
+             created, modified]
+    lines.extend(last + ',' + first for last, first in sorted(authors))
+    lines.extend(['', abstract, 'END'])
+    return '\n'.join(lines) + '\n'
+
+
+def write_arxiv_dump(path: str, size: int, seed: int = 0) -> None:
+    """Write a synthetic dump of size articles to the file at path,
+    generated from the random seed seed.
+
+    Docstring examples not given since the function writes to a file.
+    """
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as dump_file:
+        for number in range(size):
+            dump_file.write(make_article_text(rng, number, size))
+
+
+def profile_call(function: Callable, *args: object,
+                 lines: int = PROFILE_LINES) -> str:
+    """Return a cProfile report of the lines functions with the largest
+    cumulative time in function(*args).
+
+    >>> 'sorted' in profile_call(sorted, [3, 1, 2])
+    True
+    """
+    profile = cProfile.Profile()
+    profile.runcall(function, *args)
+    report = io.StringIO()
+    pstats.Stats(profile, stream=report).sort_stats(
+        pstats.SortKey.CUMULATIVE).print_stats(lines)
+    return report.getvalue()
+
+
+def read_dump(path: str) -> dict:
+    """Return the arxiv data in the dump at path.
+
+    Docstring examples not given since the function reads from a file.
+    """
+    with open(path, encoding='utf-8') as dump_file:
+        return read_arxiv_file(dump_file)
+
+
+def get_cases(path: str, queries: int, min_publications: int,
+              seed: int) -> list[tuple[str, Callable, Callable, int]]:
+    """Return the benchmark cases for the dump at path, each as (name,
+    function, a function that returns a fresh tuple of arguments, number
+    of calls), where the arguments of the query cases are queries authors
+    chosen using seed.
+
+    Docstring examples not given since the function reads from a file.
+    """
+    id_to_article = read_dump(path)
+    by_author = make_author_to_articles(id_to_article)
+    rng = random.Random(seed)
+    authors = rng.sample(sorted(by_author), min(queries, len(by_author)))
+    return [
+        ('read_arxiv_file', read_dump, lambda: (path,), 1),
+        ('make_author_to_articles', make_author_to_articles,
+         lambda: (id_to_article,), 1),
+        ('get_coauthors', query_each,
+         lambda: (get_coauthors, id_to_article, authors), len(authors)),
+        ('suggest_collaborators', query_each,
+         lambda: (suggest_collaborators, id_to_article, authors),
+         len(authors)),
+        ('get_most_published_authors', get_most_published_authors,
+         lambda: (id_to_article,), 1),
+        # keep_prolific_authors modifies its argument, so each call gets
+        # its own copy.
+        ('keep_prolific_authors', keep_prolific_authors,
+         lambda: (copy.copy(id_to_article), min_publications), 1)]
+
+
+def query_each(function: Callable, id_to_article: dict,
+               authors: list) -> None:
+    """Call function(id_to_article, author) for each author in authors.
+
+    >>> query_each(get_coauthors, {}, [('Doe', 'Jane')])
+    """
+    for author in authors:
+        function(id_to_article, author)
+
+
+def run_size(path: str, size: int, queries: int, min_publications: int,
+             seed: int, repeat: int, profile_dir: str = None) -> list[dict]:
+    """Return the benchmark results for the dump of size articles stored at
+    path, timing each case repeat times and keeping the fastest (see
+    benchmark_tools.time_repeated), and writing a cProfile report of each
+    case to profile_dir if it is not None.
+
+    Precondition: benchmark_tools can be imported (see main)
+
+    Docstring examples not given since the function reads from a file.
+    """
+    from benchmark_tools import time_repeated
+    results = []
+    for name, function, make_args, calls in get_cases(
+            path, queries, min_publications, seed):
+        if profile_dir is not None:
+            report_name = '{}_{}.txt'.format(name, size)
+            with open(os.path.join(profile_dir, report_name), 'w',
+                      encoding='utf-8') as report_file:
+                report_file.write(profile_call(function, *make_args()))
+        seconds = time_repeated(function, make_args, repeat)[0]
+        results.append({'case': name, 'size': size,
+                        'seconds': seconds / calls,
+                        'articles_per_second': size * calls / seconds
+                        if seconds else None})
+    return results
+
+
+def main(argv: list[str] = None) -> int:
+    """Run the benchmarks described by the command line arguments argv and
+    return the exit status: 1 if a regression against the baseline was
+    found, 0 otherwise.
+    """
+    # benchmark_tools is in the repository root, which is not a package.
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+        __file__))))
+    from benchmark_tools import add_report_arguments, finish_report
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--queries', type=int, default=DEFAULT_QUERIES)
+    parser.add_argument('--min-publications', type=int,
+                        default=DEFAULT_MIN_PUBLICATIONS)
+    parser.add_argument('--seed', type=int, default=0)
+    add_report_arguments(parser)
+    parser.add_argument('--profile',
+                        help='write cProfile reports to this directory')
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        os.makedirs(args.profile, exist_ok=True)
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            path = os.path.join(directory, 'arxiv_{}.txt'.format(size))
+            write_arxiv_dump(path, size, args.seed)
+            for result in run_size(path, size, args.queries,
+                                   args.min_publications, args.seed,
+                                   args.repeat, args.profile):
+                print('{case} @ {size}: {seconds:.4f}s'.format(**result))
+                results.append(result)
+
+    report = {'python': platform.python_version(), 'seed': args.seed,
+              'queries': args.queries, 'repeat': args.repeat,
+              'min_publications': args.min_publications, 'results': results}
+    return finish_report(report, args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
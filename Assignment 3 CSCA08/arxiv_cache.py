@@ -0,0 +1,359 @@
+"""CSCA08 Assignment 3: arxiv.org
+
+A binary cache of parsed arxiv data, so that a process can start without
+parsing the text file again. The cache file is memory-mapped and decoded
+only as fields are read.
+
+Layout of a cache file (native byte order, every section 8-byte aligned):
+
+    header       HEADER: magic, version, source mtime and size, counts
+    offsets      array('Q') of string_count + 1 offsets into the text
+    text         the UTF-8 encoded strings, one after another
+    records      array('i') of RECORD_WIDTH ints per article, sorted by
+                 ID: string numbers of ID, TITLE, CREATED, MODIFIED and
+                 ABSTRACT (-1 for None), first author link, author count
+    links        array('I') of the author numbers of every article
+    names        array('I') of (last, first) string numbers per author,
+                 sorted by name
+    postings     array('I') of author_count + 1 offsets, followed by the
+                 article numbers of each author's articles, in ID order
+
+"""
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+import mmap
+import os
+import struct
+import tempfile
+from typing import Iterator
+
+from arxiv_functions import read_arxiv_file
+from constants import (ID, TITLE, CREATED, MODIFIED, AUTHORS, ABSTRACT,
+                       NameType, ArxivType)
+
+MAGIC = b'ARXC'
+VERSION = 1
+# magic, version, source mtime in ns, source size, number of strings,
+# articles, authors and author links.
+HEADER = struct.Struct('=4sIqqQQQQ')
+
+STRING_FIELDS = [ID, TITLE, CREATED, MODIFIED, ABSTRACT]
+RECORD_WIDTH = len(STRING_FIELDS) + 2
+ARTICLE_FIELDS = [ID, TITLE, CREATED, MODIFIED, AUTHORS, ABSTRACT]
+NONE = -1
+
+
+def align(size: int) -> int:
+    """Return size rounded up to a multiple of 8.
+
+    >>> align(0), align(1), align(8), align(13)
+    (0, 8, 8, 16)
+    """
+    return (size + 7) & ~7
+
+
+def write_arxiv_cache(id_to_article: ArxivType, cache_path: str,
+                      source_stat: os.stat_result = None) -> None:
+    """Write the arxiv data id_to_article to a cache file at cache_path,
+    recording the modification time and size in source_stat, if given,
+    of the file id_to_article was read from.
+
+    The cache is written and synced to a uniquely named temporary file in
+    the same directory, which then replaces cache_path, so readers never
+    see a partly written cache.
+
+    Docstring examples not given since the function writes to a file.
+    """
+    strings = {}
+
+    def number(string: str) -> int:
+        """Return the number of string in the string table, adding it if
+        needed, or NONE if string is None.
+        """
+        if string is None:
+            return NONE
+        return strings.setdefault(string, len(strings))
+
+    author_numbers = {author: index for index, author in enumerate(sorted(
+        {author for article in id_to_article.values()
+         for author in article[AUTHORS]}))}
+    names = array('I')
+    for last, first in author_numbers:
+        names.append(number(last))
+        names.append(number(first))
+
+    records = array('i')
+    links = array('I')
+    by_author = [[] for _ in author_numbers]
+    for article_number, article_id in enumerate(sorted(id_to_article)):
+        article = id_to_article[article_id]
+        records.extend(number(article[field]) for field in STRING_FIELDS)
+        records.append(len(links))
+        records.append(len(article[AUTHORS]))
+        for author in article[AUTHORS]:
+            links.append(author_numbers[author])
+            by_author[author_numbers[author]].append(article_number)
+
+    postings = array('I', [0])
+    for article_numbers in by_author:
+        postings.append(postings[-1] + len(article_numbers))
+    for article_numbers in by_author:
+        postings.extend(article_numbers)
+
+    text = bytearray()
+    offsets = array('Q', [0])
+    for string in strings:
+        text += string.encode('utf-8')
+        offsets.append(len(text))
+
+    mtime, size = (0, -1) if source_stat is None else (
+        source_stat.st_mtime_ns, source_stat.st_size)
+    directory, file_name = os.path.split(cache_path)
+    descriptor, temporary_path = tempfile.mkstemp(
+        suffix='.tmp', prefix=file_name + '.', dir=directory or None)
+    try:
+        with os.fdopen(descriptor, 'wb') as cache_file:
+            cache_file.write(HEADER.pack(MAGIC, VERSION, mtime, size,
+                                         len(strings), len(id_to_article),
+                                         len(author_numbers), len(links)))
+            for section in [offsets, text, records, links, names, postings]:
+                data = bytes(section)
+                cache_file.write(data + bytes(align(len(data)) - len(data)))
+            cache_file.flush()
+            os.fsync(cache_file.fileno())
+        os.replace(temporary_path, cache_path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+
+class CachedArticle(Mapping):
+    """An article stored in a cache file. Each field is decoded when it is
+    read, so that, for example, abstracts that are never read are never
+    decoded.
+    """
+
+    def __init__(self, cache: 'CachedArxiv', article_number: int) -> None:
+        """Initialize the article numbered article_number in cache."""
+        self._cache = cache
+        self._number = article_number
+
+    def __getitem__(self, field: str) -> object:
+        """Return the value of the field field of this article."""
+        if field == AUTHORS:
+            return self._cache.get_authors(self._number)
+        if field not in STRING_FIELDS:
+            raise KeyError(field)
+        return self._cache.get_field(self._number,
+                                     STRING_FIELDS.index(field))
+
+    def __iter__(self) -> Iterator[str]:
+        """Return an iterator over the fields of this article."""
+        return iter(ARTICLE_FIELDS)
+
+    def __len__(self) -> int:
+        """Return the number of fields of this article."""
+        return len(ARTICLE_FIELDS)
+
+    def __repr__(self) -> str:
+        """Return the article as a dict would be represented."""
+        return repr(dict(self))
+
+
+class CachedArxiv(Mapping):
+    """Arxiv data read from a cache file, mapping article IDs to
+    CachedArticle objects. Opening a cache only reads its header; articles
+    and authors are found by binary search in the memory-mapped file.
+    """
+
+    def __init__(self, cache_path: str) -> None:
+        """Open the cache file at cache_path.
+
+        Raise ValueError if the file is not a cache of this version, or
+        is shorter or longer than its header says.
+        """
+        with open(cache_path, 'rb') as cache_file:
+            self._map = mmap.mmap(cache_file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+        if len(self._map) >= HEADER.size:
+            (magic, version, self.source_mtime, self.source_size,
+             string_count, self._article_count, author_count,
+             link_count) = HEADER.unpack_from(self._map)
+        if len(self._map) < HEADER.size or (magic, version) != (MAGIC,
+                                                                 VERSION):
+            self._map.close()
+            raise ValueError('not an arxiv cache: ' + cache_path)
+
+        view = memoryview(self._map)
+        position = HEADER.size
+        sections = []
+        for typecode, count in [('Q', string_count + 1), ('B', None),
+                                ('i', self._article_count * RECORD_WIDTH),
+                                ('I', link_count), ('I', author_count * 2),
+                                ('I', author_count + 1 + link_count)]:
+            if count is None:
+                count = sections[0][-1]
+            size = count * struct.calcsize(typecode)
+            if position + size > len(self._map):
+                break
+            sections.append(view[position:position + size].cast(typecode))
+            position += align(size)
+        if len(sections) < 6 or position != len(self._map):
+            for section in sections:
+                section.release()
+            view.release()
+            self._map.close()
+            raise ValueError('truncated arxiv cache: ' + cache_path)
+        (self._offsets, self._text, self._records, self._links, self._names,
+         self._postings) = sections
+        self._author_count = author_count
+
+    def close(self) -> None:
+        """Close the cache file. Articles read from it can no longer be
+        used.
+        """
+        for section in (self._offsets, self._text, self._records,
+                        self._links, self._names, self._postings):
+            section.release()
+        self._map.close()
+
+    def __enter__(self) -> 'CachedArxiv':
+        """Return this cache, to be closed at the end of a with block."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close this cache."""
+        self.close()
+
+    def _get_string(self, string_number: int) -> str:
+        """Return the string numbered string_number, or None if
+        string_number is NONE.
+        """
+        if string_number == NONE:
+            return None
+        return str(self._text[self._offsets[string_number]:
+                              self._offsets[string_number + 1]], 'utf-8')
+
+    def get_field(self, article_number: int, field_index: int) -> str:
+        """Return the field STRING_FIELDS[field_index] of the article
+        numbered article_number.
+        """
+        return self._get_string(
+            self._records[article_number * RECORD_WIDTH + field_index])
+
+    def get_authors(self, article_number: int) -> list[NameType]:
+        """Return the authors of the article numbered article_number."""
+        record = article_number * RECORD_WIDTH + len(STRING_FIELDS)
+        start = self._records[record]
+        return [self._get_name(author_number) for author_number
+                in self._links[start:start + self._records[record + 1]]]
+
+    def _get_name(self, author_number: int) -> NameType:
+        """Return the name of the author numbered author_number."""
+        return (self._get_string(self._names[2 * author_number]),
+                self._get_string(self._names[2 * author_number + 1]))
+
+    def _find_article(self, article_id: str) -> int:
+        """Return the number of the article with ID article_id, or None if
+        there is no such article.
+        """
+        article_number = bisect_left(range(self._article_count), article_id,
+                                     key=lambda number: self.get_field(
+                                         number, 0))
+        if (article_number < self._article_count
+                and self.get_field(article_number, 0) == article_id):
+            return article_number
+        return None
+
+    def __getitem__(self, article_id: str) -> CachedArticle:
+        """Return the article with ID article_id."""
+        article_number = self._find_article(article_id)
+        if article_number is None:
+            raise KeyError(article_id)
+        return CachedArticle(self, article_number)
+
+    def __contains__(self, article_id: object) -> bool:
+        """Return True if and only if there is an article with ID
+        article_id.
+        """
+        return self._find_article(article_id) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        """Return an iterator over the article IDs, in sorted order."""
+        return (self.get_field(number, 0)
+                for number in range(self._article_count))
+
+    def __len__(self) -> int:
+        """Return the number of articles."""
+        return self._article_count
+
+    def get_articles_by(self, author_name: NameType) -> list[str]:
+        """Return the sorted IDs of the articles written by author_name."""
+        author_number = bisect_left(range(self._author_count), author_name,
+                                    key=self._get_name)
+        if (author_number == self._author_count
+                or self._get_name(author_number) != author_name):
+            return []
+        return [self.get_field(article_number, 0) for article_number
+                in self._get_postings(author_number)]
+
+    def _get_postings(self, author_number: int) -> memoryview:
+        """Return the article numbers of the author numbered
+        author_number.
+        """
+        base = self._author_count + 1
+        return self._postings[base + self._postings[author_number]:
+                              base + self._postings[author_number + 1]]
+
+    def get_author_to_articles(self) -> dict[NameType, list[str]]:
+        """Return a dict that maps each author to the sorted IDs of their
+        articles, like make_author_to_articles.
+        """
+        article_ids = list(self)
+        return {self._get_name(author_number):
+                [article_ids[number]
+                 for number in self._get_postings(author_number)]
+                for author_number in range(self._author_count)}
+
+    def to_dict(self) -> ArxivType:
+        """Return all the articles as arxiv data made of dicts."""
+        return {article_id: dict(article)
+                for article_id, article in self.items()}
+
+
+def is_cache_current(cache: CachedArxiv, source_path: str) -> bool:
+    """Return True if and only if cache was written from the file at
+    source_path as it is now.
+
+    Docstring examples not given since the function reads from a file.
+    """
+    source_stat = os.stat(source_path)
+    return (cache.source_mtime == source_stat.st_mtime_ns
+            and cache.source_size == source_stat.st_size)
+
+
+def load_arxiv(source_path: str, cache_path: str = None) -> CachedArxiv:
+    """Return the arxiv data in the file at source_path, read from the
+    cache at cache_path (source_path + '.cache' by default). The cache is
+    rebuilt first if it is missing, invalid, or older than the source.
+
+    Docstring examples not given since the function reads from a file.
+    """
+    if cache_path is None:
+        cache_path = source_path + '.cache'
+    try:
+        cache = CachedArxiv(cache_path)
+    except (OSError, ValueError):
+        cache = None
+    if cache is not None:
+        if is_cache_current(cache, source_path):
+            return cache
+        cache.close()
+
+    source_stat = os.stat(source_path)
+    with open(source_path, encoding='utf-8') as afile:
+        id_to_article = read_arxiv_file(afile)
+    write_arxiv_cache(id_to_article, cache_path, source_stat)
+    return CachedArxiv(cache_path)
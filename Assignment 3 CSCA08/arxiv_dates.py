@@ -0,0 +1,131 @@
+"""CSCA08 Assignment 3: arxiv.org
+
+A sorted index over one date field (CREATED or MODIFIED) of arxiv
+articles. Dates are stored as ordinals in an array, with the article IDs
+in a parallel list, ordered by date and then by ID, so that the articles
+in a date range are found by bisection in O(log n + k).
+
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+from arxiv_functions import EXAMPLE_ARXIV
+from constants import ID, CREATED, MODIFIED, ArticleType, ArxivType
+
+
+def to_ordinal(date_string: str) -> int:
+    """Return the proleptic Gregorian ordinal of the date date_string, in
+    the format YYYY-MM-DD.
+
+    >>> to_ordinal('2021-09-01') - to_ordinal('2021-08-31')
+    1
+    """
+    return date.fromisoformat(date_string).toordinal()
+
+
+class DateIndex:
+    """The articles that have a value for one date field, sorted by date.
+
+    >>> index = DateIndex(MODIFIED, EXAMPLE_ARXIV)
+    >>> index.get_range('2021-09-01', '2021-10-01')
+    ['031', '067']
+    >>> index.get_range(start='2021-10-01')
+    ['067', '827']
+    """
+
+    def __init__(self, field: str, id_to_article: ArxivType = None
+                 ) -> None:
+        """Initialize an index over the date field field of the articles in
+        id_to_article. Articles whose field is None are not indexed.
+        """
+        self.field = field
+        self._ordinals = array('l')
+        self._article_ids = []
+        self._dates = {}
+        if id_to_article:
+            for article in id_to_article.values():
+                self.add_article(article)
+
+    def __len__(self) -> int:
+        """Return the number of articles in this index.
+
+        >>> len(DateIndex(CREATED, EXAMPLE_ARXIV))
+        4
+        """
+        return len(self._article_ids)
+
+    def add_article(self, article: ArticleType) -> None:
+        """Add article to this index, replacing the article with the same
+        ID if there is one. Raise ValueError, leaving the index unchanged,
+        if the date of article is not a valid date.
+
+        >>> index = DateIndex(MODIFIED, EXAMPLE_ARXIV)
+        >>> index.add_article({'identifier': '008',
+        ...                    'modified': '2021-12-25'})
+        >>> index.get_range(start='2021-10-01')
+        ['067', '827', '008']
+        """
+        article_id = article[ID]
+        # Parse the date first, so that an invalid date leaves the index
+        # unchanged.
+        ordinal = None
+        if article[self.field] is not None:
+            ordinal = to_ordinal(article[self.field])
+        if article_id in self._dates:
+            self.remove_article(article_id)
+        if ordinal is None:
+            return
+        index = self._find(ordinal, article_id)
+        self._ordinals.insert(index, ordinal)
+        self._article_ids.insert(index, article_id)
+        self._dates[article_id] = ordinal
+
+    def remove_article(self, article_id: str) -> None:
+        """Remove the article with ID article_id from this index, if it is
+        in it.
+
+        >>> index = DateIndex(MODIFIED, EXAMPLE_ARXIV)
+        >>> index.remove_article('067')
+        >>> index.remove_article('008')
+        >>> index.get_range()
+        ['042', '031', '827']
+        """
+        ordinal = self._dates.pop(article_id, None)
+        if ordinal is not None:
+            index = self._find(ordinal, article_id)
+            del self._ordinals[index]
+            del self._article_ids[index]
+
+    def _find(self, ordinal: int, article_id: str) -> int:
+        """Return the position of the article with ID article_id and date
+        ordinal ordinal in this index, or where it would be inserted.
+        """
+        low = bisect_left(self._ordinals, ordinal)
+        high = bisect_right(self._ordinals, ordinal, low)
+        return bisect_left(self._article_ids, article_id, low, high)
+
+    def get_range(self, start: str = None, end: str = None) -> list[str]:
+        """Return the IDs of the articles dated from start to end inclusive,
+        in order of date and then ID. A start or end of None leaves that
+        end of the range open.
+
+        >>> index = DateIndex(CREATED, EXAMPLE_ARXIV)
+        >>> index.get_range('2021-08-20', '2021-09-01')
+        ['827', '008']
+        >>> index.get_range('2021-12-01')
+        []
+        """
+        low = 0
+        high = len(self._ordinals)
+        if start is not None:
+            low = bisect_left(self._ordinals, to_ordinal(start))
+        if end is not None:
+            high = bisect_right(self._ordinals, to_ordinal(end), low)
+        return self._article_ids[low:high]
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
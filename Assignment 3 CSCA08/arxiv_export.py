@@ -0,0 +1,254 @@
+"""CSCA08 Assignment 3: arxiv.org
+
+Export of arxiv data to columns in NumPy .npy files, which analytics tools
+can load with numpy.load(path, mmap_mode='r') without copying or parsing.
+Articles are written as they are parsed, so the whole data set never has
+to be in memory.
+
+Files written to the export directory, one row per article, author or
+author of an article:
+
+    id, title, abstract     string columns (see below)
+    created, modified       datetime64[D] columns, NaT for None
+    author_last,            string columns of the distinct authors,
+    author_first            numbered in order of first appearance
+    edge_article,           the author-article edge table: row number of
+    edge_author,            the article, number of the author, and the
+    edge_position           position of the author in the article
+
+A string column name is stored as name.data.npy (the UTF-8 encoded
+strings, one after another, as uint8), name.offsets.npy (uint64, where
+string i is data[offsets[i]:offsets[i + 1]]) and name.valid.npy (bool,
+False for None), as in Arrow.
+
+"""
+
+from array import array
+from datetime import date
+import mmap
+import os
+import struct
+import sys
+from typing import Iterable, TextIO
+
+from arxiv_dates import to_ordinal
+from arxiv_functions import iter_arxiv_file
+from author_table import AuthorTable
+from constants import (ID, TITLE, CREATED, MODIFIED, AUTHORS, ABSTRACT,
+                       ArticleType)
+
+MAGIC = b'\x93NUMPY\x01\x00'
+# The header is padded to this length, so that it can be rewritten with
+# the final number of rows once they are all written.
+HEADER_SIZE = 128
+BYTE_ORDER = '<' if sys.byteorder == 'little' else '>'
+# The .npy type of the values of arrays of each type code.
+DTYPES = {'B': '|u1', '?': '|b1', 'I': BYTE_ORDER + 'u4',
+          'Q': BYTE_ORDER + 'u8', 'q': BYTE_ORDER + 'M8[D]'}
+# Columns are written to their files after every CHUNK_SIZE articles.
+CHUNK_SIZE = 1 << 12
+
+STRING_COLUMNS = [ID, TITLE, ABSTRACT]
+DATE_COLUMNS = [CREATED, MODIFIED]
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+NOT_A_TIME = -1 << 63
+
+
+def make_header(dtype: str, rows: int) -> bytes:
+    """Return the HEADER_SIZE byte .npy header of a one-dimensional array
+    of rows values of type dtype.
+
+    >>> header = make_header('<u4', 3)
+    >>> len(header)
+    128
+    >>> header[10:].rstrip()
+    b"{'descr': '<u4', 'fortran_order': False, 'shape': (3,), }"
+    """
+    text = "{{'descr': '{}', 'fortran_order': False, 'shape': ({},), }}"
+    text = text.format(dtype, rows).ljust(HEADER_SIZE - len(MAGIC) - 3)
+    return MAGIC + struct.pack('<H', len(text) + 1) + text.encode(
+        'latin-1') + b'\n'
+
+
+class ColumnWriter:
+    """A writer of values to a .npy file, one after another. Values are
+    added to the array buffer, and written to the file by flush. The
+    number of values is written to the header when the writer is closed.
+    """
+
+    def __init__(self, path: str, typecode: str) -> None:
+        """Initialize a writer of values of array type code typecode to a
+        new .npy file at path.
+        """
+        self.path = path
+        self.rows = 0
+        self.buffer = array('B' if typecode == '?' else typecode)
+        self._dtype = DTYPES[typecode]
+        self._file = open(path, 'wb')
+        self._file.write(make_header(self._dtype, 0))
+
+    def flush(self) -> None:
+        """Write the buffered values to the file."""
+        self.rows += len(self.buffer)
+        self.buffer.tofile(self._file)
+        del self.buffer[:]
+
+    def close(self) -> None:
+        """Write the buffered values and the final header, and close the
+        file.
+        """
+        self.flush()
+        self._file.seek(0)
+        self._file.write(make_header(self._dtype, self.rows))
+        self._file.close()
+
+
+class StringColumnWriter:
+    """A writer of strings, or None, to the three .npy files of a string
+    column.
+    """
+
+    def __init__(self, directory: str, name: str) -> None:
+        """Initialize a writer of the string column name in directory."""
+        path = os.path.join(directory, name)
+        self._data = ColumnWriter(path + '.data.npy', 'B')
+        self._offsets = ColumnWriter(path + '.offsets.npy', 'Q')
+        self._valid = ColumnWriter(path + '.valid.npy', '?')
+        self._offsets.buffer.append(0)
+        self._size = 0
+
+    def append(self, string: str) -> None:
+        """Add string, which may be None, as the next string in this
+        column.
+        """
+        if string is not None:
+            data = string.encode('utf-8')
+            self._data.buffer.frombytes(data)
+            self._size += len(data)
+        self._offsets.buffer.append(self._size)
+        self._valid.buffer.append(string is not None)
+
+    def flush(self) -> None:
+        """Write the buffered strings to the files."""
+        for column in (self._data, self._offsets, self._valid):
+            column.flush()
+
+    def close(self) -> None:
+        """Write the buffered strings and close the files."""
+        for column in (self._data, self._offsets, self._valid):
+            column.close()
+
+
+def to_day(date_string: str) -> int:
+    """Return the number of days from 1970-01-01 to the date date_string,
+    in the format YYYY-MM-DD, or NOT_A_TIME if date_string is None.
+
+    >>> to_day('1970-01-02')
+    1
+    >>> to_day(None) == NOT_A_TIME
+    True
+    """
+    if date_string is None:
+        return NOT_A_TIME
+    return to_ordinal(date_string) - EPOCH_ORDINAL
+
+
+def export_articles(articles: Iterable[ArticleType], directory: str) -> int:
+    """Write the articles in articles to columns in directory, creating it
+    if needed, and return the number of articles written. Articles are
+    written as they are produced by articles.
+
+    Docstring examples not given since the function writes to files.
+    """
+    os.makedirs(directory, exist_ok=True)
+    strings = {field: StringColumnWriter(directory, field)
+               for field in STRING_COLUMNS}
+    dates = {field: ColumnWriter(os.path.join(directory, field + '.npy'),
+                                 'q') for field in DATE_COLUMNS}
+    authors = AuthorTable()
+    author_columns = [StringColumnWriter(directory, 'author_last'),
+                      StringColumnWriter(directory, 'author_first')]
+    edges = [ColumnWriter(os.path.join(directory, name + '.npy'), 'I')
+             for name in ('edge_article', 'edge_author', 'edge_position')]
+    columns = (list(strings.values()) + list(dates.values())
+               + author_columns + edges)
+    edge_articles, edge_authors, edge_positions = [edge.buffer
+                                                   for edge in edges]
+
+    rows = 0
+    try:
+        for article in articles:
+            for field, column in strings.items():
+                column.append(article[field])
+            for field, column in dates.items():
+                column.buffer.append(to_day(article[field]))
+            article_authors = article[AUTHORS]
+            for author in article_authors:
+                author_count = len(authors)
+                author_id = authors.intern(author)
+                if author_id == author_count:
+                    author_columns[0].append(author[0])
+                    author_columns[1].append(author[1])
+                edge_authors.append(author_id)
+            edge_articles.extend([rows] * len(article_authors))
+            edge_positions.extend(range(len(article_authors)))
+            rows += 1
+            if rows % CHUNK_SIZE == 0:
+                for column in columns:
+                    column.flush()
+    finally:
+        for column in columns:
+            column.close()
+    return rows
+
+
+def export_arxiv_file(afile: TextIO, directory: str) -> int:
+    """Write the articles in the arxiv file afile to columns in directory,
+    as export_articles does, parsing and writing one article at a time.
+
+    Precondition: afile is open for reading
+                  afile is in the format described in the handout
+
+    Docstring examples not given since the function reads from a file.
+    """
+    return export_articles(iter_arxiv_file(afile), directory)
+
+
+def read_column(path: str) -> tuple[str, memoryview]:
+    """Return the .npy type of the column in the .npy file at path and its
+    values, read from the memory-mapped file without copying. Datetime
+    values are read as ints, and bool values as 0 or 1.
+
+    Docstring examples not given since the function reads from a file.
+    """
+    with open(path, 'rb') as column_file:
+        column_map = mmap.mmap(column_file.fileno(), 0,
+                               access=mmap.ACCESS_READ)
+    header_size = len(MAGIC) + 2 + struct.unpack_from('<H', column_map,
+                                                      len(MAGIC))[0]
+    if column_map[:len(MAGIC)] != MAGIC or header_size != HEADER_SIZE:
+        column_map.close()
+        raise ValueError('not a column written by arxiv_export: ' + path)
+    header = column_map[len(MAGIC) + 2:header_size].decode('latin-1')
+    dtype = header.split("'")[3]
+    typecode = {value: key for key, value in DTYPES.items()}[dtype]
+    return dtype, memoryview(column_map)[header_size:].cast(
+        'B' if typecode == '?' else typecode)
+
+
+def read_string_column(directory: str, name: str) -> list[str]:
+    """Return the strings, or None, in the string column name in
+    directory.
+
+    Docstring examples not given since the function reads from a file.
+    """
+    data = read_column(os.path.join(directory, name + '.data.npy'))[1]
+    offsets = read_column(os.path.join(directory, name + '.offsets.npy'))[1]
+    valid = read_column(os.path.join(directory, name + '.valid.npy'))[1]
+    return [str(data[offsets[row]:offsets[row + 1]], 'utf-8')
+            if valid[row] else None for row in range(len(valid))]
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
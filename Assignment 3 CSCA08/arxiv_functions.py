@@ -11,8 +11,12 @@ Copyright (c) 2021-2023 Anya Tafliovich.
 
 """
 
+from bisect import bisect_left, insort
 import copy  # needed in examples of functions that modify input dict
-from typing import TextIO
+import io
+import multiprocessing
+import os
+from typing import Iterator, TextIO
 
 # remove unused constants from this import statement when you are
 # finished your assignment
@@ -120,15 +124,232 @@ def read_arxiv_file(afile: TextIO) -> ArxivType:
     Precondition: afile is open for reading
                   afile is in the format described in the handout
     """
-    arxiv_type = {}
+    return {article[ID]: article for article in iter_arxiv_file(afile)}
 
-    total_articles = arxiv_file_seperate_articles(afile)
-    for article in total_articles:
-        article_info = arxiv_file_assign_info(article)
-        article_info = {key.replace('\n', ''): value for key, value in
-                        article_info.items()}
-        arxiv_type[article_info[ID]] = article_info
-    return arxiv_type
+
+# The fields given on the first lines of each article, in order.
+HEADER_FIELDS = [ID, TITLE, CREATED, MODIFIED]
+
+
+def iter_arxiv_file(afile: TextIO) -> Iterator[ArticleType]:
+    """Yield the articles in afile one at a time, in the order they appear
+    in afile, as soon as the END line of each article has been read. Only
+    the lines of the current article are kept in memory.
+
+    Precondition: afile is open for reading
+                  afile is in the format described in the handout
+
+    >>> articles = iter_arxiv_file(EXAMPLE_TEXT)
+    >>> next(articles) == ASSIGNED_INFO
+    True
+    >>> next(articles)[AUTHORS]
+    [('Breuss', 'Nataliya')]
+    >>> list(articles)
+    []
+    """
+    article = {}
+    authors = []
+    abstract = []
+    # Lines of the header read so far; once it reaches len(HEADER_FIELDS),
+    # authors are read until a blank line, and then the abstract until END.
+    field = 0
+    in_abstract = False
+
+    for line in afile:
+        line = line.strip()
+        if field < len(HEADER_FIELDS):
+            if field == 0 and line == '':
+                continue
+            article[HEADER_FIELDS[field]] = line or None
+            field += 1
+        elif line == END:
+            yield finish_article(article, authors, abstract)
+            article, authors, abstract = {}, [], []
+            field = 0
+            in_abstract = False
+        elif in_abstract:
+            abstract.append(line)
+        elif line == '':
+            in_abstract = True
+        else:
+            last, _, first = line.partition(SEPARATOR)
+            authors.append((last.strip(), first.strip()))
+
+    if field > 0:
+        yield finish_article(article, authors, abstract)
+
+
+def finish_article(article: ArticleType, authors: list[NameType],
+                   abstract: list[str]) -> ArticleType:
+    """Return article after adding the sorted authors and the abstract
+    made of the lines in abstract. Used as a helper function for
+    iter_arxiv_file.
+
+    >>> finish_article({ID: '031'}, [('Breuss', 'Nataliya')],
+    ...                ['We discuss', 'Calculus.'])[ABSTRACT]
+    'We discuss\\nCalculus.'
+    >>> finish_article({ID: '042'}, [], [])
+    {'identifier': '042', 'authors': [], 'abstract': None}
+    """
+    authors.sort()
+    article[AUTHORS] = authors
+    article[ABSTRACT] = '\n'.join(abstract) or None
+    return article
+
+
+# Files smaller than this many bytes are not worth splitting into shards.
+MIN_SHARD_SIZE = 1 << 20
+
+
+def read_arxiv_file_parallel(filename: str, processes: int = None
+                             ) -> tuple[ArxivType, dict[NameType, list[str]]]:
+    """Return a dict containing all arxiv information in the file named
+    filename, and the dict that maps each author to the sorted IDs of
+    their articles (as make_author_to_articles would).
+
+    The file is split into shards at END lines and the shards are parsed
+    by processes worker processes (by default, one per CPU).
+
+    Precondition: filename is in the format described in the handout
+
+    Docstring examples not given since the function reads from a file.
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    shards = min(processes, os.path.getsize(filename) // MIN_SHARD_SIZE)
+    boundaries = find_shard_boundaries(filename, max(shards, 1))
+    ranges = [(filename, start, end)
+              for start, end in zip(boundaries, boundaries[1:])]
+    if len(ranges) <= 1:
+        return merge_arxiv_shards(map(read_arxiv_shard, ranges))
+    with multiprocessing.Pool(min(processes, len(ranges))) as pool:
+        return merge_arxiv_shards(pool.imap(read_arxiv_shard, ranges))
+
+
+def find_shard_boundaries(filename: str, shards: int) -> list[int]:
+    """Return the byte offsets at which the file named filename can be
+    split into about shards parts of similar size, each made of whole
+    articles. The first offset is 0 and the last is the size of the file.
+
+    Docstring examples not given since the function reads from a file.
+    """
+    size = os.path.getsize(filename)
+    end = END.encode()
+    boundaries = [0]
+    with open(filename, 'rb') as afile:
+        for shard in range(1, shards):
+            afile.seek(max(size * shard // shards, boundaries[-1]))
+            afile.readline()  # skip the rest of a possibly partial line
+            line = afile.readline()
+            while line and line.strip() != end:
+                line = afile.readline()
+            if boundaries[-1] < afile.tell() < size:
+                boundaries.append(afile.tell())
+    boundaries.append(size)
+    return boundaries
+
+
+def read_arxiv_shard(shard: tuple[str, int, int]
+                     ) -> tuple[ArxivType, dict[NameType, list[str]]]:
+    """Return the articles between byte offsets start and end of the file
+    named filename, where shard is (filename, start, end), and the map
+    from their authors to article IDs. Used as a helper function for
+    read_arxiv_file_parallel.
+
+    Docstring examples not given since the function reads from a file.
+    """
+    filename, start, end = shard
+    with open(filename, 'rb') as afile:
+        afile.seek(start)
+        text = afile.read(end - start).decode('utf-8')
+    id_to_article = read_arxiv_file(io.StringIO(text))
+    return id_to_article, make_author_to_articles(id_to_article)
+
+
+def merge_arxiv_shards(shards: Iterator[tuple[ArxivType,
+                                              dict[NameType, list[str]]]]
+                       ) -> tuple[ArxivType, dict[NameType, list[str]]]:
+    """Return the articles and author map of all the shards in shards
+    (in the format returned by read_arxiv_shard) merged together. Used as
+    a helper function for read_arxiv_file_parallel.
+
+    >>> first = {'008': EXAMPLE_ARXIV['008']}
+    >>> second = {'827': EXAMPLE_ARXIV['827']}
+    >>> articles, by_author = merge_arxiv_shards(
+    ...     [(first, make_author_to_articles(first)),
+    ...      (second, make_author_to_articles(second))])
+    >>> sorted(articles)
+    ['008', '827']
+    >>> by_author[('Ponce', 'Marcelo')]
+    ['008', '827']
+    """
+    id_to_article = {}
+    author_to_articles = {}
+    merged_authors = set()
+    duplicates = False
+    for shard_articles, shard_by_author in shards:
+        if not duplicates and not id_to_article.keys().isdisjoint(
+                shard_articles):
+            duplicates = True
+        id_to_article.update(shard_articles)
+        for author, article_ids in shard_by_author.items():
+            if author in author_to_articles:
+                author_to_articles[author].extend(article_ids)
+                merged_authors.add(author)
+            else:
+                author_to_articles[author] = article_ids
+
+    if duplicates:
+        # A later copy of an article replaced an earlier one, so the
+        # merged author lists may mention articles that were replaced.
+        return id_to_article, make_author_to_articles(id_to_article)
+    for author in merged_authors:
+        author_to_articles[author].sort()
+    return id_to_article, author_to_articles
+
+
+def upsert_arxiv_file(id_to_article: ArxivType,
+                      author_to_articles: dict[NameType, list[str]],
+                      afile: TextIO) -> list[str]:
+    """Insert the articles in the delta file afile into the arxiv data
+    id_to_article, replacing the articles with the same IDs, and update
+    author_to_articles, the map made by make_author_to_articles from
+    id_to_article, to match. Return the IDs of the articles in afile, in
+    order.
+
+    Only the articles in afile and the lists of their authors are
+    touched, so the time taken depends on the size of afile rather than
+    the size of id_to_article.
+
+    Precondition: afile is open for reading
+                  afile is in the format described in the handout
+
+    >>> arxiv_copy = copy.deepcopy(EXAMPLE_ARXIV)
+    >>> by_author = make_author_to_articles(arxiv_copy)
+    >>> upsert_arxiv_file(arxiv_copy, by_author, ['999\\n', 'New\\n',
+    ...                   '\\n', '\\n', 'Breuss,Nataliya\\n', 'END\\n',
+    ...                   '008\\n', 'Old\\n', '\\n', '\\n', 'END\\n'])
+    ['999', '008']
+    >>> by_author[('Breuss', 'Nataliya')]
+    ['031', '999']
+    >>> by_author == make_author_to_articles(arxiv_copy)
+    True
+    """
+    article_ids = []
+    for article in iter_arxiv_file(afile):
+        article_id = article[ID]
+        old_article = id_to_article.get(article_id)
+        if old_article is not None:
+            for author in old_article[AUTHORS]:
+                author_ids = author_to_articles[author]
+                del author_ids[bisect_left(author_ids, article_id)]
+                if not author_ids:
+                    del author_to_articles[author]
+        for author in article[AUTHORS]:
+            insort(author_to_articles.setdefault(author, []), article_id)
+        id_to_article[article_id] = article
+        article_ids.append(article_id)
+    return article_ids
 
 
 def arxiv_file_seperate_articles(text: list[str]) -> list[list[str]]:
@@ -152,8 +373,6 @@ def arxiv_file_seperate_articles(text: list[str]) -> list[list[str]]:
             article.append(line)
     if article:
         articles.append(article[:])
-    if article:
-        articles.append(article[:])
     return articles
 
 
@@ -235,12 +454,18 @@ def arxiv_file_assign_none(info: ArxivType) -> None:
 
 # We provide the header and part of a docstring for this function to
 # get you started and to demonstrate the use of example data.
-def make_author_to_articles(id_to_article: ArxivType) -> dict[NameType,
-                                                              list[str]]:
+def make_author_to_articles(id_to_article: ArxivType,
+                            canonical: dict[NameType, NameType] = None
+                            ) -> dict[NameType, list[str]]:
     """Return a dict that maps each author name to a list (sorted in
     lexicographic order) of IDs of articles written by that author,
     based on the information in arxiv data id_to_article.
 
+    If canonical is given, each author name is first replaced with the
+    name canonical maps it to, if any (see
+    author_names.make_canonical_names), so that the articles of variants
+    of a name are listed under one name.
+
     >>> make_author_to_articles(EXAMPLE_ARXIV) == EXAMPLE_BY_AUTHOR
     True
     >>> example = {'008': {'identifier': '008',
@@ -252,14 +477,21 @@ def make_author_to_articles(id_to_article: ArxivType) -> dict[NameType,
     ...     Computer Science is the best course.'''}}
     >>> make_author_to_articles(example)
     {('Ponce', 'Marcelo'): ['008'], ('Tafliovich', 'Anya Y.'): ['008']}
+    >>> make_author_to_articles(example, {('Ponce', 'Marcelo'):
+    ...                                   ('Tafliovich', 'Anya Y.')})
+    {('Tafliovich', 'Anya Y.'): ['008']}
     """
     author_to_articles = {}
     for article_id, article_info in id_to_article.items():
         authors = article_info[AUTHORS]
         for author in authors:
+            if canonical is not None:
+                author = canonical.get(author, author)
             if author not in author_to_articles:
                 author_to_articles[author] = [article_id]
-            else:
+            elif (canonical is None
+                  or author_to_articles[author][-1] != article_id):
+                # Two variants of a name on one article list it once.
                 author_to_articles[author].append(article_id)
     for articles in author_to_articles.values():
         articles.sort()
@@ -283,22 +515,16 @@ def get_coauthors(id_to_article: ArxivType, author_name:
     >>> get_coauthors(EXAMPLE_ARXIV, (('Breuss', 'Nataliya')))
     []
     """
-    all_author_list = []
+    coauthors = set()
     for items in id_to_article.values():
         if author_name in items[AUTHORS]:
-            all_author_list.extend((items[AUTHORS]))
-    for author in all_author_list:
-        if author == author_name:
-            k = all_author_list.index(author)
-            all_author_list.pop(k)
-    sort_coauthors(all_author_list)
-    all_author_list.sort()
-    return all_author_list
+            coauthors.update(items[AUTHORS])
+    coauthors.discard(author_name)
+    return sorted(coauthors)
 
 
 def sort_coauthors(author_list: list) -> None:
-    """Returns a list of authors from author_list without duplicates. Used
-    as a helper function for get_coauthors.
+    """Returns a list of authors from author_list without duplicates.
 
     >>> authors = [('Ponce', 'Marcelo'), ('Bretscher', 'Anna'),
     ...           ('Ponce', 'Marcelo')]
@@ -398,30 +624,24 @@ def suggest_collaborators(id_to_article: ArxivType, author_name:
     >>> suggest_collaborators(EXAMPLE_ARXIV, ('Ponce', 'Marcelo'))
     [('Pancer', 'Richard')]
     """
-    i = 0
-    suggested_collaborators = []
-    coauthors = get_coauthors(id_to_article, author_name)
+    coauthors = set(get_coauthors(id_to_article, author_name))
+    suggestions = set()
 
-    for author in coauthors:
-        suggested_collaborators.extend(get_coauthors(id_to_article, author))
-
-    while i < len(suggested_collaborators):
-        coauthor = suggested_collaborators[i]
-        if coauthor in coauthors:
-            suggested_collaborators.pop(i)
-        else:
-            i += 1
+    # The coauthors of a coauthor are the authors of the articles they
+    # wrote, so one more pass over the articles finds all of them.
+    for items in id_to_article.values():
+        if not coauthors.isdisjoint(items[AUTHORS]):
+            suggestions.update(items[AUTHORS])
 
-    suggestions = remove_original_author(suggested_collaborators, author_name)
-    suggestions.sort()
-    return suggestions
+    suggestions.difference_update(coauthors)
+    suggestions.discard(author_name)
+    return sorted(suggestions)
 
 
 def remove_original_author(author_list: list[str], author_name:
                            NameType) -> list[str]:
     """Returns a list of authors from author_list with all occurences of
-    the author author_name removed. Used as a helper function for
-    suggest_collaborators.
+    the author author_name removed.
 
     >>> remove_original_author([('Pancer', 'Richard'), ('Breuss', 'Nataliya'),
     ...                         ('Breuss', 'Nataliya')],
@@ -473,11 +693,17 @@ def has_prolific_authors(author_name_to_article_id: dict[NameType, list[str]],
 
 
 def keep_prolific_authors(id_to_article: ArxivType,
-                          min_publications: int) -> None:
+                          min_publications: int,
+                          every_author: bool = False) -> None:
     """Update the articles data id_to_article so that it contains only
     articles published by authors with min_publications or more
     articles published. As long as at least one of the authors has
-    min_publications, the article is kept. FIXXXX THIS CODE
+    min_publications, the article is kept.
+
+    If every_author is True, an article is kept only if it has authors
+    and all of them have min_publications or more of the articles kept:
+    removing an article lowers the counts of its authors, so articles are
+    removed until no more need to be.
 
     >>> arxiv_copy = copy.deepcopy(EXAMPLE_ARXIV)
     >>> keep_prolific_authors(arxiv_copy, 2)
@@ -485,22 +711,60 @@ def keep_prolific_authors(id_to_article: ArxivType,
     3
     >>> '008' in arxiv_copy and '067' in arxiv_copy and '827' in arxiv_copy
     True
+    >>> arxiv_copy = copy.deepcopy(EXAMPLE_ARXIV)
+    >>> keep_prolific_authors(arxiv_copy, 1, True)
+    >>> sorted(arxiv_copy)
+    ['008', '031', '067', '827']
+    >>> keep_prolific_authors(arxiv_copy, 2, True)
+    >>> arxiv_copy
+    {}
     """
-    articles_to_remove = []
-
-    for article_id, article_data in id_to_article.items():
-        authors = article_data[AUTHORS]
-        prolific_author_found = False
-
-        for author in authors:
-            if author in EXAMPLE_BY_AUTHOR and len(EXAMPLE_BY_AUTHOR[author]
-                                                   ) >= min_publications:
-                prolific_author_found = True
-                break
-        if not prolific_author_found:
-            articles_to_remove.append(article_id)
-    for article_id in articles_to_remove:
-        id_to_article.pop(article_id, None)
+    counts = {}
+    for article in id_to_article.values():
+        for author in article[AUTHORS]:
+            counts[author] = counts.get(author, 0) + 1
+    if every_author:
+        author_to_articles = make_author_to_articles(id_to_article)
+
+    to_check = list(id_to_article)
+    while to_check:
+        dropped = set()
+        for article_id in to_check:
+            if article_id in id_to_article and not is_prolific_article(
+                    id_to_article[article_id], counts, min_publications,
+                    every_author):
+                for author in id_to_article.pop(article_id)[AUTHORS]:
+                    counts[author] -= 1
+                    if counts[author] == min_publications - 1:
+                        dropped.add(author)
+        # With one prolific author enough, the authors of removed articles
+        # were not prolific to begin with, so one pass is enough.
+        to_check = []
+        if every_author:
+            for author in dropped:
+                to_check.extend(author_to_articles[author])
+
+
+def is_prolific_article(article: ArticleType, counts: dict[NameType, int],
+                        min_publications: int, every_author: bool) -> bool:
+    """Return True if and only if one author (or, if every_author is True,
+    every author and at least one) of article has min_publications or
+    more articles according to counts. Used as a helper function for
+    keep_prolific_authors.
+
+    >>> counts = {('Bretscher', 'Anna'): 2, ('Pancer', 'Richard'): 1}
+    >>> is_prolific_article(EXAMPLE_ARXIV['067'], counts, 2, False)
+    True
+    >>> is_prolific_article(EXAMPLE_ARXIV['067'], counts, 2, True)
+    False
+    >>> is_prolific_article(EXAMPLE_ARXIV['042'], counts, 0, True)
+    False
+    """
+    authors = article[AUTHORS]
+    if every_author:
+        return bool(authors) and all(counts[author] >= min_publications
+                                     for author in authors)
+    return any(counts[author] >= min_publications for author in authors)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,409 @@
+"""CSCA08 Assignment 3: arxiv.org
+
+An index over arxiv data that is built once and kept up to date as
+articles are added and removed, so that author queries do not have to
+scan every article. Authors and article IDs are numbered once, and the
+index stores those numbers in arrays rather than repeating names.
+
+"""
+
+import copy  # needed in examples of methods that modify the index
+from array import array
+from bisect import bisect_left, insort
+from heapq import nsmallest
+from typing import TextIO
+
+from arxiv_dates import DateIndex, to_ordinal
+from arxiv_functions import (EXAMPLE_ARXIV, EXAMPLE_BY_AUTHOR,
+                             EXAMPLE_TEXT, iter_arxiv_file)
+from arxiv_search import SearchIndex
+from author_table import AuthorTable, ID_TYPECODE
+from coauthor_graph import CoauthorGraph, COMMON
+from near_duplicates import NearDuplicateIndex
+from constants import (ID, CREATED, MODIFIED, AUTHORS, NameType,
+                       ArticleType, ArxivType)
+
+
+class ArxivIndex:
+    """Arxiv data together with the map from each author to the sorted IDs
+    of the articles they wrote, the coauthor graph of the articles, the
+    articles sorted by creation and modification date, and optionally a
+    full-text index of their titles and abstracts and an index of their
+    near duplicates.
+
+    >>> index = ArxivIndex(EXAMPLE_ARXIV)
+    >>> index.get_articles_by(('Ponce', 'Marcelo'))
+    ['008', '827']
+    >>> index.get_author_to_articles() == EXAMPLE_BY_AUTHOR
+    True
+    >>> index.modified.get_range(start='2021-10-01')
+    ['067', '827']
+    >>> ArxivIndex(EXAMPLE_ARXIV, True).text.search_all('best university')
+    ['827']
+    >>> index = ArxivIndex(EXAMPLE_ARXIV, near_duplicates=True)
+    >>> index.duplicates.find_duplicates(dict(EXAMPLE_ARXIV['008'],
+    ...                                       identifier='009'))
+    ['008']
+    """
+
+    def __init__(self, id_to_article: ArxivType = None,
+                 full_text: bool = False,
+                 near_duplicates: bool = False) -> None:
+        """Initialize an index over the articles in id_to_article, with a
+        full-text index in the attribute text if and only if full_text is
+        True, and a NearDuplicateIndex in the attribute duplicates if and
+        only if near_duplicates is True (each attribute is None otherwise).
+
+        The index keeps its own dict of articles: changes must be made
+        through add_article and remove_article.
+        """
+        self.articles = {}
+        self.authors = AuthorTable()
+        self.coauthors = CoauthorGraph(authors=self.authors)
+        # Article IDs numbered in the order they were first added.
+        self._article_numbers = {}
+        self._article_ids = []
+        # The article numbers of each author, indexed by author ID, and the
+        # author IDs of each article, indexed by article number.
+        self._by_author = []
+        self._authors_of = {}
+        # Author IDs grouped by their number of articles, and the numbers
+        # of articles that have a group, in increasing order.
+        self._by_count = {}
+        self._counts = []
+        self.created = DateIndex(CREATED)
+        self.modified = DateIndex(MODIFIED)
+        self.text = SearchIndex() if full_text else None
+        self.duplicates = NearDuplicateIndex() if near_duplicates else None
+        # The sorted IDs of the near duplicates found when each article was
+        # added, for the articles in the index that had some.
+        self.found_duplicates = {}
+        # Changed whenever an article is added or removed, so that cached
+        # query results (see query_cache) can tell they are out of date.
+        self.version = 0
+        if id_to_article:
+            for article in id_to_article.values():
+                self.add_article(article)
+
+    def __len__(self) -> int:
+        """Return the number of articles in this index.
+
+        >>> len(ArxivIndex(EXAMPLE_ARXIV))
+        5
+        """
+        return len(self.articles)
+
+    def __contains__(self, article_id: str) -> bool:
+        """Return True if and only if the article with ID article_id is in
+        this index.
+
+        >>> '008' in ArxivIndex(EXAMPLE_ARXIV)
+        True
+        """
+        return article_id in self.articles
+
+    def add_article(self, article: ArticleType) -> list[str]:
+        """Add a copy of article to this index, replacing the article with
+        the same ID if there is one, and return the sorted IDs of the
+        articles it is a near duplicate of (always [] without a
+        NearDuplicateIndex). article itself is not changed. Raise
+        ValueError, leaving the index unchanged, if a date of article is
+        not a valid date.
+
+        >>> index = ArxivIndex(EXAMPLE_ARXIV, near_duplicates=True)
+        >>> article = copy.deepcopy(EXAMPLE_ARXIV['031'])
+        >>> article[ID] = '100'
+        >>> index.add_article(article)
+        ['031']
+        >>> index.get_articles_by(('Breuss', 'Nataliya'))
+        ['031', '100']
+        >>> index.found_duplicates
+        {'100': ['031']}
+        """
+        # Check the dates first, so that an invalid date leaves the index
+        # unchanged rather than half updated.
+        for field in (CREATED, MODIFIED):
+            if article[field] is not None:
+                to_ordinal(article[field])
+        article_id = article[ID]
+        if article_id in self.articles:
+            self.remove_article(article_id)
+        self.version += 1
+        number = self._article_numbers.get(article_id)
+        if number is None:
+            number = self._article_numbers[article_id] = len(
+                self._article_ids)
+            self._article_ids.append(article_id)
+        author_ids = self.authors.intern_all(article[AUTHORS])
+        while len(self._by_author) < len(self.authors):
+            self._by_author.append(array(ID_TYPECODE))
+        # Share the interned names rather than keeping a copy per article,
+        # in a copy of article so that the caller's article is unchanged.
+        article = dict(article)
+        article[AUTHORS] = self.authors.get_names(author_ids)
+        self.articles[article_id] = article
+        self._authors_of[number] = author_ids
+        for author_id in author_ids:
+            numbers = self._by_author[author_id]
+            numbers.append(number)
+            self._recount(author_id, len(numbers) - 1, len(numbers))
+        self.coauthors.add_author_ids(author_ids)
+        self.created.add_article(article)
+        self.modified.add_article(article)
+        if self.text is not None:
+            self.text.add_article(article)
+        duplicates = []
+        if self.duplicates is not None:
+            duplicates = self.duplicates.add_article(article)
+        if duplicates:
+            self.found_duplicates[article_id] = duplicates
+        return duplicates
+
+    def ingest(self, afile: TextIO) -> list[str]:
+        """Add the articles in the delta file afile to this index, replacing
+        the articles with the same IDs, and return their IDs in order. The
+        near duplicates found are recorded in found_duplicates.
+
+        Only the articles in afile are parsed, and only the entries of
+        those articles and their authors are updated, so the time taken
+        depends on the size of afile rather than the size of the index.
+        If an article has an invalid date, ValueError is raised: the
+        articles before it have been added, and it and the ones after it
+        have not.
+
+        Precondition: afile is open for reading
+                      afile is in the format described in the handout
+
+        >>> index = ArxivIndex(EXAMPLE_ARXIV)
+        >>> index.ingest(EXAMPLE_TEXT[:10] + ['999\\n', 'New\\n', '\\n',
+        ...                                   '\\n', 'Breuss,Nataliya\\n'])
+        ['008', '999']
+        >>> index.get_articles_by(('Breuss', 'Nataliya'))
+        ['031', '999']
+        """
+        article_ids = []
+        for article in iter_arxiv_file(afile):
+            self.add_article(article)
+            article_ids.append(article[ID])
+        return article_ids
+
+    def remove_article(self, article_id: str) -> ArticleType:
+        """Remove the article with ID article_id from this index and
+        return it.
+
+        >>> index = ArxivIndex(EXAMPLE_ARXIV)
+        >>> index.remove_article('031')[ID]
+        '031'
+        >>> index.get_articles_by(('Breuss', 'Nataliya'))
+        []
+        """
+        article = self.articles.pop(article_id)
+        self.version += 1
+        number = self._article_numbers[article_id]
+        author_ids = self._authors_of.pop(number)
+        for author_id in author_ids:
+            numbers = self._by_author[author_id]
+            numbers.remove(number)
+            self._recount(author_id, len(numbers) + 1, len(numbers))
+        self.coauthors.remove_author_ids(author_ids)
+        self.created.remove_article(article_id)
+        self.modified.remove_article(article_id)
+        if self.text is not None:
+            self.text.remove_article(article_id)
+        if self.duplicates is not None:
+            self.duplicates.remove_article(article_id)
+        self.found_duplicates.pop(article_id, None)
+        return article
+
+    def _recount(self, author_id: int, old_count: int,
+                 new_count: int) -> None:
+        """Move the author with ID author_id from the group of authors with
+        old_count articles to the group of authors with new_count articles.
+        """
+        if old_count:
+            author_ids = self._by_count[old_count]
+            author_ids.remove(author_id)
+            if not author_ids:
+                del self._by_count[old_count]
+                del self._counts[bisect_left(self._counts, old_count)]
+        if new_count:
+            author_ids = self._by_count.get(new_count)
+            if author_ids is None:
+                author_ids = self._by_count[new_count] = set()
+                insort(self._counts, new_count)
+            author_ids.add(author_id)
+
+    def get_changed_between(self, start: str = None,
+                            end: str = None) -> list[str]:
+        """Return the sorted IDs of the articles created or modified from
+        start to end inclusive (see DateIndex.get_range).
+
+        >>> ArxivIndex(EXAMPLE_ARXIV).get_changed_between('2021-09-02')
+        ['031', '067', '827']
+        """
+        return sorted(set(self.created.get_range(start, end)).union(
+            self.modified.get_range(start, end)))
+
+    def get_articles_by(self, author_name: NameType) -> list[str]:
+        """Return the sorted IDs of the articles written by author_name.
+
+        >>> ArxivIndex(EXAMPLE_ARXIV).get_articles_by(('Bretscher', 'Anna'))
+        ['067', '827']
+        >>> ArxivIndex(EXAMPLE_ARXIV).get_articles_by(('Doe', 'Jane'))
+        []
+        """
+        author_id = self.authors.get_id(author_name)
+        if author_id is None:
+            return []
+        return self._get_article_ids(author_id)
+
+    def _get_article_ids(self, author_id: int) -> list[str]:
+        """Return the sorted IDs of the articles written by the author with
+        ID author_id.
+        """
+        return sorted(map(self._article_ids.__getitem__,
+                          self._by_author[author_id]))
+
+    def get_publication_count(self, author_name: NameType) -> int:
+        """Return the number of articles written by author_name.
+
+        >>> ArxivIndex(EXAMPLE_ARXIV).get_publication_count(('Pancer',
+        ...                                                  'Richard'))
+        1
+        """
+        author_id = self.authors.get_id(author_name)
+        if author_id is None:
+            return 0
+        return len(self._by_author[author_id])
+
+    def get_author_to_articles(self) -> dict[NameType, list[str]]:
+        """Return a dict that maps each author to the sorted IDs of their
+        articles, like make_author_to_articles.
+
+        >>> ArxivIndex(EXAMPLE_ARXIV).get_author_to_articles()[
+        ...     ('Breuss', 'Nataliya')]
+        ['031']
+        """
+        return {self.authors.get_name(author_id):
+                self._get_article_ids(author_id)
+                for author_id, numbers in enumerate(self._by_author)
+                if numbers}
+
+    def get_coauthors(self, author_name: NameType) -> list[NameType]:
+        """Return the sorted list of coauthors of author_name.
+
+        >>> ArxivIndex(EXAMPLE_ARXIV).get_coauthors(('Tafliovich', 'Anya Y.'))
+        [('Bretscher', 'Anna'), ('Ponce', 'Marcelo')]
+        >>> ArxivIndex(EXAMPLE_ARXIV).get_coauthors(('Breuss', 'Nataliya'))
+        []
+        """
+        return self.coauthors.get_coauthors(author_name)
+
+    def suggest_collaborators(self, author_name: NameType) -> list[NameType]:
+        """Return the sorted list of coauthors of the coauthors of
+        author_name who are not author_name or their coauthors.
+
+        >>> ArxivIndex(EXAMPLE_ARXIV).suggest_collaborators(('Pancer',
+        ...                                                  'Richard'))
+        [('Ponce', 'Marcelo'), ('Tafliovich', 'Anya Y.')]
+        >>> ArxivIndex(EXAMPLE_ARXIV).suggest_collaborators(('Breuss',
+        ...                                                  'Nataliya'))
+        []
+        """
+        return self.coauthors.suggest_collaborators(author_name)
+
+    def recommend_collaborators(self, author_name: NameType, k: int = 10,
+                                weighting: str = COMMON
+                                ) -> list[tuple[NameType, float]]:
+        """Return the k best suggested collaborators of author_name with
+        their scores, best first (see CoauthorGraph.recommend_collaborators).
+
+        >>> ArxivIndex(EXAMPLE_ARXIV).recommend_collaborators(
+        ...     ('Tafliovich', 'Anya Y.'))
+        [(('Pancer', 'Richard'), 1)]
+        """
+        return self.coauthors.recommend_collaborators(author_name, k,
+                                                      weighting)
+
+    def get_most_published_authors(self) -> list[NameType]:
+        """Return the sorted list of the authors who have published the most
+        articles.
+
+        >>> ArxivIndex(EXAMPLE_ARXIV).get_most_published_authors() == [
+        ...     ('Bretscher', 'Anna'), ('Ponce', 'Marcelo'),
+        ...     ('Tafliovich', 'Anya Y.')]
+        True
+        >>> ArxivIndex().get_most_published_authors()
+        []
+        """
+        if not self._counts:
+            return []
+        return sorted(self.authors.get_names(
+            self._by_count[self._counts[-1]]))
+
+    def get_top_authors(self, k: int) -> list[tuple[NameType, int]]:
+        """Return the k authors who have published the most articles, with
+        their numbers of articles, most published first and ties broken
+        by name.
+
+        >>> ArxivIndex(EXAMPLE_ARXIV).get_top_authors(4) == [
+        ...     (('Bretscher', 'Anna'), 2), (('Ponce', 'Marcelo'), 2),
+        ...     (('Tafliovich', 'Anya Y.'), 2), (('Breuss', 'Nataliya'), 1)]
+        True
+        >>> ArxivIndex().get_top_authors(3)
+        []
+        """
+        top = []
+        for count in reversed(self._counts):
+            if len(top) >= k:
+                break
+            authors = map(self.authors.get_name, self._by_count[count])
+            top.extend((author, count)
+                       for author in nsmallest(k - len(top), authors))
+        return top
+
+    def keep_prolific_authors(self, min_publications: int,
+                              every_author: bool = False) -> None:
+        """Remove from this index every article none of whose authors (or,
+        if every_author is True, not all of whose authors) has
+        min_publications or more articles, as keep_prolific_authors does.
+
+        >>> index = ArxivIndex(EXAMPLE_ARXIV)
+        >>> index.keep_prolific_authors(2)
+        >>> sorted(index.articles)
+        ['008', '067', '827']
+        >>> index.keep_prolific_authors(2, True)
+        >>> len(index)
+        0
+        """
+        to_check = list(self.articles)
+        while to_check:
+            dropped = set()
+            for article_id in to_check:
+                if article_id not in self.articles:
+                    continue
+                author_ids = self._authors_of[
+                    self._article_numbers[article_id]]
+                counts = [len(self._by_author[author_id])
+                          for author_id in author_ids]
+                if every_author:
+                    prolific = bool(counts) and min(counts) >= min_publications
+                else:
+                    prolific = any(count >= min_publications
+                                   for count in counts)
+                if not prolific:
+                    self.remove_article(article_id)
+                    dropped.update(
+                        author_id for author_id in author_ids
+                        if len(self._by_author[author_id])
+                        == min_publications - 1)
+            to_check = []
+            if every_author:
+                for author_id in dropped:
+                    to_check.extend(self._article_ids[number]
+                                    for number in self._by_author[author_id])
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,297 @@
+"""CSCA08 Assignment 3: arxiv.org
+
+A full-text inverted index over the titles and abstracts of arxiv
+articles. Each term maps to a compressed posting list: a bytearray of
+(document number gap, term frequency) pairs, each number written as a
+varint. Documents are numbered in the order they are added, so posting
+lists only ever grow at the end. Replacing or removing an article marks
+its old number as deleted; compact rebuilds the lists without them, and
+is called automatically once more than COMPACT_FRACTION of the numbers
+are deleted.
+
+"""
+
+from array import array
+from heapq import nsmallest
+from math import log
+import re
+from typing import Iterator, TextIO
+
+from arxiv_functions import EXAMPLE_ARXIV, iter_arxiv_file
+from constants import ID, TITLE, ABSTRACT, ArticleType
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+# BM25 parameters: term frequency saturation and length normalization.
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# The fraction of document numbers that may be deleted before the posting
+# lists are compacted, which keeps the cost of compacting proportional to
+# the number of removals.
+COMPACT_FRACTION = 0.5
+
+
+def tokenize(text: str) -> list[str]:
+    """Return the lowercase words and numbers in text, in order.
+
+    >>> tokenize('Intro to CS is the best course ever')
+    ['intro', 'to', 'cs', 'is', 'the', 'best', 'course', 'ever']
+    >>> tokenize(None)
+    []
+    """
+    if not text:
+        return []
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def encode_varint(number: int, data: bytearray) -> None:
+    """Append the non-negative integer number to data as a varint: seven
+    bits per byte, least significant first, with the high bit set on every
+    byte but the last.
+
+    >>> data = bytearray()
+    >>> encode_varint(5, data)
+    >>> encode_varint(300, data)
+    >>> list(data)
+    [5, 172, 2]
+    """
+    while number >= 0x80:
+        data.append(number & 0x7f | 0x80)
+        number >>= 7
+    data.append(number)
+
+
+def iter_postings(data: bytearray) -> Iterator[tuple[int, int]]:
+    """Yield the (document number, term frequency) pairs of the posting
+    list data.
+
+    >>> data = bytearray()
+    >>> for number in [3, 1, 297, 2]:
+    ...     encode_varint(number, data)
+    >>> list(iter_postings(data))
+    [(3, 1), (300, 2)]
+    """
+    numbers = []
+    number = shift = 0
+    for byte in data:
+        number |= (byte & 0x7f) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            numbers.append(number)
+            number = shift = 0
+    document = 0
+    for index in range(0, len(numbers), 2):
+        document += numbers[index]
+        yield document, numbers[index + 1]
+
+
+class SearchIndex:
+    """An inverted index over the titles and abstracts of articles.
+
+    >>> index = SearchIndex(EXAMPLE_ARXIV.values())
+    >>> index.search_all('best course')
+    ['008', '031', '067']
+    >>> index.search_any('calculus university')
+    ['031', '827']
+    >>> index.search('discrete mathematics', 1)[0][0]
+    '067'
+    """
+
+    def __init__(self, articles: list[ArticleType] = None) -> None:
+        """Initialize an index over the articles in articles."""
+        self._doc_ids = []
+        self._doc_numbers = {}
+        self._lengths = array('I')
+        self._deleted = set()
+        self._total_length = 0
+        self._postings = {}
+        self._last = {}
+        if articles:
+            for article in articles:
+                self.add_article(article)
+
+    def __len__(self) -> int:
+        """Return the number of articles in this index.
+
+        >>> len(SearchIndex(EXAMPLE_ARXIV.values()))
+        5
+        """
+        return len(self._doc_numbers)
+
+    def add_article(self, article: ArticleType) -> None:
+        """Add the title and abstract of article to this index, replacing
+        the article with the same ID if there is one.
+
+        >>> index = SearchIndex(EXAMPLE_ARXIV.values())
+        >>> index.add_article({'identifier': '031', 'title': 'Calculus II',
+        ...                    'abstract': None})
+        >>> index.search_all('best calculus')
+        []
+        """
+        article_id = article[ID]
+        if article_id in self._doc_numbers:
+            self.remove_article(article_id)
+        document = len(self._doc_ids)
+        self._doc_ids.append(article_id)
+        self._doc_numbers[article_id] = document
+        terms = tokenize(article[TITLE]) + tokenize(article[ABSTRACT])
+        self._lengths.append(len(terms))
+        self._total_length += len(terms)
+
+        frequencies = {}
+        for term in terms:
+            frequencies[term] = frequencies.get(term, 0) + 1
+        for term, frequency in frequencies.items():
+            data = self._postings.get(term)
+            if data is None:
+                data = self._postings[term] = bytearray()
+            encode_varint(document - self._last.get(term, 0), data)
+            encode_varint(frequency, data)
+            self._last[term] = document
+
+    def remove_article(self, article_id: str) -> None:
+        """Remove the article with ID article_id from this index,
+        compacting it if more than COMPACT_FRACTION of its document
+        numbers are then deleted.
+
+        >>> index = SearchIndex(EXAMPLE_ARXIV.values())
+        >>> index.remove_article('008')
+        >>> index.search_all('best course')
+        ['031', '067']
+        """
+        document = self._doc_numbers.pop(article_id)
+        self._deleted.add(document)
+        self._total_length -= self._lengths[document]
+        if len(self._deleted) > COMPACT_FRACTION * len(self._doc_ids):
+            self.compact()
+
+    def compact(self) -> None:
+        """Rebuild the posting lists without the removed articles, and
+        renumber the remaining articles.
+
+        >>> index = SearchIndex(EXAMPLE_ARXIV.values())
+        >>> index.remove_article('008')
+        >>> index.compact()
+        >>> index.search_all('best course')
+        ['031', '067']
+        """
+        renumbered = {}
+        doc_ids = []
+        lengths = array('I')
+        for document, article_id in enumerate(self._doc_ids):
+            if document not in self._deleted:
+                renumbered[document] = len(doc_ids)
+                doc_ids.append(article_id)
+                lengths.append(self._lengths[document])
+
+        postings = {}
+        last = {}
+        for term, old_data in self._postings.items():
+            data = bytearray()
+            previous = 0
+            for document, frequency in iter_postings(old_data):
+                if document in renumbered:
+                    document = renumbered[document]
+                    encode_varint(document - previous, data)
+                    encode_varint(frequency, data)
+                    previous = document
+            if data:
+                postings[term] = data
+                last[term] = previous
+
+        self._doc_ids = doc_ids
+        self._doc_numbers = {article_id: document
+                             for document, article_id in enumerate(doc_ids)}
+        self._lengths = lengths
+        self._deleted = set()
+        self._postings = postings
+        self._last = last
+
+    def _get_documents(self, term: str) -> dict[int, int]:
+        """Return a dict that maps the number of each article containing
+        term to the number of times term occurs in it.
+        """
+        data = self._postings.get(term)
+        if data is None:
+            return {}
+        return {document: frequency
+                for document, frequency in iter_postings(data)
+                if document not in self._deleted}
+
+    def search_all(self, query: str) -> list[str]:
+        """Return the sorted IDs of the articles that contain every term of
+        query.
+
+        >>> SearchIndex(EXAMPLE_ARXIV.values()).search_all('Best, university!')
+        ['827']
+        >>> SearchIndex(EXAMPLE_ARXIV.values()).search_all('')
+        []
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        # Start from the rarest term so the candidate set stays small.
+        terms = sorted(terms, key=lambda term: len(self._postings.get(
+            term, b'')))
+        documents = set(self._get_documents(terms[0]))
+        for term in terms[1:]:
+            if not documents:
+                break
+            documents.intersection_update(self._get_documents(term))
+        return sorted(self._doc_ids[document] for document in documents)
+
+    def search_any(self, query: str) -> list[str]:
+        """Return the sorted IDs of the articles that contain at least one
+        term of query.
+
+        >>> SearchIndex(EXAMPLE_ARXIV.values()).search_any('strange discrete')
+        ['042', '067']
+        """
+        documents = set()
+        for term in set(tokenize(query)):
+            documents.update(self._get_documents(term))
+        return sorted(self._doc_ids[document] for document in documents)
+
+    def search(self, query: str, k: int = 10) -> list[tuple[str, float]]:
+        """Return the IDs of the k articles that best match query, with
+        their BM25 scores, best first and ties broken by ID.
+
+        >>> results = SearchIndex(EXAMPLE_ARXIV.values()).search('calculus')
+        >>> [article_id for article_id, score in results]
+        ['031']
+        """
+        if k <= 0 or not self._doc_numbers:
+            return []
+        count = len(self._doc_numbers)
+        average_length = self._total_length / count or 1
+        scores = {}
+        for term in set(tokenize(query)):
+            documents = self._get_documents(term)
+            if not documents:
+                continue
+            idf = log(1 + (count - len(documents) + 0.5)
+                      / (len(documents) + 0.5))
+            for document, frequency in documents.items():
+                norm = BM25_K1 * (1 - BM25_B + BM25_B
+                                  * self._lengths[document] / average_length)
+                scores[document] = scores.get(document, 0) + (
+                    idf * frequency * (BM25_K1 + 1) / (frequency + norm))
+        best = nsmallest(k, scores.items(), key=lambda score: (
+            -score[1], self._doc_ids[score[0]]))
+        return [(self._doc_ids[document], score) for document, score in best]
+
+
+def read_search_index(afile: TextIO) -> SearchIndex:
+    """Return a full-text index over the articles in the arxiv file afile,
+    built while the file is read.
+
+    Docstring examples not given since the function reads from a file.
+    """
+    return SearchIndex(iter_arxiv_file(afile))
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
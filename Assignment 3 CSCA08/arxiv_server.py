@@ -0,0 +1,365 @@
+"""CSCA08 Assignment 3: arxiv.org
+
+A local query server over arxiv data. The data is read and indexed once
+when the server starts, and queries are then answered over HTTP from the
+index, without parsing the data again:
+
+    python arxiv_server.py data.txt --port 8000
+    curl 'localhost:8000/coauthors?last=Ponce&first=Marcelo'
+
+Queries (GET, with the parameters in the query string):
+
+    /coauthors?last=...&first=...   sorted coauthors of an author
+    /suggest?last=...&first=...     suggested collaborators of an author
+    /most_published                 the authors with the most articles
+    /search?q=...&k=...             the k best matches for q, with scores
+
+Several queries can be sent in one request by POSTing a JSON list of
+queries such as {"query": "coauthors", "last": "Ponce", "first":
+"Marcelo"} to /batch; the answers come back as a list in the same order.
+Answers are JSON, with author names as [last, first] lists, and are kept
+in a QueryCache so that repeated queries are not recomputed until the
+index changes.
+
+Answers found in the cache are sent straight from the event loop. Other
+requests are answered by a single worker thread, so that a slow query
+does not hold up the connections waiting on cached answers. The worker
+reads the index while the event loop keeps running, so the index must
+not be changed while the server is running.
+
+"""
+
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import json
+import threading
+from urllib.parse import parse_qsl, urlsplit
+
+from arxiv_functions import EXAMPLE_ARXIV, read_arxiv_file
+from arxiv_index import ArxivIndex
+from query_cache import QueryCache, get_size
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8000
+SEARCH_K = 10
+MAX_BODY_SIZE = 1 << 20
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found',
+               405: 'Method Not Allowed', 413: 'Content Too Large'}
+
+
+class QueryError(Exception):
+    """Raised when a query cannot be answered, with the HTTP status to
+    reply with.
+    """
+
+    def __init__(self, status: int, message: str) -> None:
+        """Initialize an error with HTTP status status and message."""
+        super().__init__(message)
+        self.status = status
+
+
+class ArxivServer:
+    """Answers queries about an ArxivIndex, caching the answers.
+
+    >>> server = ArxivServer(ArxivIndex(EXAMPLE_ARXIV, full_text=True))
+    >>> server.answer('coauthors', {'last': 'Pancer', 'first': 'Richard'})
+    [['Bretscher', 'Anna']]
+    >>> server.answer('search', {'q': 'calculus', 'k': '1'})[0][0]
+    '031'
+    """
+
+    def __init__(self, index: ArxivIndex, cache: QueryCache = None) -> None:
+        """Initialize a server for the queries about index, keeping the
+        answers in cache (a new QueryCache by default).
+
+        The index needs a full-text index for search queries.
+        """
+        self.index = index
+        self.cache = QueryCache() if cache is None else cache
+        # Queries that are not cached are answered one at a time by the
+        # worker, while the event loop looks up cached answers, so the
+        # cache is only used while holding the lock.
+        self._worker = ThreadPoolExecutor(max_workers=1)
+        self._lock = threading.Lock()
+        self._queries = {'coauthors': self._get_coauthors,
+                         'suggest': self._suggest_collaborators,
+                         'most_published': self._get_most_published,
+                         'search': self._search}
+
+    def answer(self, query: str, params: dict[str, str]) -> object:
+        """Return the answer to the query named query with parameters
+        params, from the cache if it was answered since the index last
+        changed.
+
+        Raise QueryError if there is no such query or a parameter is
+        missing or invalid.
+
+        >>> server = ArxivServer(ArxivIndex(EXAMPLE_ARXIV))
+        >>> server.answer('most_published', {})[0]
+        ['Bretscher', 'Anna']
+        >>> _ = server.index.remove_article('067')
+        >>> server.answer('most_published', {})[0]
+        ['Ponce', 'Marcelo']
+        >>> server.answer('unknown', {})
+        Traceback (most recent call last):
+        ...
+        arxiv_server.QueryError: unknown query: unknown
+        """
+        return self._get_entry(query, params)[0]
+
+    def answer_json(self, query: str, params: dict[str, str],
+                    compute: bool = True) -> bytes:
+        """Return the answer to the query named query with parameters
+        params encoded as JSON, as answer does. If compute is False,
+        return None instead of answering or encoding the answer when the
+        encoded answer is not cached.
+
+        The encoded answer is cached too: for authors with thousands of
+        coauthors, encoding takes longer than finding the answer.
+
+        >>> server = ArxivServer(ArxivIndex(EXAMPLE_ARXIV))
+        >>> params = {'last': 'Pancer', 'first': 'Richard'}
+        >>> server.answer_json('coauthors', params, False) is None
+        True
+        >>> server.answer_json('coauthors', params)
+        b'[["Bretscher", "Anna"]]'
+        >>> server.answer_json('coauthors', params, False)
+        b'[["Bretscher", "Anna"]]'
+        """
+        entry = self._get_entry(query, params, compute)
+        if entry is None or entry[1] is None and not compute:
+            return None
+        if entry[1] is None:
+            entry[1] = json.dumps(entry[0]).encode('utf-8')
+        return entry[1]
+
+    def _get_entry(self, query: str, params: dict[str, str],
+                   compute: bool = True) -> list:
+        """Return the cache entry for the query named query with
+        parameters params, answering the query if it is not cached and
+        compute is True: a list of the answer and its JSON encoding, or
+        None if it was not encoded yet. Return None if the query is not
+        cached and compute is False.
+        """
+        function = self._queries.get(query)
+        if function is None:
+            raise QueryError(404, 'unknown query: ' + query)
+        args = tuple(sorted(params.items()))
+        with self._lock:
+            entry = self.cache.lookup(function, self.index, args)
+        if entry is None and compute:
+            entry = [function(params), None]
+            with self._lock:
+                self.cache.store(function, self.index, args, entry,
+                                 get_size(entry[0]))
+        return entry
+
+    def answer_batch(self, queries: list[dict[str, str]]) -> list[dict]:
+        """Return the answers to the queries in queries, each a dict with
+        the name of the query under 'query' and its parameters, in order.
+        Each answer is {'result': ...}, or {'error': ...} if the query
+        could not be answered.
+
+        >>> ArxivServer(ArxivIndex(EXAMPLE_ARXIV)).answer_batch(
+        ...     [{'query': 'coauthors', 'last': 'Breuss',
+        ...       'first': 'Nataliya'}, {'query': 'suggest'}])
+        [{'result': []}, {'error': 'missing parameter: last'}]
+        """
+        answers = []
+        for params in queries:
+            if not isinstance(params, dict):
+                answers.append({'error': 'a query must be an object'})
+                continue
+            params = {key: str(value) for key, value in params.items()}
+            try:
+                answers.append({'result': self.answer(params.pop('query', ''),
+                                                      params)})
+            except QueryError as error:
+                answers.append({'error': str(error)})
+        return answers
+
+    def _get_coauthors(self, params: dict[str, str]) -> list[list[str]]:
+        """Return the coauthors of the author named in params."""
+        return [list(name) for name in
+                self.index.get_coauthors(get_author(params))]
+
+    def _suggest_collaborators(self, params: dict[str, str]
+                               ) -> list[list[str]]:
+        """Return the suggested collaborators of the author named in
+        params.
+        """
+        return [list(name) for name in
+                self.index.suggest_collaborators(get_author(params))]
+
+    def _get_most_published(self, params: dict[str, str]
+                            ) -> list[list[str]]:
+        """Return the authors who have published the most articles."""
+        return [list(name) for name in
+                self.index.get_most_published_authors()]
+
+    def _search(self, params: dict[str, str]) -> list[list]:
+        """Return the best matches for the text query 'q' in params, at
+        most 'k' of them, with their scores.
+        """
+        if self.index.text is None:
+            raise QueryError(404, 'search is not enabled')
+        if 'q' not in params:
+            raise QueryError(400, 'missing parameter: q')
+        try:
+            k = int(params.get('k', SEARCH_K))
+        except ValueError:
+            raise QueryError(400, 'k must be an integer') from None
+        return [[article_id, score] for article_id, score
+                in self.index.text.search(params['q'], k)]
+
+    async def handle(self, reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter) -> None:
+        """Answer the HTTP requests sent on a connection, one after
+        another, until the client closes it or asks for it to be closed.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0))
+                if length > MAX_BODY_SIZE:
+                    writer.write(make_response(
+                        413, b'{"error": "body too large"}'))
+                    break
+                body = await reader.readexactly(length)
+                request = request_line.decode('latin-1')
+                response = self.respond(request, body, False)
+                if response is None:
+                    response = await asyncio.get_running_loop(
+                        ).run_in_executor(self._worker, self.respond,
+                                          request, body)
+                writer.write(make_response(*response))
+                await writer.drain()
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def respond(self, request_line: str, body: bytes,
+                compute: bool = True) -> tuple[int, bytes]:
+        """Return the HTTP status and the JSON encoded answer to the
+        request with request line request_line and body body. If compute
+        is False, return None instead if answering the request needs more
+        than the cache (see answer_json), as batches always do.
+
+        >>> server = ArxivServer(ArxivIndex(EXAMPLE_ARXIV))
+        >>> request = 'GET /coauthors?last=Pancer&first=Richard HTTP/1.1'
+        >>> server.respond(request, b'', False) is None
+        True
+        >>> server.respond(request, b'')
+        (200, b'[["Bretscher", "Anna"]]')
+        >>> server.respond('GET /coauthors HTTP/1.1', b'')
+        (400, b'{"error": "missing parameter: last"}')
+        """
+        method, _, target = request_line.strip().partition(' ')
+        url = urlsplit(target.rpartition(' ')[0] or target)
+        query = url.path.strip('/')
+        try:
+            if query == 'batch':
+                if not compute:
+                    return None
+                if method != 'POST':
+                    raise QueryError(405, 'batch queries must be POSTed')
+                try:
+                    queries = json.loads(body)
+                except ValueError:
+                    raise QueryError(400, 'invalid JSON') from None
+                if not isinstance(queries, list):
+                    raise QueryError(400, 'a batch must be a list')
+                return 200, json.dumps(self.answer_batch(queries)).encode(
+                    'utf-8')
+            if method != 'GET':
+                raise QueryError(405, 'queries must use GET')
+            answer = self.answer_json(query, dict(parse_qsl(url.query)),
+                                      compute)
+            return None if answer is None else (200, answer)
+        except QueryError as error:
+            return error.status, json.dumps({'error': str(error)}).encode(
+                'utf-8')
+
+
+def get_author(params: dict[str, str]) -> tuple[str, str]:
+    """Return the author name given by the parameters 'last' and 'first'
+    (empty if missing) in params.
+
+    >>> get_author({'last': 'Breuss', 'first': 'Nataliya'})
+    ('Breuss', 'Nataliya')
+    >>> get_author({'last': 'Breuss'})
+    ('Breuss', '')
+    """
+    if 'last' not in params:
+        raise QueryError(400, 'missing parameter: last')
+    return params['last'], params.get('first', '')
+
+
+def make_response(status: int, body: bytes) -> bytes:
+    """Return an HTTP response with status status and the JSON body
+    body.
+
+    >>> make_response(404, b'[]').splitlines()
+    [b'HTTP/1.1 404 Not Found', b'Content-Type: application/json', \
+b'Content-Length: 2', b'', b'[]']
+    """
+    return ('HTTP/1.1 {} {}\r\nContent-Type: application/json\r\n'
+            'Content-Length: {}\r\n\r\n').format(
+                status, STATUS_TEXT[status], len(body)).encode(
+                    'latin-1') + body
+
+
+def load_index(path: str) -> ArxivIndex:
+    """Return a full-text ArxivIndex of the arxiv data in the file at path.
+
+    Docstring examples not given since the function reads from a file.
+    """
+    with open(path, encoding='utf-8') as afile:
+        return ArxivIndex(read_arxiv_file(afile), full_text=True)
+
+
+async def start_server(server: ArxivServer, host: str = DEFAULT_HOST,
+                       port: int = DEFAULT_PORT) -> asyncio.Server:
+    """Return a running asyncio server that answers HTTP requests on host
+    and port with server. Port 0 picks a free port.
+    """
+    return await asyncio.start_server(server.handle, host, port)
+
+
+async def serve(path: str, host: str, port: int) -> None:
+    """Load the arxiv data in the file at path and answer queries about it
+    on host and port until cancelled.
+    """
+    http_server = await start_server(ArxivServer(load_index(path)), host,
+                                     port)
+    print('Serving on', ', '.join(
+        '{}:{}'.format(*sock.getsockname()[:2])
+        for sock in http_server.sockets))
+    async with http_server:
+        await http_server.serve_forever()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve arxiv queries.')
+    parser.add_argument('path', help='the arxiv data file')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.path, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,144 @@
+"""CSCA08 Assignment 3: arxiv.org
+
+Normalisation of author names and grouping of name variants, such as
+('Tafliovich', 'Anya Y.') and ('Tafliovich', 'Anya'), that likely name
+the same author.
+
+Names are only compared within a block: the names with the same
+normalised last name and the same first initial. Within a block, two
+names are compatible if, word by word, their first names are equal or
+one is the initial of the other.
+
+"""
+
+import re
+import unicodedata
+
+from arxiv_functions import EXAMPLE_ARXIV
+from constants import AUTHORS, NameType, ArxivType
+
+WORD_PATTERN = re.compile(r'[^\W_]+')
+
+
+def normalize_words(text: str) -> list[str]:
+    """Return the words of text in lowercase, without accents and
+    punctuation.
+
+    >>> normalize_words('  Anya Y. ')
+    ['anya', 'y']
+    >>> normalize_words("Erdős-O'Neil")
+    ['erdos', 'o', 'neil']
+    """
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return WORD_PATTERN.findall(text.lower())
+
+
+def normalize_name(author_name: NameType) -> NameType:
+    """Return author_name in normal form: the words of each part in
+    lowercase, without accents and punctuation, separated by spaces.
+
+    >>> normalize_name(('Tafliovich', 'Anya  Y.'))
+    ('tafliovich', 'anya y')
+    """
+    last, first = author_name
+    return ' '.join(normalize_words(last)), ' '.join(normalize_words(first))
+
+
+def get_blocking_key(author_name: NameType) -> tuple[str, str]:
+    """Return the key of the block author_name belongs to: their
+    normalised last name and first initial.
+
+    >>> get_blocking_key(('Tafliovich', 'Anya Y.'))
+    ('tafliovich', 'a')
+    >>> get_blocking_key(('Breuss', ''))
+    ('breuss', '')
+    """
+    last, first = normalize_name(author_name)
+    return last, first[:1]
+
+
+def are_compatible(first_name: str, other_first_name: str) -> bool:
+    """Return True if and only if the normalised first names first_name
+    and other_first_name can name the same person: word by word, the
+    words are equal or one is the initial of the other, and any extra
+    words of the longer name are ignored.
+
+    >>> are_compatible('anya y', 'anya')
+    True
+    >>> are_compatible('a y', 'anya yolanda')
+    True
+    >>> are_compatible('anya', 'anna')
+    False
+    >>> are_compatible('', 'anya')
+    False
+    """
+    words = first_name.split()
+    other_words = other_first_name.split()
+    if not words or not other_words:
+        return words == other_words
+    for word, other_word in zip(words, other_words):
+        if word != other_word and not (
+                len(word) == 1 and other_word.startswith(word)
+                or len(other_word) == 1 and word.startswith(other_word)):
+            return False
+    return True
+
+
+def make_canonical_names(id_to_article: ArxivType) -> dict[NameType,
+                                                           NameType]:
+    """Return a dict that maps each author name in arxiv data
+    id_to_article to a canonical name for the author it likely names.
+
+    Within each block, names are considered from the most to the least
+    informative (more words, then longer, then more articles). A name
+    joins the group of an earlier name if it is compatible with exactly
+    one group, so that an ambiguous name such as ('Smith', 'J.') next to
+    both ('Smith', 'John') and ('Smith', 'Jane') stays on its own. The
+    canonical name of a group is its first, most informative, name.
+
+    >>> arxiv_copy = {'1': {AUTHORS: [('Tafliovich', 'Anya Y.')]},
+    ...               '2': {AUTHORS: [('Tafliovich', 'Anya')]},
+    ...               '3': {AUTHORS: [('Tafliovich', 'A.')]}}
+    >>> make_canonical_names(arxiv_copy)[('Tafliovich', 'A.')]
+    ('Tafliovich', 'Anya Y.')
+    >>> make_canonical_names(EXAMPLE_ARXIV)[('Ponce', 'Marcelo')]
+    ('Ponce', 'Marcelo')
+    """
+    counts = {}
+    for article in id_to_article.values():
+        for author in article[AUTHORS]:
+            counts[author] = counts.get(author, 0) + 1
+
+    blocks = {}
+    for author in counts:
+        blocks.setdefault(get_blocking_key(author), []).append(author)
+
+    canonical = {}
+    for authors in blocks.values():
+        normal_names = {author: normalize_name(author)[1]
+                        for author in authors}
+        authors.sort(key=lambda author: (-len(normal_names[author].split()),
+                                         -len(normal_names[author]),
+                                         -counts[author], author))
+        # Each group is its canonical name and the normalised first names
+        # in it.
+        groups = []
+        for author in authors:
+            first = normal_names[author]
+            matches = [group for group in groups
+                       if all(are_compatible(first, name)
+                              for name in group[1])]
+            if len(matches) == 1:
+                canonical_name, names = matches[0]
+                names.append(first)
+                canonical[author] = canonical_name
+            else:
+                groups.append((author, [first]))
+                canonical[author] = author
+    return canonical
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
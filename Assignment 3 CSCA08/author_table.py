@@ -0,0 +1,118 @@
+"""CSCA08 Assignment 3: arxiv.org
+
+A table that stores each distinct author name once and numbers the
+names with dense integer IDs (0, 1, 2, ...), so that other structures
+can refer to authors by ID in compact arrays instead of repeating
+(last, first) tuples.
+
+"""
+
+from array import array
+from sys import intern
+
+from constants import NameType
+
+# Type code of the arrays of author IDs: unsigned ints.
+ID_TYPECODE = 'I'
+
+
+class AuthorTable:
+    """Author names numbered with dense integer IDs.
+
+    >>> table = AuthorTable()
+    >>> table.intern(('Ponce', 'Marcelo'))
+    0
+    >>> table.intern(('Breuss', 'Nataliya'))
+    1
+    >>> table.intern(('Ponce', 'Marcelo'))
+    0
+    >>> table.get_name(1)
+    ('Breuss', 'Nataliya')
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty author table."""
+        self._ids = {}
+        self._names = []
+
+    def __len__(self) -> int:
+        """Return the number of names in this table.
+
+        >>> table = AuthorTable()
+        >>> table.intern_all([('Ponce', 'Marcelo'), ('Ponce', 'Marcelo')])
+        array('I', [0, 0])
+        >>> len(table)
+        1
+        """
+        return len(self._names)
+
+    def __contains__(self, author_name: NameType) -> bool:
+        """Return True if and only if author_name is in this table.
+
+        >>> table = AuthorTable()
+        >>> table.intern(('Ponce', 'Marcelo'))
+        0
+        >>> ('Ponce', 'Marcelo') in table
+        True
+        """
+        return author_name in self._ids
+
+    def intern(self, author_name: NameType) -> int:
+        """Return the ID of author_name, adding author_name to this table if
+        it is not in it yet.
+        """
+        author_id = self._ids.get(author_name)
+        if author_id is None:
+            author_id = len(self._names)
+            last, first = author_name
+            author_name = (intern(last), intern(first))
+            self._ids[author_name] = author_id
+            self._names.append(author_name)
+        return author_id
+
+    def intern_all(self, authors: list[NameType]) -> array:
+        """Return an array of the IDs of the names in authors, adding the
+        names that are not in this table yet.
+
+        >>> AuthorTable().intern_all([('Ponce', 'Marcelo'),
+        ...                           ('Tafliovich', 'Anya Y.')])
+        array('I', [0, 1])
+        """
+        return array(ID_TYPECODE, map(self.intern, authors))
+
+    def get_id(self, author_name: NameType) -> int:
+        """Return the ID of author_name, or None if author_name is not in
+        this table.
+
+        >>> AuthorTable().get_id(('Ponce', 'Marcelo')) is None
+        True
+        """
+        return self._ids.get(author_name)
+
+    def get_name(self, author_id: int) -> NameType:
+        """Return the name with ID author_id. The same tuple is returned for
+        every call with the same author_id.
+
+        >>> table = AuthorTable()
+        >>> table.intern(('Ponce', 'Marcelo'))
+        0
+        >>> table.get_name(0) is table.get_name(0)
+        True
+        """
+        return self._names[author_id]
+
+    def get_names(self, author_ids: list[int]) -> list[NameType]:
+        """Return the names with the IDs in author_ids.
+
+        >>> table = AuthorTable()
+        >>> table.intern_all([('Ponce', 'Marcelo'), ('Breuss', 'Nataliya')])
+        array('I', [0, 1])
+        >>> table.get_names([1, 0])
+        [('Breuss', 'Nataliya'), ('Ponce', 'Marcelo')]
+        """
+        return list(map(self._names.__getitem__, author_ids))
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,252 @@
+"""CSCA08 Assignment 3: arxiv.org
+
+The coauthor graph of arxiv data: one vertex per author, and an edge
+between every two authors who wrote an article together. Authors are
+numbered by an AuthorTable, and each vertex keeps the sorted IDs of its
+neighbours in an array, with a parallel array of the number of articles
+shared with each, so that the graph can be updated when articles are
+added or removed.
+
+"""
+
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from heapq import nlargest, nsmallest
+from itertools import chain, filterfalse
+from math import log
+
+from arxiv_functions import EXAMPLE_ARXIV
+from author_table import AuthorTable, ID_TYPECODE
+from constants import AUTHORS, NameType, ArxivType
+
+# Ways of scoring a suggested collaborator in recommend_collaborators.
+COMMON = 'common'
+ADAMIC_ADAR = 'adamic_adar'
+JACCARD = 'jaccard'
+
+
+class CoauthorGraph:
+    """The coauthor graph of a collection of articles.
+
+    >>> graph = CoauthorGraph(EXAMPLE_ARXIV)
+    >>> graph.get_coauthors(('Tafliovich', 'Anya Y.'))
+    [('Bretscher', 'Anna'), ('Ponce', 'Marcelo')]
+    >>> graph.suggest_collaborators(('Pancer', 'Richard'))
+    [('Ponce', 'Marcelo'), ('Tafliovich', 'Anya Y.')]
+    """
+
+    def __init__(self, id_to_article: ArxivType = None,
+                 authors: AuthorTable = None) -> None:
+        """Initialize the coauthor graph of the articles in id_to_article,
+        numbering authors with the table authors, or with a new table if
+        authors is None.
+        """
+        self.authors = AuthorTable() if authors is None else authors
+        self._neighbours = []
+        self._shared = []
+        if id_to_article:
+            for article in id_to_article.values():
+                self.add_authors(article[AUTHORS])
+
+    def get_author_id(self, author_name: NameType) -> int:
+        """Return the integer ID of author_name, giving author_name a new ID
+        if they do not have one yet.
+
+        >>> graph = CoauthorGraph(EXAMPLE_ARXIV)
+        >>> graph.get_author_id(('Ponce', 'Marcelo'))
+        0
+        >>> graph.get_author_id(('Doe', 'Jane'))
+        5
+        """
+        return self.authors.intern(author_name)
+
+    def get_neighbour_ids(self, author_id: int) -> array:
+        """Return the sorted IDs of the coauthors of the author with ID
+        author_id. The array returned must not be modified.
+
+        >>> graph = CoauthorGraph(EXAMPLE_ARXIV)
+        >>> graph.get_neighbour_ids(graph.get_author_id(('Bretscher',
+        ...                                             'Anna')))
+        array('I', [0, 1, 4])
+        """
+        if author_id < len(self._neighbours):
+            return self._neighbours[author_id]
+        return array(ID_TYPECODE)
+
+    def add_authors(self, authors: list[NameType]) -> None:
+        """Add an edge between every two authors in authors, the authors of
+        one article.
+
+        >>> graph = CoauthorGraph()
+        >>> graph.add_authors([('Breuss', 'Nataliya'), ('Pancer', 'Richard')])
+        >>> graph.get_coauthors(('Breuss', 'Nataliya'))
+        [('Pancer', 'Richard')]
+        """
+        self.add_author_ids(self.authors.intern_all(authors))
+
+    def add_author_ids(self, author_ids: array) -> None:
+        """Add an edge between every two authors whose IDs are in
+        author_ids, the authors of one article.
+        """
+        author_ids = set(author_ids)
+        while len(self._neighbours) < len(self.authors):
+            self._neighbours.append(array(ID_TYPECODE))
+            self._shared.append(array(ID_TYPECODE))
+        for author_id in author_ids:
+            neighbours = self._neighbours[author_id]
+            shared = self._shared[author_id]
+            for other_id in author_ids:
+                if other_id != author_id:
+                    index = bisect_left(neighbours, other_id)
+                    if (index < len(neighbours)
+                            and neighbours[index] == other_id):
+                        shared[index] += 1
+                    else:
+                        neighbours.insert(index, other_id)
+                        shared.insert(index, 1)
+
+    def remove_authors(self, authors: list[NameType]) -> None:
+        """Remove the edges added for an article written by authors.
+
+        >>> graph = CoauthorGraph(EXAMPLE_ARXIV)
+        >>> graph.remove_authors(EXAMPLE_ARXIV['067'][AUTHORS])
+        >>> graph.get_coauthors(('Pancer', 'Richard'))
+        []
+        >>> graph.get_coauthors(('Bretscher', 'Anna'))
+        [('Ponce', 'Marcelo'), ('Tafliovich', 'Anya Y.')]
+        """
+        self.remove_author_ids([self.authors.get_id(author)
+                                for author in authors])
+
+    def remove_author_ids(self, author_ids: array) -> None:
+        """Remove the edges added for an article written by the authors
+        whose IDs are in author_ids.
+        """
+        author_ids = set(author_ids)
+        for author_id in author_ids:
+            neighbours = self._neighbours[author_id]
+            shared = self._shared[author_id]
+            for other_id in author_ids:
+                if other_id != author_id:
+                    index = bisect_left(neighbours, other_id)
+                    if shared[index] == 1:
+                        del neighbours[index]
+                        del shared[index]
+                    else:
+                        shared[index] -= 1
+
+    def get_coauthors(self, author_name: NameType) -> list[NameType]:
+        """Return the sorted list of coauthors of author_name.
+
+        >>> graph = CoauthorGraph(EXAMPLE_ARXIV)
+        >>> graph.get_coauthors(('Bretscher', 'Anna')) == [
+        ...     ('Pancer', 'Richard'), ('Ponce', 'Marcelo'),
+        ...     ('Tafliovich', 'Anya Y.')]
+        True
+        >>> CoauthorGraph(EXAMPLE_ARXIV).get_coauthors(('Doe', 'Jane'))
+        []
+        """
+        author_id = self.authors.get_id(author_name)
+        if author_id is None:
+            return []
+        return sorted(self.authors.get_names(
+            self.get_neighbour_ids(author_id)))
+
+    def suggest_collaborators(self, author_name: NameType) -> list[NameType]:
+        """Return the sorted list of coauthors of the coauthors of
+        author_name who are not author_name or their coauthors.
+
+        >>> graph = CoauthorGraph(EXAMPLE_ARXIV)
+        >>> graph.suggest_collaborators(('Tafliovich', 'Anya Y.'))
+        [('Pancer', 'Richard')]
+        >>> graph.suggest_collaborators(('Breuss', 'Nataliya'))
+        []
+        """
+        author_id = self.authors.get_id(author_name)
+        if author_id is None:
+            return []
+        coauthor_ids = self.get_neighbour_ids(author_id)
+        suggested_ids = set()
+        for coauthor_id in coauthor_ids:
+            suggested_ids.update(self._neighbours[coauthor_id])
+        suggested_ids.difference_update(coauthor_ids)
+        suggested_ids.discard(author_id)
+        return sorted(self.authors.get_names(suggested_ids))
+
+    def recommend_collaborators(self, author_name: NameType, k: int = 10,
+                                weighting: str = COMMON
+                                ) -> list[tuple[NameType, float]]:
+        """Return the k best suggested collaborators of author_name (see
+        suggest_collaborators) with their scores, best first, ties broken
+        by name. Scores are computed according to weighting:
+
+        COMMON: the number of coauthors shared with author_name.
+        ADAMIC_ADAR: the sum of 1 / log(number of coauthors) over the
+            shared coauthors, so that prolific shared coauthors count less.
+        JACCARD: the number of shared coauthors divided by the number of
+            authors who are a coauthor of either.
+
+        The candidates are never sorted as a whole, and names are only
+        compared for the candidates that can be among the k best.
+
+        >>> graph = CoauthorGraph(EXAMPLE_ARXIV)
+        >>> graph.recommend_collaborators(('Pancer', 'Richard'))
+        [(('Ponce', 'Marcelo'), 1), (('Tafliovich', 'Anya Y.'), 1)]
+        >>> graph.recommend_collaborators(('Pancer', 'Richard'), 1, JACCARD)
+        [(('Ponce', 'Marcelo'), 0.5)]
+        >>> graph.recommend_collaborators(('Breuss', 'Nataliya'))
+        []
+        """
+        author_id = self.authors.get_id(author_name)
+        if author_id is None or k <= 0:
+            return []
+        coauthor_ids = self.get_neighbour_ids(author_id)
+        excluded = set(coauthor_ids)
+        excluded.add(author_id)
+        if weighting == ADAMIC_ADAR:
+            shared = {}
+            for coauthor_id in coauthor_ids:
+                neighbours = self._neighbours[coauthor_id]
+                if len(neighbours) < 2:
+                    continue
+                weight = 1 / log(len(neighbours))
+                for other_id in neighbours:
+                    if other_id not in excluded:
+                        shared[other_id] = shared.get(other_id, 0) + weight
+        else:
+            # Every shared coauthor counts 1, so the neighbours of all the
+            # coauthors are chained, filtered and counted in C.
+            shared = Counter(filterfalse(excluded.__contains__,
+                                         chain.from_iterable(map(
+                                             self._neighbours.__getitem__,
+                                             coauthor_ids))))
+
+        if weighting == JACCARD:
+            degree = len(coauthor_ids)
+            shared = {other_id: count / (degree + len(self._neighbours[
+                other_id]) - count) for other_id, count in shared.items()}
+        elif weighting not in (COMMON, ADAMIC_ADAR):
+            raise ValueError('unknown weighting: ' + repr(weighting))
+        if not shared:
+            return []
+
+        # Only candidates scoring at least the k-th best score can be in
+        # the top k. Those scoring more are ranked by name; of those tied
+        # with it, the ones needed are the smallest names, found without
+        # building a key per candidate.
+        lowest = nlargest(k, shared.values())[-1]
+        get_name = self.authors.get_name
+        best = sorted((get_name(other_id), score)
+                      for other_id, score in shared.items()
+                      if score > lowest)
+        best.sort(key=lambda score: -score[1])
+        tied = nsmallest(k - len(best), self.authors.get_names([
+            other_id for other_id, score in shared.items()
+            if score == lowest]))
+        return best + [(name, lowest) for name in tied]
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,268 @@
+"""CSCA08 Assignment 3: arxiv.org
+
+Analytics over the collaboration network of arxiv authors: connected
+components, degree distribution, shortest collaboration paths and
+community detection.
+
+The network is stored in compressed sparse row form: authors are
+numbered in sorted order, and the sorted numbers of the coauthors of
+author i are neighbours[offsets[i]:offsets[i + 1]].
+
+"""
+
+from array import array
+import random
+
+from arxiv_functions import EXAMPLE_BY_AUTHOR
+from constants import NameType
+
+
+class CollaborationGraph:
+    """The collaboration network of the authors in an author to articles
+    map, as made by make_author_to_articles.
+
+    >>> graph = CollaborationGraph(EXAMPLE_BY_AUTHOR)
+    >>> graph.get_coauthors(('Pancer', 'Richard'))
+    [('Bretscher', 'Anna')]
+    >>> graph.get_path(('Pancer', 'Richard'), ('Ponce', 'Marcelo'))
+    [('Pancer', 'Richard'), ('Bretscher', 'Anna'), ('Ponce', 'Marcelo')]
+    """
+
+    def __init__(self, author_to_articles: dict[NameType, list[str]]
+                 ) -> None:
+        """Initialize the collaboration network of the authors in
+        author_to_articles: two authors collaborated if they have an
+        article in common.
+        """
+        self.names = sorted(author_to_articles)
+        self._ids = {name: author_id
+                     for author_id, name in enumerate(self.names)}
+        article_to_authors = {}
+        for name, article_ids in author_to_articles.items():
+            for article_id in article_ids:
+                article_to_authors.setdefault(article_id, []).append(
+                    self._ids[name])
+
+        self.offsets = array('Q', [0])
+        self.neighbours = array('I')
+        for author_id, name in enumerate(self.names):
+            coauthor_ids = set()
+            for article_id in author_to_articles[name]:
+                coauthor_ids.update(article_to_authors[article_id])
+            coauthor_ids.discard(author_id)
+            self.neighbours.extend(sorted(coauthor_ids))
+            self.offsets.append(len(self.neighbours))
+
+    def __len__(self) -> int:
+        """Return the number of authors in this network.
+
+        >>> len(CollaborationGraph(EXAMPLE_BY_AUTHOR))
+        5
+        """
+        return len(self.names)
+
+    def get_edge_count(self) -> int:
+        """Return the number of pairs of authors who collaborated.
+
+        >>> CollaborationGraph(EXAMPLE_BY_AUTHOR).get_edge_count()
+        4
+        """
+        return len(self.neighbours) // 2
+
+    def _get_neighbours(self, author_id: int) -> array:
+        """Return the numbers of the coauthors of the author numbered
+        author_id.
+        """
+        return self.neighbours[self.offsets[author_id]:
+                               self.offsets[author_id + 1]]
+
+    def get_coauthors(self, author_name: NameType) -> list[NameType]:
+        """Return the sorted list of coauthors of author_name.
+
+        >>> CollaborationGraph(EXAMPLE_BY_AUTHOR).get_coauthors(('Doe',
+        ...                                                      'Jane'))
+        []
+        """
+        author_id = self._ids.get(author_name)
+        if author_id is None:
+            return []
+        return [self.names[other_id]
+                for other_id in self._get_neighbours(author_id)]
+
+    def get_degree_distribution(self) -> dict[int, int]:
+        """Return a dict that maps each number of coauthors to the number of
+        authors who have that many coauthors, in increasing order of number
+        of coauthors.
+
+        >>> CollaborationGraph(EXAMPLE_BY_AUTHOR).get_degree_distribution()
+        {0: 1, 1: 1, 2: 2, 3: 1}
+        """
+        distribution = {}
+        for author_id in range(len(self.names)):
+            degree = self.offsets[author_id + 1] - self.offsets[author_id]
+            distribution[degree] = distribution.get(degree, 0) + 1
+        return dict(sorted(distribution.items()))
+
+    def get_components(self) -> list[list[NameType]]:
+        """Return the connected components of this network, each as a
+        sorted list of names, largest first and ties broken by their first
+        name.
+
+        Components are found with union-find, using path halving and union
+        by size.
+
+        >>> CollaborationGraph(EXAMPLE_BY_AUTHOR).get_components() == [
+        ...     [('Bretscher', 'Anna'), ('Pancer', 'Richard'),
+        ...      ('Ponce', 'Marcelo'), ('Tafliovich', 'Anya Y.')],
+        ...     [('Breuss', 'Nataliya')]]
+        True
+        """
+        parents = array('I', range(len(self.names)))
+        sizes = array('I', [1]) * len(self.names)
+        for author_id in range(len(self.names)):
+            for other_id in self._get_neighbours(author_id):
+                if other_id < author_id:
+                    continue
+                root = find_root(parents, author_id)
+                other_root = find_root(parents, other_id)
+                if root != other_root:
+                    if sizes[root] < sizes[other_root]:
+                        root, other_root = other_root, root
+                    parents[other_root] = root
+                    sizes[root] += sizes[other_root]
+
+        components = {}
+        for author_id, name in enumerate(self.names):
+            components.setdefault(find_root(parents, author_id),
+                                  []).append(name)
+        return sorted(components.values(),
+                      key=lambda component: (-len(component), component[0]))
+
+    def get_distances(self, author_name: NameType) -> dict[NameType, int]:
+        """Return a dict that maps each author connected to author_name to
+        the length of the shortest collaboration path between them, like an
+        Erdos number.
+
+        >>> CollaborationGraph(EXAMPLE_BY_AUTHOR).get_distances(
+        ...     ('Pancer', 'Richard'))[('Tafliovich', 'Anya Y.')]
+        2
+        """
+        author_id = self._ids.get(author_name)
+        if author_id is None:
+            return {}
+        distances = self._search(author_id, None)[0]
+        return {self.names[other_id]: distance
+                for other_id, distance in enumerate(distances)
+                if distance >= 0}
+
+    def get_path(self, start: NameType, end: NameType) -> list[NameType]:
+        """Return a shortest collaboration path from start to end, as the
+        list of the names on it, or [] if there is none.
+
+        >>> graph = CollaborationGraph(EXAMPLE_BY_AUTHOR)
+        >>> graph.get_path(('Ponce', 'Marcelo'), ('Breuss', 'Nataliya'))
+        []
+        >>> graph.get_path(('Ponce', 'Marcelo'), ('Ponce', 'Marcelo'))
+        [('Ponce', 'Marcelo')]
+        """
+        start_id = self._ids.get(start)
+        end_id = self._ids.get(end)
+        if start_id is None or end_id is None:
+            return []
+        distances, parents = self._search(start_id, end_id)
+        if distances[end_id] < 0:
+            return []
+        path = [end_id]
+        while path[-1] != start_id:
+            path.append(parents[path[-1]])
+        return [self.names[author_id] for author_id in reversed(path)]
+
+    def _search(self, start_id: int, end_id: int) -> tuple[array, array]:
+        """Return the distances (-1 if unreachable) from the author numbered
+        start_id, and the previous author on a shortest path to each
+        author, found by breadth-first search, stopping early once the
+        author numbered end_id (if not None) is reached.
+        """
+        distances = array('i', [-1]) * len(self.names)
+        parents = array('i', [-1]) * len(self.names)
+        distances[start_id] = 0
+        frontier = [start_id]
+        distance = 0
+        while frontier:
+            if end_id is not None and distances[end_id] >= 0:
+                break
+            distance += 1
+            next_frontier = []
+            for author_id in frontier:
+                for other_id in self._get_neighbours(author_id):
+                    if distances[other_id] < 0:
+                        distances[other_id] = distance
+                        parents[other_id] = author_id
+                        next_frontier.append(other_id)
+            frontier = next_frontier
+        return distances, parents
+
+    def get_communities(self, max_rounds: int = 20,
+                        seed: int = 0) -> list[list[NameType]]:
+        """Return the communities of this network found by label
+        propagation, each as a sorted list of names, largest first and
+        ties broken by their first name.
+
+        Every author starts with their own label. In each round, authors
+        are visited in a random order (from seed) and take the label most
+        common among their coauthors, the smallest label on ties, until no
+        label changes or max_rounds rounds are done.
+
+        >>> CollaborationGraph(EXAMPLE_BY_AUTHOR).get_communities() == [
+        ...     [('Bretscher', 'Anna'), ('Pancer', 'Richard'),
+        ...      ('Ponce', 'Marcelo'), ('Tafliovich', 'Anya Y.')],
+        ...     [('Breuss', 'Nataliya')]]
+        True
+        """
+        labels = array('I', range(len(self.names)))
+        order = list(range(len(self.names)))
+        rng = random.Random(seed)
+        for _ in range(max_rounds):
+            rng.shuffle(order)
+            changed = False
+            for author_id in order:
+                counts = {}
+                for other_id in self._get_neighbours(author_id):
+                    label = labels[other_id]
+                    counts[label] = counts.get(label, 0) + 1
+                if counts:
+                    best = max(counts.values())
+                    label = min(label for label, count in counts.items()
+                                if count == best)
+                    if label != labels[author_id]:
+                        labels[author_id] = label
+                        changed = True
+            if not changed:
+                break
+
+        communities = {}
+        for author_id, name in enumerate(self.names):
+            communities.setdefault(labels[author_id], []).append(name)
+        return sorted(communities.values(),
+                      key=lambda community: (-len(community), community[0]))
+
+
+def find_root(parents: array, author_id: int) -> int:
+    """Return the root of the tree containing author_id in the union-find
+    forest parents, halving the path to it on the way.
+
+    >>> parents = array('I', [0, 0, 1, 2])
+    >>> find_root(parents, 3)
+    0
+    >>> parents
+    array('I', [0, 0, 1, 1])
+    """
+    while parents[author_id] != author_id:
+        parents[author_id] = parents[parents[author_id]]
+        author_id = parents[author_id]
+    return author_id
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
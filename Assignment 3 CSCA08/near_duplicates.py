@@ -0,0 +1,230 @@
+"""CSCA08 Assignment 3: arxiv.org
+
+Detection of near-duplicate articles, such as resubmissions and
+cross-listings with almost the same title and abstract, using MinHash
+signatures and locality-sensitive hashing (LSH).
+
+The signature of an article has BANDS * ROWS values. Articles whose
+signatures agree on all the rows of some band share an LSH bucket and
+become candidates; candidates whose signatures agree on at least
+threshold of their values are near duplicates. Articles are only ever
+compared with the other articles in their buckets.
+
+"""
+
+from array import array
+import random
+from zlib import crc32
+
+from arxiv_functions import EXAMPLE_ARXIV
+from arxiv_search import tokenize
+from collab_analytics import find_root
+from constants import ID, TITLE, ABSTRACT, ArticleType, ArxivType
+
+SHINGLE_SIZE = 3
+BANDS = 16
+ROWS = 4
+THRESHOLD = 0.5
+
+
+def get_shingles(article: ArticleType) -> set[int]:
+    """Return the hashes of the sequences of SHINGLE_SIZE consecutive words
+    in the title and abstract of article, or of all the words if there are
+    fewer.
+
+    >>> len(get_shingles(EXAMPLE_ARXIV['008']))
+    17
+    >>> get_shingles({'title': None, 'abstract': None})
+    set()
+    """
+    words = tokenize(article[TITLE]) + tokenize(article[ABSTRACT])
+    return {crc32(' '.join(words[index:index + SHINGLE_SIZE]).encode())
+            for index in range(max(len(words) - SHINGLE_SIZE + 1,
+                                   min(len(words), 1)))}
+
+
+class NearDuplicateIndex:
+    """An LSH index of the MinHash signatures of articles.
+
+    >>> index = NearDuplicateIndex(EXAMPLE_ARXIV)
+    >>> resubmitted = dict(EXAMPLE_ARXIV['827'], identifier='828')
+    >>> resubmitted['abstract'] += ' Resubmitted.'
+    >>> index.add_article(resubmitted)
+    ['827']
+    >>> index.get_clusters()
+    [['827', '828']]
+    """
+
+    def __init__(self, id_to_article: ArxivType = None,
+                 threshold: float = THRESHOLD, seed: int = 0) -> None:
+        """Initialize an index of the articles in id_to_article, in which
+        articles with an estimated Jaccard similarity of threshold or more
+        are near duplicates. seed chooses the MinHash functions.
+        """
+        self.threshold = threshold
+        # Each MinHash function is x XOR mask for a random 32-bit mask:
+        # cheap in pure Python, and random enough on CRC-32 hashes.
+        rng = random.Random(seed)
+        self._masks = [rng.getrandbits(32) for _ in range(BANDS * ROWS)]
+        self._signatures = {}
+        self._buckets = {}
+        if id_to_article:
+            for article in id_to_article.values():
+                self.add_article(article)
+
+    def __len__(self) -> int:
+        """Return the number of articles in this index.
+
+        >>> len(NearDuplicateIndex(EXAMPLE_ARXIV))
+        5
+        """
+        return len(self._signatures)
+
+    def get_signature(self, article: ArticleType) -> array:
+        """Return the MinHash signature of article, or None if article has
+        no words.
+
+        >>> signature = NearDuplicateIndex().get_signature(
+        ...     EXAMPLE_ARXIV['008'])
+        >>> len(signature)
+        64
+        """
+        shingles = get_shingles(article)
+        if not shingles:
+            return None
+        return array('I', [min(map(mask.__xor__, shingles))
+                           for mask in self._masks])
+
+    def _get_bands(self, signature: array) -> list[tuple]:
+        """Return the LSH bucket keys of signature, one per band."""
+        return [(band, tuple(signature[band * ROWS:(band + 1) * ROWS]))
+                for band in range(BANDS)]
+
+    def find_duplicates(self, article: ArticleType) -> list[str]:
+        """Return the sorted IDs of the articles in this index, other than
+        article itself, that are near duplicates of article.
+
+        >>> index = NearDuplicateIndex(EXAMPLE_ARXIV)
+        >>> index.find_duplicates(dict(EXAMPLE_ARXIV['031'],
+        ...                            identifier='100'))
+        ['031']
+        >>> index.find_duplicates(EXAMPLE_ARXIV['031'])
+        []
+        """
+        signature = self.get_signature(article)
+        if signature is None:
+            return []
+        return self._find_similar(article[ID], signature)
+
+    def _find_similar(self, article_id: str, signature: array) -> list[str]:
+        """Return the sorted IDs of the articles, other than the one with
+        ID article_id, that share a bucket with signature and agree with it
+        on at least threshold of its values.
+        """
+        candidates = set()
+        for key in self._get_bands(signature):
+            candidates.update(self._buckets.get(key, ()))
+        candidates.discard(article_id)
+        return sorted(
+            other_id for other_id in candidates
+            if get_similarity(signature, self._signatures[other_id])
+            >= self.threshold)
+
+    def add_article(self, article: ArticleType) -> list[str]:
+        """Add article to this index, replacing the article with the same
+        ID if there is one, and return the sorted IDs of the articles it is
+        a near duplicate of.
+
+        >>> NearDuplicateIndex(EXAMPLE_ARXIV).add_article(
+        ...     {'identifier': '100', 'title': 'New', 'abstract': None})
+        []
+        """
+        article_id = article[ID]
+        if article_id in self._signatures:
+            self.remove_article(article_id)
+        signature = self.get_signature(article)
+        if signature is None:
+            return []
+        duplicates = self._find_similar(article_id, signature)
+        self._signatures[article_id] = signature
+        for key in self._get_bands(signature):
+            self._buckets.setdefault(key, []).append(article_id)
+        return duplicates
+
+    def remove_article(self, article_id: str) -> None:
+        """Remove the article with ID article_id from this index, if it is
+        in it.
+
+        >>> index = NearDuplicateIndex(EXAMPLE_ARXIV)
+        >>> index.remove_article('031')
+        >>> index.find_duplicates(dict(EXAMPLE_ARXIV['031'],
+        ...                            identifier='100'))
+        []
+        """
+        signature = self._signatures.pop(article_id, None)
+        if signature is not None:
+            for key in self._get_bands(signature):
+                bucket = self._buckets[key]
+                bucket.remove(article_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def get_clusters(self) -> list[list[str]]:
+        """Return the groups of two or more articles linked by near
+        duplication, each as a sorted list of IDs, in sorted order.
+
+        Only the pairs of articles that share a bucket are compared, and
+        the groups are joined with union-find.
+
+        >>> NearDuplicateIndex(EXAMPLE_ARXIV).get_clusters()
+        []
+        """
+        article_ids = sorted(self._signatures)
+        numbers = {article_id: number
+                   for number, article_id in enumerate(article_ids)}
+        parents = array('I', range(len(article_ids)))
+        for bucket in self._buckets.values():
+            for index, article_id in enumerate(bucket):
+                signature = self._signatures[article_id]
+                for other_id in bucket[index + 1:]:
+                    root = find_root(parents, numbers[article_id])
+                    other_root = find_root(parents, numbers[other_id])
+                    if root != other_root and get_similarity(
+                            signature, self._signatures[other_id]
+                    ) >= self.threshold:
+                        parents[max(root, other_root)] = min(root,
+                                                             other_root)
+
+        clusters = {}
+        for number, article_id in enumerate(article_ids):
+            clusters.setdefault(find_root(parents, number),
+                                []).append(article_id)
+        return sorted(cluster for cluster in clusters.values()
+                      if len(cluster) > 1)
+
+
+def get_similarity(signature: array, other_signature: array) -> float:
+    """Return the fraction of the values on which signature and
+    other_signature agree, an estimate of the Jaccard similarity of the
+    shingles they were made from.
+
+    >>> get_similarity(array('I', [1, 2, 3, 4]), array('I', [1, 2, 0, 4]))
+    0.75
+    """
+    return sum(map(int.__eq__, signature, other_signature)) / len(signature)
+
+
+def find_near_duplicates(id_to_article: ArxivType,
+                         threshold: float = THRESHOLD) -> list[list[str]]:
+    """Return the groups of near-duplicate articles in id_to_article, as in
+    NearDuplicateIndex.get_clusters.
+
+    >>> find_near_duplicates(EXAMPLE_ARXIV)
+    []
+    """
+    return NearDuplicateIndex(id_to_article, threshold).get_clusters()
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,269 @@
+"""CSCA08 Assignment 3: arxiv.org
+
+A cache of the results of queries about arxiv data, such as get_coauthors
+and suggest_collaborators, so that a report asking the same question many
+times only computes the answer once.
+
+Results are keyed on the query function, the corpus (the arxiv data or
+ArxivIndex asked about), the version of the corpus and the other
+arguments. The version of an ArxivIndex is its version attribute, which
+changes whenever an article is added or removed. The version of arxiv
+data is its number of articles together with its change count (see
+get_change_count), so adding or removing articles, as
+keep_prolific_authors and del do, makes its results out of date. Other
+changes to arxiv data, such as replacing an article with
+arxiv_functions.upsert_arxiv_file, must be made through a function
+wrapped with mutates=True, or followed by a call to mark_changed.
+
+Cached results are shared, and must not be modified.
+
+"""
+
+from collections import OrderedDict
+from functools import update_wrapper
+from typing import Callable, Hashable
+
+from arxiv_functions import (EXAMPLE_ARXIV, get_coauthors,
+                             keep_prolific_authors)
+from constants import ArxivType
+
+MAX_ENTRIES = 4096
+MAX_SIZE = 1 << 20
+
+# For each corpus with cached results, by id, the number of cached
+# results about it in all caches and the number of times it has been
+# marked as changed. The cached results keep their corpus alive, and an
+# item is removed with the last of them, so an id here is never that of
+# another corpus.
+_corpora = {}
+
+
+def get_change_count(corpus: object) -> int:
+    """Return the number of times corpus has been marked as changed (see
+    mark_changed) since results about it were first cached.
+
+    >>> get_change_count(EXAMPLE_ARXIV)
+    0
+    """
+    return _corpora.get(id(corpus), (0, 0))[1]
+
+
+def mark_changed(corpus: object) -> None:
+    """Record that corpus was changed, so that the results cached about
+    it are out of date.
+
+    >>> arxiv_copy = dict(EXAMPLE_ARXIV)
+    >>> cache = QueryCache()
+    >>> cache.call(get_coauthors, arxiv_copy, ('Pancer', 'Richard'))
+    [('Bretscher', 'Anna')]
+    >>> mark_changed(arxiv_copy)
+    >>> get_change_count(arxiv_copy)
+    1
+    """
+    counts = _corpora.get(id(corpus))
+    if counts is not None:
+        counts[1] += 1
+
+
+def get_version(corpus: object) -> Hashable:
+    """Return the version of corpus: its version attribute if it has one,
+    and its number of articles and change count as arxiv data otherwise.
+
+    >>> get_version(EXAMPLE_ARXIV)
+    (5, 0)
+    """
+    version = getattr(corpus, 'version', None)
+    if version is None:
+        return len(corpus), get_change_count(corpus)
+    return version
+
+
+def _add_result(corpus: object) -> None:
+    """Record that a result about corpus was cached."""
+    counts = _corpora.setdefault(id(corpus), [0, 0])
+    counts[0] += 1
+
+
+def _remove_result(entry: tuple) -> None:
+    """Record that the cached result entry, a (result, size, corpus)
+    tuple, was removed.
+    """
+    key = id(entry[2])
+    counts = _corpora[key]
+    counts[0] -= 1
+    if not counts[0]:
+        del _corpora[key]
+
+
+def get_size(result: object) -> int:
+    """Return the size of result counted against the size limit of a
+    cache: its length if it has one, and 1 otherwise.
+
+    >>> get_size([('Ponce', 'Marcelo'), ('Tafliovich', 'Anya Y.')])
+    2
+    >>> get_size(None)
+    1
+    """
+    try:
+        return max(len(result), 1)
+    except TypeError:
+        return 1
+
+
+class QueryCache:
+    """An LRU cache of query results.
+
+    >>> cache = QueryCache()
+    >>> cached_get_coauthors = cache.wrap(get_coauthors)
+    >>> arxiv_copy = dict(EXAMPLE_ARXIV)
+    >>> cached_get_coauthors(arxiv_copy, ('Pancer', 'Richard'))
+    [('Bretscher', 'Anna')]
+    >>> cached_get_coauthors(arxiv_copy, ('Pancer', 'Richard'))
+    [('Bretscher', 'Anna')]
+    >>> cache.hits, cache.misses
+    (1, 1)
+    >>> keep_prolific_authors(arxiv_copy, 3)
+    >>> cached_get_coauthors(arxiv_copy, ('Pancer', 'Richard'))
+    []
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES,
+                 max_size: int = MAX_SIZE) -> None:
+        """Initialize an empty cache that keeps at most max_entries
+        results, of a total size (see get_size) of at most max_size,
+        evicting the least recently used results first.
+        """
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        # Each entry is (result, size, corpus). Keeping the corpus alive
+        # while it has results means its id cannot be reused by another.
+        self._entries = OrderedDict()
+
+    def __del__(self) -> None:
+        """Forget the results in this cache, so that the change counts of
+        their corpora can be dropped.
+        """
+        self.invalidate()
+
+    def __len__(self) -> int:
+        """Return the number of results in this cache.
+
+        >>> len(QueryCache())
+        0
+        """
+        return len(self._entries)
+
+    def lookup(self, function: Callable, corpus: object, args: tuple,
+               default: object = None) -> object:
+        """Return the cached result of function(corpus, *args) for the
+        current version of corpus, or default if there is none.
+
+        >>> QueryCache().lookup(get_coauthors, EXAMPLE_ARXIV, ('x', 'y'))
+        """
+        key = (function, id(corpus), get_version(corpus), args)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def store(self, function: Callable, corpus: object, args: tuple,
+              result: object, size: int = None) -> None:
+        """Cache result as the result of function(corpus, *args) for the
+        current version of corpus, with size size (get_size(result) by
+        default), evicting the least recently used results if a limit is
+        exceeded. A result larger than the size limit is not cached.
+
+        >>> cache = QueryCache(max_entries=1)
+        >>> cache.store(get_coauthors, EXAMPLE_ARXIV, ('x',), [])
+        >>> cache.store(get_coauthors, EXAMPLE_ARXIV, ('y',), [])
+        >>> cache.lookup(get_coauthors, EXAMPLE_ARXIV, ('x',), 'evicted')
+        'evicted'
+        """
+        if size is None:
+            size = get_size(result)
+        if size > self.max_size:
+            return
+        key = (function, id(corpus), get_version(corpus), args)
+        if key in self._entries:
+            self.size -= self._entries.pop(key)[1]
+        else:
+            _add_result(corpus)
+        self._entries[key] = (result, size, corpus)
+        self.size += size
+        while len(self._entries) > self.max_entries or (
+                self.size > self.max_size):
+            entry = self._entries.popitem(last=False)[1]
+            self.size -= entry[1]
+            _remove_result(entry)
+
+    def call(self, function: Callable, corpus: object,
+             *args: Hashable) -> object:
+        """Return function(corpus, *args), from this cache if it was
+        computed for the current version of corpus.
+
+        >>> QueryCache().call(get_coauthors, EXAMPLE_ARXIV,
+        ...                   ('Pancer', 'Richard'))
+        [('Bretscher', 'Anna')]
+        """
+        result = self.lookup(function, corpus, args, self)
+        if result is self:
+            result = function(corpus, *args)
+            self.store(function, corpus, args, result)
+        return result
+
+    def invalidate(self, corpus: object = None) -> None:
+        """Remove the results about corpus from this cache, or all the
+        results if corpus is None.
+
+        >>> cache = QueryCache()
+        >>> cache.call(get_coauthors, EXAMPLE_ARXIV, ('Pancer', 'Richard'))
+        [('Bretscher', 'Anna')]
+        >>> cache.invalidate(EXAMPLE_ARXIV)
+        >>> len(cache)
+        0
+        """
+        for key in [key for key in self._entries
+                    if corpus is None or key[1] == id(corpus)]:
+            entry = self._entries.pop(key)
+            self.size -= entry[1]
+            _remove_result(entry)
+
+    def wrap(self, function: Callable, mutates: bool = False) -> Callable:
+        """Return a function that calls function(corpus, *args) through
+        this cache. If mutates is True, function changes corpus, so the
+        returned function is not cached and invalidates the results about
+        corpus instead.
+
+        >>> cache = QueryCache()
+        >>> cached_get_coauthors = cache.wrap(get_coauthors)
+        >>> arxiv_copy = dict(EXAMPLE_ARXIV)
+        >>> cached_get_coauthors(arxiv_copy, ('Pancer', 'Richard'))
+        [('Bretscher', 'Anna')]
+        >>> cache.wrap(keep_prolific_authors, True)(arxiv_copy, 1)
+        >>> len(cache)
+        0
+        """
+        if mutates:
+            def wrapper(corpus: ArxivType, *args: object) -> object:
+                """Call function and invalidate the results about corpus.
+                """
+                try:
+                    return function(corpus, *args)
+                finally:
+                    self.invalidate(corpus)
+        else:
+            def wrapper(corpus: ArxivType, *args: Hashable) -> object:
+                """Call function through the cache."""
+                return self.call(function, corpus, *args)
+        return update_wrapper(wrapper, function)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
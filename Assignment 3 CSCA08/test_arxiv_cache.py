@@ -0,0 +1,107 @@
+"""CSCA08 Assignment 3: arxiv.org
+
+Tests for the binary arxiv cache in arxiv_cache.
+
+"""
+
+import os
+import tempfile
+import unittest
+from arxiv_cache import CachedArxiv, load_arxiv, write_arxiv_cache
+from arxiv_functions import EXAMPLE_ARXIV, make_author_to_articles
+from test_iter_arxiv_file import EXAMPLE_FILE
+
+
+class TestArxivCache(unittest.TestCase):
+    """Test writing, reading and rebuilding arxiv caches."""
+
+    def setUp(self):
+        """Create a temporary directory for cache files."""
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def path(self, name: str) -> str:
+        """Return the path of the file name in the temporary directory.
+
+        """
+
+        return os.path.join(self.directory.name, name)
+
+    def test_round_trip(self):
+        """Test that a cache gives back the data it was written from."""
+
+        write_arxiv_cache(EXAMPLE_ARXIV, self.path('example.cache'))
+        with CachedArxiv(self.path('example.cache')) as cache:
+            self.assertEqual(cache.to_dict(), EXAMPLE_ARXIV)
+            self.assertEqual(cache.get_author_to_articles(),
+                             make_author_to_articles(EXAMPLE_ARXIV))
+            self.assertEqual(cache.get_articles_by(('Bretscher', 'Anna')),
+                             ['067', '827'])
+            self.assertEqual(cache.get_articles_by(('Doe', 'Jane')), [])
+            self.assertNotIn('999', cache)
+
+    def test_empty(self):
+        """Test a cache of no articles."""
+
+        write_arxiv_cache({}, self.path('empty.cache'))
+        with CachedArxiv(self.path('empty.cache')) as cache:
+            self.assertEqual(cache.to_dict(), {})
+
+    def test_invalid_cache(self):
+        """Test that opening a file that is not a cache fails."""
+
+        with open(self.path('bad.cache'), 'wb') as bad_file:
+            bad_file.write(b'not a cache at all, but long enough to read' * 2)
+        with self.assertRaises(ValueError):
+            CachedArxiv(self.path('bad.cache'))
+
+    def test_truncated_cache(self):
+        """Test that opening a truncated or extended cache fails, and that
+        load_arxiv rebuilds it.
+
+        """
+
+        source = self.path('example.txt')
+        with open(source, 'w', encoding='utf-8') as source_file:
+            source_file.write(EXAMPLE_FILE)
+        load_arxiv(source).close()
+        self.assertEqual(sorted(os.listdir(self.directory.name)),
+                         ['example.txt', 'example.txt.cache'])
+        with open(source + '.cache', 'rb') as cache_file:
+            data = cache_file.read()
+        for damaged in [data[:len(data) - 8], data[:len(data) // 2],
+                        data + bytes(8)]:
+            with open(source + '.cache', 'r+b') as cache_file:
+                cache_file.write(damaged)
+                cache_file.truncate()
+            with self.assertRaises(ValueError):
+                CachedArxiv(source + '.cache')
+            with load_arxiv(source) as cache:
+                self.assertEqual(cache.to_dict(), EXAMPLE_ARXIV)
+
+    def test_rebuilt_when_source_changes(self):
+        """Test that load_arxiv rebuilds the cache after the source file
+        changes, and reuses it otherwise.
+
+        """
+
+        source = self.path('example.txt')
+        with open(source, 'w', encoding='utf-8') as source_file:
+            source_file.write(EXAMPLE_FILE)
+        with load_arxiv(source) as cache:
+            self.assertEqual(cache.to_dict(), EXAMPLE_ARXIV)
+        cache_stat = os.stat(source + '.cache')
+        with load_arxiv(source) as cache:
+            self.assertEqual(len(cache), 5)
+        self.assertEqual(os.stat(source + '.cache').st_mtime_ns,
+                         cache_stat.st_mtime_ns)
+
+        with open(source, 'w', encoding='utf-8') as source_file:
+            source_file.write(EXAMPLE_FILE[:EXAMPLE_FILE.index('031')])
+        with load_arxiv(source) as cache:
+            self.assertEqual(list(cache), ['008'])
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
@@ -0,0 +1,108 @@
+"""CSCA08 Assignment 3: arxiv.org
+
+Tests for the columnar export in arxiv_export.
+
+"""
+
+import ast
+from datetime import date, timedelta
+from io import StringIO
+import os
+import random
+import tempfile
+import unittest
+from arxiv_export import (export_articles, export_arxiv_file, read_column,
+                          read_string_column, NOT_A_TIME)
+from arxiv_functions import EXAMPLE_ARXIV
+from test_arxiv_index import random_article
+from test_iter_arxiv_file import EXAMPLE_FILE
+
+
+class TestArxivExport(unittest.TestCase):
+    """Test that exported columns hold the data they were written from."""
+
+    def setUp(self):
+        """Create a temporary directory for the columns."""
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def read_articles(self) -> dict:
+        """Return the articles in the columns in the temporary directory,
+        as arxiv data.
+
+        """
+
+        directory = self.directory.name
+        columns = {name: read_string_column(directory, name)
+                   for name in ['identifier', 'title', 'abstract',
+                                'author_last', 'author_first']}
+        for name in ['created', 'modified', 'edge_article', 'edge_author',
+                     'edge_position']:
+            columns[name] = read_column(os.path.join(directory,
+                                                     name + '.npy'))[1]
+        authors = list(zip(columns['author_last'], columns['author_first']))
+
+        id_to_article = {}
+        for row, article_id in enumerate(columns['identifier']):
+            article = {'identifier': article_id,
+                       'title': columns['title'][row],
+                       'abstract': columns['abstract'][row],
+                       'authors': []}
+            for field in ['created', 'modified']:
+                day = columns[field][row]
+                article[field] = None if day == NOT_A_TIME else str(
+                    date(1970, 1, 1) + timedelta(days=day))
+            id_to_article[article_id] = article
+        for row, author_id, position in zip(columns['edge_article'],
+                                            columns['edge_author'],
+                                            columns['edge_position']):
+            article_authors = id_to_article[columns['identifier'][row]][
+                'authors']
+            self.assertEqual(position, len(article_authors))
+            article_authors.append(authors[author_id])
+        return id_to_article
+
+    def test_example_file(self):
+        """Test exporting the example file."""
+
+        self.assertEqual(export_arxiv_file(StringIO(EXAMPLE_FILE),
+                                           self.directory.name), 5)
+        self.assertEqual(self.read_articles(), EXAMPLE_ARXIV)
+
+    def test_random_articles(self):
+        """Test exporting random articles, including non-ASCII strings,
+        with more values than fit in one chunk.
+
+        """
+
+        rng = random.Random(0)
+        articles = []
+        for number in range(5000):
+            article = random_article(rng, str(number))
+            article['title'] = rng.choice([None, '', 'Erdős', 'Ünïcode'])
+            articles.append(article)
+        self.assertEqual(export_articles(iter(articles),
+                                         self.directory.name), 5000)
+        self.assertEqual(self.read_articles(),
+                         {article['identifier']: article
+                          for article in articles})
+
+    def test_headers(self):
+        """Test that the headers can be read as .npy headers."""
+
+        export_articles(EXAMPLE_ARXIV.values(), self.directory.name)
+        with open(os.path.join(self.directory.name, 'edge_author.npy'),
+                  'rb') as column_file:
+            self.assertEqual(column_file.read(8), b'\x93NUMPY\x01\x00')
+            header_size = int.from_bytes(column_file.read(2), 'little')
+            self.assertEqual((10 + header_size) % 64, 0)
+            header = ast.literal_eval(column_file.read(header_size).decode(
+                'latin-1'))
+        self.assertEqual(header['shape'], (sum(
+            len(article['authors']) for article in EXAMPLE_ARXIV.values()),))
+        self.assertFalse(header['fortran_order'])
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
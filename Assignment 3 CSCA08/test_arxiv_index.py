@@ -0,0 +1,205 @@
+"""CSCA08 Assignment 3: arxiv.org
+
+Tests that ArxivIndex stays consistent with the functions in
+arxiv_functions as articles are added and removed.
+
+"""
+
+from copy import deepcopy
+from io import StringIO
+import random
+import unittest
+from arxiv_functions import (EXAMPLE_ARXIV, make_author_to_articles,
+                             get_coauthors, get_most_published_authors,
+                             suggest_collaborators, keep_prolific_authors,
+                             read_arxiv_file, upsert_arxiv_file)
+from arxiv_index import ArxivIndex
+from test_iter_arxiv_file import EXAMPLE_FILE
+
+AUTHORS = [('Ponce', 'Marcelo'), ('Tafliovich', 'Anya Y.'),
+           ('Bretscher', 'Anna'), ('Breuss', 'Nataliya'),
+           ('Pancer', 'Richard'), ('Smith', 'Jo'), ('Chen', 'Li')]
+
+
+def random_article(rng: random.Random, article_id: str) -> dict:
+    """Return an article with ID article_id and random authors from
+    AUTHORS chosen using rng.
+
+    """
+
+    dates = [None, '2021-09-01', '2021-09-02', '2021-10-01']
+    return {'identifier': article_id, 'title': 'Article ' + article_id,
+            'created': rng.choice(dates), 'modified': rng.choice(dates),
+            'authors': sorted(rng.sample(AUTHORS, rng.randint(0, 4))),
+            'abstract': None}
+
+
+def coauthors_of(articles: dict, author: tuple) -> list:
+    """Return the sorted coauthors of author in articles.
+
+    """
+
+    coauthors = set()
+    for article in articles.values():
+        if author in article['authors']:
+            coauthors.update(article['authors'])
+    coauthors.discard(author)
+    return sorted(coauthors)
+
+
+class TestArxivIndex(unittest.TestCase):
+    """Test the class ArxivIndex."""
+
+    def assert_consistent(self, index: ArxivIndex, articles: dict) -> None:
+        """Assert that index answers author queries over articles like the
+        functions in arxiv_functions do.
+
+        """
+
+        self.assertEqual(index.articles, articles)
+        self.assertEqual(index.get_author_to_articles(),
+                         make_author_to_articles(articles))
+        if articles:
+            self.assertEqual(index.get_most_published_authors(),
+                             get_most_published_authors(articles))
+        counts = sorted((-len(article_ids), author) for author, article_ids
+                        in make_author_to_articles(articles).items())
+        for k in [1, 3, 10]:
+            self.assertEqual(index.get_top_authors(k),
+                             [(author, -count) for count, author
+                              in counts[:k]])
+        for field, dates in [('created', index.created),
+                             ('modified', index.modified)]:
+            self.assertEqual(dates.get_range(), sorted(
+                (article_id for article_id, article in articles.items()
+                 if article[field] is not None),
+                key=lambda article_id: (articles[article_id][field],
+                                        article_id)))
+        for author in AUTHORS:
+            self.assertEqual(index.get_coauthors(author),
+                             coauthors_of(articles, author))
+            self.assertEqual(get_coauthors(articles, author),
+                             coauthors_of(articles, author))
+            self.assertEqual(index.suggest_collaborators(author),
+                             suggest_collaborators(articles, author))
+
+    def test_handout_example(self):
+        """Test ArxivIndex with the handout example."""
+
+        index = ArxivIndex(EXAMPLE_ARXIV)
+        self.assert_consistent(index, EXAMPLE_ARXIV)
+
+    def test_random_changes(self):
+        """Test ArxivIndex after random additions, replacements and
+        removals."""
+
+        rng = random.Random(2023)
+        articles = deepcopy(EXAMPLE_ARXIV)
+        index = ArxivIndex(articles)
+        for step in range(200):
+            article_id = str(rng.randint(0, 30))
+            if article_id in articles and rng.random() < 0.5:
+                del articles[article_id]
+                index.remove_article(article_id)
+            else:
+                article = random_article(rng, article_id)
+                articles[article_id] = article
+                index.add_article(article)
+            self.assert_consistent(index, articles)
+
+    def test_articles_not_changed(self):
+        """Test that adding articles does not change the caller's
+        articles, so that interned author names stay inside the index."""
+
+        articles = deepcopy(EXAMPLE_ARXIV)
+        authors = {article_id: article['authors']
+                   for article_id, article in articles.items()}
+        index = ArxivIndex(articles)
+        for article_id, article in articles.items():
+            self.assertIs(article['authors'], authors[article_id])
+            self.assertIsNot(index.articles[article_id], article)
+        self.assertEqual(articles, EXAMPLE_ARXIV)
+        self.assert_consistent(index, EXAMPLE_ARXIV)
+
+    def test_keep_prolific_authors(self):
+        """Test ArxivIndex.keep_prolific_authors against
+        keep_prolific_authors on random articles."""
+
+        rng = random.Random(41)
+        for min_publications in range(5):
+            for every_author in [False, True]:
+                articles = {}
+                for number in range(25):
+                    article_id = str(number)
+                    articles[article_id] = random_article(rng, article_id)
+                index = ArxivIndex(articles)
+                articles = deepcopy(articles)
+                keep_prolific_authors(articles, min_publications,
+                                      every_author)
+                index.keep_prolific_authors(min_publications, every_author)
+                self.assert_consistent(index, articles)
+
+    def test_ingest_delta(self):
+        """Test that ingesting a delta file gives the same index as reading
+        the whole file again."""
+
+        split = EXAMPLE_FILE.index('067')
+        delta = EXAMPLE_FILE[split:] + EXAMPLE_FILE[:split].replace(
+            'Ponce,Marcelo', 'Smith,Jo')
+        articles = read_arxiv_file(StringIO(EXAMPLE_FILE[:split]))
+        index = ArxivIndex(articles)
+        by_author = make_author_to_articles(articles)
+
+        self.assertEqual(index.ingest(StringIO(delta)),
+                         ['067', '827', '042', '008', '031'])
+        upsert_arxiv_file(articles, by_author, StringIO(delta))
+        expected = read_arxiv_file(StringIO(delta))
+        self.assertEqual(articles, expected)
+        self.assertEqual(by_author, make_author_to_articles(expected))
+        self.assert_consistent(index, expected)
+
+
+    def test_invalid_dates(self):
+        """Test that adding or ingesting an article with an invalid date
+        raises ValueError and leaves the index unchanged."""
+
+        index = ArxivIndex(EXAMPLE_ARXIV, True, True)
+        for field in ['created', 'modified']:
+            article = dict(EXAMPLE_ARXIV['008'], authors=[('Smith', 'Jo')])
+            article[field] = '2021-13-45'
+            with self.assertRaises(ValueError):
+                index.add_article(article)
+            self.assert_consistent(index, EXAMPLE_ARXIV)
+            self.assertEqual(index.text.search_all('intro'), ['008'])
+            self.assertEqual(index.duplicates.find_duplicates(
+                dict(EXAMPLE_ARXIV['008'], identifier='009')), ['008'])
+
+        split = EXAMPLE_FILE.index('067')
+        delta = EXAMPLE_FILE[:split].replace('2021-09-02', '2021-02-30')
+        with self.assertRaises(ValueError):
+            index.ingest(StringIO(delta))
+        self.assert_consistent(index, EXAMPLE_ARXIV)
+
+    def test_found_duplicates(self):
+        """Test that the near duplicates found while adding and ingesting
+        articles are returned and recorded until the articles are
+        removed."""
+
+        index = ArxivIndex(EXAMPLE_ARXIV, near_duplicates=True)
+        self.assertEqual(index.found_duplicates, {})
+        self.assertEqual(index.add_article(
+            dict(EXAMPLE_ARXIV['008'], identifier='009')), ['008'])
+        self.assertEqual(ArxivIndex(EXAMPLE_ARXIV).add_article(
+            dict(EXAMPLE_ARXIV['008'], identifier='009')), [])
+
+        split = EXAMPLE_FILE.index('067')
+        delta = EXAMPLE_FILE[split:].replace('827\n', '828\n')
+        self.assertEqual(index.ingest(StringIO(delta)),
+                         ['067', '828', '042'])
+        self.assertEqual(index.found_duplicates,
+                         {'009': ['008'], '828': ['827']})
+        index.remove_article('009')
+        self.assertEqual(index.found_duplicates, {'828': ['827']})
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
@@ -0,0 +1,119 @@
+"""CSCA08 Assignment 3: arxiv.org
+
+Tests that SearchIndex answers keyword queries like a scan of every
+article does, as articles are added, replaced and removed.
+
+"""
+
+import random
+import unittest
+from arxiv_search import SearchIndex, tokenize, COMPACT_FRACTION
+
+WORDS = ['best', 'course', 'calculus', 'proof', 'university', 'toronto',
+         'discrete', 'graph', 'evidence', 'science']
+
+
+def random_article(rng: random.Random, article_id: str) -> dict:
+    """Return an article with ID article_id and a random title and abstract
+    made of WORDS, chosen using rng.
+
+    """
+
+    return {'identifier': article_id,
+            'title': ' '.join(rng.choices(WORDS, k=rng.randint(0, 3))),
+            'abstract': ' '.join(rng.choices(WORDS, k=rng.randint(0, 12)))
+            or None}
+
+
+def scan(articles: dict, query: str, match_all: bool) -> list[str]:
+    """Return the sorted IDs of the articles in articles that contain all
+    (if match_all) or any of the terms of query.
+
+    """
+
+    terms = set(tokenize(query))
+    found = []
+    for article_id, article in articles.items():
+        words = set(tokenize(article['title'])
+                    + tokenize(article['abstract']))
+        if terms and (terms <= words if match_all else terms & words):
+            found.append(article_id)
+    return sorted(found)
+
+
+class TestSearchIndex(unittest.TestCase):
+    """Test the class SearchIndex."""
+
+    def assert_consistent(self, index: SearchIndex, articles: dict) -> None:
+        """Assert that index answers queries over articles like scan does.
+
+        """
+
+        self.assertEqual(len(index), len(articles))
+        for query in ['best', 'best course', 'graph proof toronto', 'none',
+                      'science none']:
+            self.assertEqual(index.search_all(query),
+                             scan(articles, query, True), query)
+            self.assertEqual(index.search_any(query),
+                             scan(articles, query, False), query)
+            results = index.search(query, 5)
+            self.assertEqual(len(results),
+                             min(5, len(scan(articles, query, False))))
+            scores = [score for article_id, score in results]
+            self.assertEqual(scores, sorted(scores, reverse=True), query)
+
+    def test_random_changes(self):
+        """Test SearchIndex after random additions, replacements and
+        removals, before and after compaction.
+
+        """
+
+        rng = random.Random(38)
+        index = SearchIndex()
+        articles = {}
+        for step in range(300):
+            article_id = '{:03}'.format(rng.randrange(60))
+            if article_id in articles and rng.random() < 0.3:
+                index.remove_article(article_id)
+                del articles[article_id]
+            else:
+                article = random_article(rng, article_id)
+                index.add_article(article)
+                articles[article_id] = article
+            if step % 50 == 0:
+                self.assert_consistent(index, articles)
+        self.assert_consistent(index, articles)
+        index.compact()
+        self.assert_consistent(index, articles)
+
+
+    def test_automatic_compaction(self):
+        """Test that removing and replacing articles compacts the index
+        before more than COMPACT_FRACTION of its document numbers are
+        deleted.
+
+        """
+
+        rng = random.Random(0)
+        index = SearchIndex()
+        articles = {}
+        for number in range(40):
+            article = random_article(rng, str(number))
+            index.add_article(article)
+            articles[article['identifier']] = article
+        for step in range(200):
+            article_id = str(rng.randrange(40))
+            if article_id in articles and rng.random() < 0.5:
+                index.remove_article(article_id)
+                del articles[article_id]
+            else:
+                article = random_article(rng, article_id)
+                index.add_article(article)
+                articles[article_id] = article
+            self.assertLessEqual(len(index._deleted),
+                                 COMPACT_FRACTION * len(index._doc_ids))
+        self.assertLessEqual(len(index._doc_ids), 2 * 40 + 1)
+        self.assert_consistent(index, articles)
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
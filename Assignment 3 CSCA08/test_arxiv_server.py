@@ -0,0 +1,146 @@
+"""CSCA08 Assignment 3: arxiv.org
+
+Tests for the query server in arxiv_server, over localhost.
+
+"""
+
+import asyncio
+import json
+import threading
+import unittest
+from arxiv_functions import (EXAMPLE_ARXIV, get_coauthors,
+                             suggest_collaborators)
+from arxiv_index import ArxivIndex
+from arxiv_server import ArxivServer, start_server
+
+
+class TestArxivServer(unittest.IsolatedAsyncioTestCase):
+    """Test answering queries sent to a server on localhost."""
+
+    async def asyncSetUp(self):
+        """Start a server over the example data on a free port."""
+
+        self.server = ArxivServer(ArxivIndex(EXAMPLE_ARXIV, full_text=True))
+        self.http_server = await start_server(self.server, '127.0.0.1', 0)
+        self.port = self.http_server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        """Stop the server."""
+
+        self.http_server.close()
+        await self.http_server.wait_closed()
+
+    async def request(self, target: str, body: bytes = None,
+                      requests: int = 1) -> list[tuple[int, object]]:
+        """Return the statuses and JSON answers of requests requests for
+        target, sent on one connection, POSTing body if it is not None.
+
+        """
+
+        reader, writer = await asyncio.open_connection('127.0.0.1',
+                                                       self.port)
+        method = 'GET' if body is None else 'POST'
+        body = body or b''
+        request = '{} {} HTTP/1.1\r\nHost: localhost\r\n' \
+            'Content-Length: {}\r\n\r\n'.format(method, target, len(body))
+        answers = []
+        for _ in range(requests):
+            writer.write(request.encode('latin-1') + body)
+            status = int((await reader.readline()).split()[1])
+            headers = {}
+            while (line := await reader.readline()).strip():
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.lower()] = value.strip()
+            answer = await reader.readexactly(
+                int(headers['content-length']))
+            answers.append((status, json.loads(answer)))
+        writer.close()
+        await writer.wait_closed()
+        return answers
+
+    async def test_author_queries(self):
+        """Test that author queries agree with arxiv_functions, including
+        on a kept-alive connection.
+
+        """
+
+        for name in [('Pancer', 'Richard'), ('Tafliovich', 'Anya Y.'),
+                     ('Breuss', 'Nataliya'), ('Doe', 'Jane')]:
+            target = '/coauthors?last={}&first={}'.format(
+                name[0], name[1].replace(' ', '+'))
+            expected = [list(author)
+                        for author in get_coauthors(EXAMPLE_ARXIV, name)]
+            self.assertEqual(await self.request(target, requests=2),
+                             [(200, expected)] * 2)
+            target = target.replace('coauthors', 'suggest')
+            expected = [list(author) for author
+                        in suggest_collaborators(EXAMPLE_ARXIV, name)]
+            self.assertEqual(await self.request(target), [(200, expected)])
+
+    async def test_concurrent_queries(self):
+        """Test that queries sent at the same time on several connections
+        are all answered.
+
+        """
+
+        answers = await asyncio.gather(
+            self.request('/most_published'),
+            self.request('/search?q=calculus&k=1'),
+            self.request('/coauthors?last=Pancer&first=Richard'))
+        self.assertEqual(answers[0][0][1][0], ['Bretscher', 'Anna'])
+        self.assertEqual(answers[1][0][1][0][0], '031')
+        self.assertEqual(answers[2], [(200, [['Bretscher', 'Anna']])])
+
+    async def test_slow_query(self):
+        """Test that a cached answer is sent while a slow query that is
+        not cached is still being answered.
+
+        """
+
+        target = '/coauthors?last=Pancer&first=Richard'
+        await self.request(target)
+        started = threading.Event()
+        finish = threading.Event()
+        get_most_published = self.server._queries['most_published']
+
+        def slow_query(params: dict) -> list:
+            """Answer most_published once finish is set."""
+            started.set()
+            finish.wait(5)
+            return get_most_published(params)
+
+        self.server._queries['most_published'] = slow_query
+        slow = asyncio.ensure_future(self.request('/most_published'))
+        self.assertTrue(await asyncio.to_thread(started.wait, 5))
+        self.assertEqual(await self.request(target),
+                         [(200, [['Bretscher', 'Anna']])])
+        self.assertFalse(slow.done())
+        finish.set()
+        self.assertEqual((await slow)[0][1][0], ['Bretscher', 'Anna'])
+
+    async def test_batch(self):
+        """Test that a batch of queries is answered in order."""
+
+        queries = [{'query': 'coauthors', 'last': 'Pancer',
+                    'first': 'Richard'},
+                   {'query': 'nonexistent'},
+                   {'query': 'most_published'}]
+        [(status, answers)] = await self.request(
+            '/batch', json.dumps(queries).encode('utf-8'))
+        self.assertEqual(status, 200)
+        self.assertEqual(answers[0], {'result': [['Bretscher', 'Anna']]})
+        self.assertIn('error', answers[1])
+        self.assertEqual(len(answers[2]['result']), 3)
+
+    async def test_errors(self):
+        """Test the statuses of queries that cannot be answered."""
+
+        self.assertEqual((await self.request('/nonexistent'))[0][0], 404)
+        self.assertEqual((await self.request('/coauthors'))[0][0], 400)
+        self.assertEqual((await self.request('/search?q=a&k=x'))[0][0], 400)
+        self.assertEqual((await self.request('/batch', b'{'))[0][0], 400)
+        self.assertEqual((await self.request('/batch'))[0][0], 405)
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
@@ -0,0 +1,68 @@
+"""CSCA08 Assignment 3: arxiv.org
+
+Tests for the grouping of author name variants in author_names.
+
+"""
+
+import unittest
+from arxiv_functions import make_author_to_articles
+from author_names import make_canonical_names
+
+
+def make_articles(*author_lists: list) -> dict:
+    """Return arxiv data with one article per list of authors in
+    author_lists, numbered from 0.
+
+    """
+
+    return {str(number): {'identifier': str(number), 'authors': authors}
+            for number, authors in enumerate(author_lists)}
+
+
+class TestMakeCanonicalNames(unittest.TestCase):
+    """Test the function make_canonical_names."""
+
+    def test_variants_grouped(self):
+        """Test that initials, accents and punctuation variants of one name
+        are grouped under the most informative one."""
+
+        articles = make_articles([('Erdős', 'Paul')], [('Erdos', 'P.')],
+                                 [('erdos', 'paul')])
+        expected = ('Erdős', 'Paul')
+        actual = make_canonical_names(articles)
+        self.assertEqual(set(actual.values()), {expected})
+
+    def test_ambiguous_initial(self):
+        """Test that an initial matching two different first names is not
+        grouped with either."""
+
+        articles = make_articles([('Smith', 'John')], [('Smith', 'Jane')],
+                                 [('Smith', 'J.')])
+        actual = make_canonical_names(articles)
+        self.assertEqual(actual[('Smith', 'J.')], ('Smith', 'J.'))
+        self.assertEqual(actual[('Smith', 'John')], ('Smith', 'John'))
+        self.assertEqual(actual[('Smith', 'Jane')], ('Smith', 'Jane'))
+
+    def test_different_names_kept(self):
+        """Test that different last names, or different first names with
+        the same initial, are not grouped."""
+
+        articles = make_articles([('Ponce', 'Marcelo'), ('Ponce', 'Maria')],
+                                 [('Pounce', 'Marcelo')])
+        actual = make_canonical_names(articles)
+        self.assertEqual(actual, {author: author for author in actual})
+
+    def test_make_author_to_articles(self):
+        """Test make_author_to_articles with canonical names, including an
+        article that lists two variants of one name."""
+
+        articles = make_articles([('Tafliovich', 'Anya Y.')],
+                                 [('Tafliovich', 'Anya'), ('Tafliovich', 'A')])
+        expected = {('Tafliovich', 'Anya Y.'): ['0', '1']}
+        actual = make_author_to_articles(articles,
+                                         make_canonical_names(articles))
+        self.assertEqual(actual, expected)
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
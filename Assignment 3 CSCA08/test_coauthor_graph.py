@@ -0,0 +1,105 @@
+"""CSCA08 Assignment 3: arxiv.org
+
+Tests that CoauthorGraph.recommend_collaborators ranks suggested
+collaborators like a direct computation of the scores does.
+
+"""
+
+from math import log
+import random
+import unittest
+from coauthor_graph import CoauthorGraph, COMMON, ADAMIC_ADAR, JACCARD
+
+AUTHORS = [('Author' + str(number), 'First' + str(number % 7))
+           for number in range(40)]
+
+
+def random_articles(rng: random.Random, count: int) -> dict:
+    """Return count articles with random authors from AUTHORS, chosen using
+    rng, with the first authors in AUTHORS writing the most articles.
+
+    """
+
+    articles = {}
+    for number in range(count):
+        authors = {AUTHORS[min(int(rng.expovariate(0.1)), len(AUTHORS) - 1)]
+                   for _ in range(rng.randint(1, 5))}
+        articles[str(number)] = {'identifier': str(number),
+                                 'authors': sorted(authors)}
+    return articles
+
+
+def recommend(articles: dict, author: tuple, k: int,
+              weighting: str) -> list:
+    """Return the k best suggested collaborators of author in articles with
+    their scores under weighting, computed from the definitions.
+
+    """
+
+    coauthors = {}
+    for article in articles.values():
+        for name in article['authors']:
+            coauthors.setdefault(name, set()).update(article['authors'])
+    for name, names in coauthors.items():
+        names.discard(name)
+    mine = coauthors.get(author, set())
+    scores = []
+    for other, theirs in coauthors.items():
+        common = mine & theirs
+        if other == author or other in mine or not common:
+            continue
+        if weighting == COMMON:
+            score = len(common)
+        elif weighting == ADAMIC_ADAR:
+            score = sum(1 / log(len(coauthors[name])) for name in common
+                        if len(coauthors[name]) > 1)
+        else:
+            score = len(common) / len(mine | theirs)
+        scores.append((other, score))
+    scores.sort(key=lambda score: (-score[1], score[0]))
+    return scores[:k]
+
+
+class TestCoauthorGraph(unittest.TestCase):
+    """Test the ranking of suggested collaborators."""
+
+    def test_recommend_collaborators(self):
+        """Test recommend_collaborators on random articles, with many tied
+        scores, for every weighting and several k.
+
+        """
+
+        rng = random.Random(35)
+        for _ in range(5):
+            articles = random_articles(rng, 60)
+            graph = CoauthorGraph(articles)
+            for author in AUTHORS:
+                for k in [1, 3, 10, 50]:
+                    for weighting in [COMMON, JACCARD]:
+                        self.assertEqual(
+                            graph.recommend_collaborators(author, k,
+                                                          weighting),
+                            recommend(articles, author, k, weighting))
+                    # Sums of the same weights in another order can
+                    # differ in the last bit, which can reorder ties.
+                    expected = recommend(articles, author, k, ADAMIC_ADAR)
+                    scores = dict(recommend(articles, author, len(AUTHORS),
+                                            ADAMIC_ADAR))
+                    actual = graph.recommend_collaborators(author, k,
+                                                           ADAMIC_ADAR)
+                    self.assertEqual(len(actual), len(expected))
+                    for (name, score), (_, expected_score) in zip(
+                            actual, expected):
+                        self.assertAlmostEqual(score, expected_score)
+                        self.assertAlmostEqual(score, scores[name])
+
+    def test_unknown_weighting(self):
+        """Test that an unknown weighting is rejected."""
+
+        graph = CoauthorGraph(random_articles(random.Random(0), 10))
+        with self.assertRaises(ValueError):
+            graph.recommend_collaborators(AUTHORS[0], 5, 'cosine')
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
@@ -0,0 +1,79 @@
+"""CSCA08 Assignment 3: arxiv.org
+
+Tests that CollaborationGraph agrees with a direct search of the coauthor
+relationships on random articles.
+
+"""
+
+import random
+import unittest
+from arxiv_functions import make_author_to_articles, get_coauthors
+from collab_analytics import CollaborationGraph
+
+
+def random_articles(rng: random.Random, count: int, authors: int) -> dict:
+    """Return count articles with 1 to 3 authors each out of authors
+    authors, chosen using rng.
+
+    """
+
+    names = [('Author', str(number)) for number in range(authors)]
+    return {str(number): {'identifier': str(number),
+                          'authors': sorted(rng.sample(names,
+                                                       rng.randint(1, 3)))}
+            for number in range(count)}
+
+
+def reachable(articles: dict, author: tuple) -> dict:
+    """Return a dict that maps each author reachable from author in
+    articles to their distance from author.
+
+    """
+
+    distances = {author: 0}
+    frontier = [author]
+    while frontier:
+        next_frontier = []
+        for name in frontier:
+            for coauthor in get_coauthors(articles, name):
+                if coauthor not in distances:
+                    distances[coauthor] = distances[name] + 1
+                    next_frontier.append(coauthor)
+        frontier = next_frontier
+    return distances
+
+
+class TestCollaborationGraph(unittest.TestCase):
+    """Test the class CollaborationGraph."""
+
+    def test_random_graphs(self):
+        """Test coauthors, components, distances, paths and communities on
+        random articles."""
+
+        rng = random.Random(43)
+        for _ in range(5):
+            articles = random_articles(rng, 40, 60)
+            graph = CollaborationGraph(make_author_to_articles(articles))
+            components = graph.get_components()
+            self.assertEqual(sorted(name for component in components
+                                    for name in component), graph.names)
+            for component in components:
+                distances = reachable(articles, component[0])
+                self.assertEqual(sorted(distances), component)
+                self.assertEqual(graph.get_distances(component[0]),
+                                 distances)
+                for name, distance in distances.items():
+                    path = graph.get_path(component[0], name)
+                    self.assertEqual(len(path), distance + 1)
+                    for first, second in zip(path, path[1:]):
+                        self.assertIn(second, graph.get_coauthors(first))
+
+            for community in graph.get_communities():
+                self.assertTrue(any(set(community) <= set(component)
+                                    for component in components))
+            self.assertEqual(sum(graph.get_degree_distribution().values()),
+                             len(graph))
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
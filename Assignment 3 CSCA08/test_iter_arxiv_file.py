@@ -0,0 +1,123 @@
+"""CSCA08 Assignment 3: arxiv.org
+
+Tests for the streaming parser iter_arxiv_file.
+
+"""
+
+from io import StringIO
+import unittest
+from arxiv_functions import iter_arxiv_file, read_arxiv_file, EXAMPLE_ARXIV
+
+
+EXAMPLE_FILE = '''008
+Intro to CS is the best course ever
+2021-09-01
+
+Ponce,Marcelo
+Tafliovich,Anya Y.
+
+We present clear evidence that Introduction to
+Computer Science is the best course.
+END
+031
+Calculus is the best course ever
+
+2021-09-02
+Breuss,Nataliya
+
+We discuss the reasons why Calculus I
+is the best course.
+END
+067
+Discrete Mathematics is the best course ever
+2021-09-02
+2021-10-01
+Pancer,Richard
+Bretscher,Anna
+
+We explain why Discrete Mathematics is the best course of all times.
+END
+827
+University of Toronto is the best university
+2021-08-20
+2021-10-02
+Ponce,Marcelo
+Tafliovich,Anya Y.
+Bretscher,Anna
+
+We show a formal proof that the University of
+Toronto is the best university.
+END
+042
+
+2021-05-04
+2021-05-05
+
+This is a very strange article with no title
+and no authors.
+END
+'''
+
+
+class TestIterArxivFile(unittest.TestCase):
+    """Test the function iter_arxiv_file."""
+
+    def test_handout_example(self):
+        """Test iter_arxiv_file with the handout example."""
+
+        expected = EXAMPLE_ARXIV
+        actual = {article['identifier']: article
+                  for article in iter_arxiv_file(StringIO(EXAMPLE_FILE))}
+        self.assertEqual(actual, expected, message(EXAMPLE_FILE, expected,
+                                                   actual))
+
+    def test_read_arxiv_file(self):
+        """Test that read_arxiv_file gives the same dict as iter_arxiv_file."""
+
+        expected = EXAMPLE_ARXIV
+        actual = read_arxiv_file(StringIO(EXAMPLE_FILE))
+        self.assertEqual(actual, expected, message(EXAMPLE_FILE, expected,
+                                                   actual))
+
+    def test_empty_file(self):
+        """Test iter_arxiv_file with an empty file."""
+
+        expected = []
+        actual = list(iter_arxiv_file(StringIO('')))
+        self.assertEqual(actual, expected, message('', expected, actual))
+
+    def test_missing_final_end(self):
+        """Test iter_arxiv_file with a last article not followed by END."""
+
+        text = EXAMPLE_FILE[:EXAMPLE_FILE.rindex('END')]
+        expected = ['008', '031', '067', '827', '042']
+        actual = [article['identifier']
+                  for article in iter_arxiv_file(StringIO(text))]
+        self.assertEqual(actual, expected, message(text, expected, actual))
+
+    def test_articles_yielded_at_end(self):
+        """Test that each article is yielded as soon as its END is read."""
+
+        lines = iter(StringIO(EXAMPLE_FILE))
+        articles = iter_arxiv_file(lines)
+        next(articles)
+        expected = '031\n'
+        actual = next(lines)
+        self.assertEqual(actual, expected, message(EXAMPLE_FILE, expected,
+                                                   actual))
+
+
+def message(test_case: str, expected: object, actual: object) -> str:
+    """Return an error message saying that parsing the file contents
+    test_case resulted in the value actual, when the correct value is
+    expected.
+
+    """
+
+    return ('When we parsed ' + repr(test_case)
+            + ' we expected ' + str(expected)
+            + ', but got ' + str(actual))
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
@@ -0,0 +1,74 @@
+"""CSCA08 Assignment 3: arxiv.org
+
+Tests for the detection of near-duplicate articles in near_duplicates.
+
+"""
+
+import random
+import unittest
+from near_duplicates import NearDuplicateIndex, find_near_duplicates
+
+WORDS = ['w' + str(number) for number in range(2000)]
+
+
+def random_article(rng: random.Random, article_id: str) -> dict:
+    """Return an article with ID article_id and a random title and abstract
+    chosen using rng.
+
+    """
+
+    return {'identifier': article_id,
+            'title': ' '.join(rng.choices(WORDS, k=8)),
+            'abstract': ' '.join(rng.choices(WORDS, k=100))}
+
+
+def edit(rng: random.Random, article: dict, article_id: str) -> dict:
+    """Return a copy of article with ID article_id and two words of its
+    abstract replaced, using rng.
+
+    """
+
+    words = article['abstract'].split()
+    for _ in range(2):
+        words[rng.randrange(len(words))] = rng.choice(WORDS)
+    return dict(article, identifier=article_id, abstract=' '.join(words))
+
+
+class TestNearDuplicates(unittest.TestCase):
+    """Test NearDuplicateIndex and find_near_duplicates."""
+
+    def test_clusters(self):
+        """Test that edited copies are clustered with their original and
+        unrelated articles are not clustered."""
+
+        rng = random.Random(45)
+        articles = {}
+        expected = []
+        for number in range(200):
+            article = random_article(rng, 'a{:03}'.format(number))
+            articles[article['identifier']] = article
+            if number % 20 == 0:
+                copy = edit(rng, article, 'b{:03}'.format(number))
+                articles[copy['identifier']] = copy
+                expected.append([article['identifier'], copy['identifier']])
+        self.assertEqual(find_near_duplicates(articles), expected)
+
+    def test_ingestion(self):
+        """Test that adding an article reports its near duplicates, and that
+        replacing and removing articles updates the buckets."""
+
+        rng = random.Random(0)
+        index = NearDuplicateIndex()
+        original = random_article(rng, '1')
+        self.assertEqual(index.add_article(original), [])
+        self.assertEqual(index.add_article(edit(rng, original, '2')), ['1'])
+        self.assertEqual(index.add_article(random_article(rng, '2')), [])
+        self.assertEqual(index.get_clusters(), [])
+        index.remove_article('1')
+        self.assertEqual(index.find_duplicates(dict(original,
+                                                    identifier='3')), [])
+        self.assertEqual(len(index), 1)
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
@@ -0,0 +1,152 @@
+"""CSCA08 Assignment 3: arxiv.org
+
+Tests for the query result cache in query_cache.
+
+"""
+
+import copy
+import random
+import unittest
+from arxiv_functions import (EXAMPLE_ARXIV, get_coauthors,
+                             suggest_collaborators, keep_prolific_authors,
+                             make_author_to_articles, upsert_arxiv_file)
+from arxiv_index import ArxivIndex
+import query_cache
+from query_cache import QueryCache, get_change_count, mark_changed
+from test_arxiv_index import AUTHORS, random_article
+
+
+class TestQueryCache(unittest.TestCase):
+    """Test that cached query results are reused and invalidated."""
+
+    def test_arxiv_data(self):
+        """Test that cached results about arxiv data are the same as the
+        results of the queries, as articles are removed.
+
+        """
+
+        cache = QueryCache()
+        cached_get_coauthors = cache.wrap(get_coauthors)
+        cached_suggest_collaborators = cache.wrap(suggest_collaborators)
+        cached_keep_prolific_authors = cache.wrap(keep_prolific_authors,
+                                                  True)
+        id_to_article = copy.deepcopy(EXAMPLE_ARXIV)
+        for min_publications in [1, 2, 3]:
+            for _ in range(2):
+                for author in AUTHORS:
+                    self.assertEqual(
+                        cached_get_coauthors(id_to_article, author),
+                        get_coauthors(id_to_article, author))
+                    self.assertEqual(
+                        cached_suggest_collaborators(id_to_article, author),
+                        suggest_collaborators(id_to_article, author))
+            cached_keep_prolific_authors(id_to_article, min_publications)
+        self.assertGreater(cache.hits, 0)
+
+    def test_replacement(self):
+        """Test that replacing an article with upsert_arxiv_file, wrapped
+        or followed by mark_changed, invalidates cached results about the
+        arxiv data even though the number of articles stays the same.
+
+        """
+
+        cache = QueryCache()
+        id_to_article = copy.deepcopy(EXAMPLE_ARXIV)
+        by_author = make_author_to_articles(id_to_article)
+        pancer = ('Pancer', 'Richard')
+        self.assertEqual(cache.call(get_coauthors, id_to_article, pancer),
+                         [('Bretscher', 'Anna')])
+        upsert_arxiv_file(id_to_article, by_author,
+                          ['067\n', 'Replaced\n', '\n', '\n',
+                           'Pancer,Richard\n', 'Smith,Jo\n', 'END\n'])
+        mark_changed(id_to_article)
+        self.assertEqual(len(id_to_article), len(EXAMPLE_ARXIV))
+        self.assertEqual(cache.call(get_coauthors, id_to_article, pancer),
+                         [('Smith', 'Jo')])
+        cache.wrap(upsert_arxiv_file, True)(
+            id_to_article, by_author,
+            ['067\n', 'Again\n', '\n', '\n', 'Pancer,Richard\n',
+             'Chen,Li\n', 'END\n'])
+        self.assertEqual(cache.call(get_coauthors, id_to_article, pancer),
+                         [('Chen', 'Li')])
+        keep_prolific_authors(id_to_article, 2)
+        self.assertEqual(cache.call(get_coauthors, id_to_article, pancer),
+                         [])
+
+    def test_deletion(self):
+        """Test that deleting an article from arxiv data with del, without
+        telling the cache, invalidates cached results about it.
+
+        """
+
+        cache = QueryCache()
+        id_to_article = copy.deepcopy(EXAMPLE_ARXIV)
+        pancer = ('Pancer', 'Richard')
+        self.assertEqual(cache.call(get_coauthors, id_to_article, pancer),
+                         [('Bretscher', 'Anna')])
+        del id_to_article['067']
+        self.assertEqual(cache.call(get_coauthors, id_to_article, pancer),
+                         [])
+
+    def test_change_counts(self):
+        """Test that change counts are kept only while results about the
+        arxiv data are cached.
+
+        """
+
+        cache = QueryCache(max_entries=1)
+        id_to_article = copy.deepcopy(EXAMPLE_ARXIV)
+        mark_changed(id_to_article)
+        self.assertEqual(get_change_count(id_to_article), 0)
+        cache.call(get_coauthors, id_to_article, ('Pancer', 'Richard'))
+        mark_changed(id_to_article)
+        self.assertEqual(get_change_count(id_to_article), 1)
+        cache.call(get_coauthors, EXAMPLE_ARXIV, ('Pancer', 'Richard'))
+        self.assertEqual(get_change_count(id_to_article), 0)
+        del cache
+        self.assertEqual(get_change_count(EXAMPLE_ARXIV), 0)
+        self.assertNotIn(id(EXAMPLE_ARXIV), query_cache._corpora)
+
+    def test_arxiv_index(self):
+        """Test that cached results about an ArxivIndex change when
+        articles are added to and removed from the index.
+
+        """
+
+        rng = random.Random(0)
+        cache = QueryCache()
+        index = ArxivIndex()
+        for _ in range(200):
+            if index.articles and rng.random() < 0.3:
+                index.remove_article(rng.choice(sorted(index.articles)))
+            else:
+                index.add_article(random_article(rng,
+                                                 str(rng.randrange(50))))
+            author = rng.choice(AUTHORS)
+            self.assertEqual(
+                cache.call(ArxivIndex.get_coauthors, index, author),
+                get_coauthors(index.articles, author))
+
+    def test_limits(self):
+        """Test that the least recently used results are evicted to keep
+        within the limits.
+
+        """
+
+        cache = QueryCache(max_entries=3, max_size=10)
+        for number in range(5):
+            cache.store(len, EXAMPLE_ARXIV, (number,), [number] * 3)
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(cache.size, 9)
+        self.assertIsNone(cache.lookup(len, EXAMPLE_ARXIV, (1,)))
+        self.assertEqual(cache.lookup(len, EXAMPLE_ARXIV, (2,)), [2] * 3)
+        cache.store(len, EXAMPLE_ARXIV, (5,), [5] * 4)
+        self.assertEqual(cache.size, 10)
+        self.assertIsNone(cache.lookup(len, EXAMPLE_ARXIV, (3,)))
+        self.assertEqual(cache.lookup(len, EXAMPLE_ARXIV, (2,)), [2] * 3)
+        cache.store(len, EXAMPLE_ARXIV, (6,), [6] * 11)
+        self.assertIsNone(cache.lookup(len, EXAMPLE_ARXIV, (6,)))
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
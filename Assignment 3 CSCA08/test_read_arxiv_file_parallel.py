@@ -0,0 +1,95 @@
+"""CSCA08 Assignment 3: arxiv.org
+
+Tests that read_arxiv_file_parallel reads a file split into shards like
+read_arxiv_file and make_author_to_articles do.
+
+"""
+
+from io import StringIO
+import os
+import random
+import tempfile
+import unittest
+import arxiv_functions
+from arxiv_functions import (read_arxiv_file, make_author_to_articles,
+                             read_arxiv_file_parallel, find_shard_boundaries)
+from test_iter_arxiv_file import EXAMPLE_FILE
+
+AUTHORS = ['Ponce,Marcelo', 'Tafliovich,Anya Y.', 'Bretscher,Anna',
+           'Breuss,Nataliya', 'Pancer,Richard', 'Smith,Jo', 'Chen,Li']
+
+
+def random_article_text(rng: random.Random, article_id: str) -> str:
+    """Return the text of an article with ID article_id and random authors
+    from AUTHORS, chosen using rng.
+
+    """
+
+    lines = [article_id, 'Article ' + article_id, '2021-09-01', '']
+    lines.extend(rng.sample(AUTHORS, rng.randint(0, 4)))
+    lines.extend(['', 'An abstract.', 'END'])
+    return '\n'.join(lines) + '\n'
+
+
+class TestReadArxivFileParallel(unittest.TestCase):
+    """Test reading an arxiv file in parallel shards."""
+
+    def setUp(self):
+        """Write a file of random articles, in which the first article of
+        EXAMPLE_FILE appears again, with other authors, near the end, and
+        make files this small worth splitting.
+
+        """
+
+        rng = random.Random(32)
+        texts = [EXAMPLE_FILE]
+        texts.extend(random_article_text(rng, str(number))
+                     for number in range(100, 300))
+        texts.append(random_article_text(rng, '008'))
+        texts.extend(random_article_text(rng, str(number))
+                     for number in range(300, 320))
+        self.text = ''.join(texts)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.filename = os.path.join(directory.name, 'arxiv.txt')
+        with open(self.filename, 'w', encoding='utf-8') as afile:
+            afile.write(self.text)
+
+        min_shard_size = arxiv_functions.MIN_SHARD_SIZE
+        arxiv_functions.MIN_SHARD_SIZE = 64
+        self.addCleanup(setattr, arxiv_functions, 'MIN_SHARD_SIZE',
+                        min_shard_size)
+
+    def test_shard_boundaries(self):
+        """Test that every shard is made of whole articles."""
+
+        size = os.path.getsize(self.filename)
+        with open(self.filename, 'rb') as afile:
+            data = afile.read()
+        for shards in [1, 2, 3, 7, 50]:
+            boundaries = find_shard_boundaries(self.filename, shards)
+            self.assertEqual(boundaries[0], 0)
+            self.assertEqual(boundaries[-1], size)
+            self.assertEqual(boundaries, sorted(set(boundaries)))
+            self.assertLessEqual(len(boundaries), shards + 1)
+            for boundary in boundaries[1:-1]:
+                self.assertTrue(data[:boundary].endswith(b'\nEND\n'))
+
+    def test_same_as_sequential(self):
+        """Test that reading in parallel with several numbers of processes
+        gives the same articles and author map as reading sequentially,
+        including the later copy of the repeated article.
+
+        """
+
+        expected = read_arxiv_file(StringIO(self.text))
+        self.assertEqual(expected['008']['title'], 'Article 008')
+        for processes in [1, 2, 3, 4]:
+            id_to_article, by_author = read_arxiv_file_parallel(
+                self.filename, processes)
+            self.assertEqual(id_to_article, expected)
+            self.assertEqual(by_author, make_author_to_articles(expected))
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
@@ -0,0 +1,121 @@
+"""Helpers shared by the benchmark harnesses of the assignments, such as
+bridge_benchmark and arxiv_benchmark: timing a call, and writing a JSON
+report of the results and comparing them against an earlier baseline.
+
+The assignment directories are not packages, so the main function of a
+harness adds the directory of this module to the module search path
+before importing it.
+"""
+import argparse
+import json
+import time
+from typing import Callable
+
+DEFAULT_TOLERANCE = 0.2
+DEFAULT_REPEAT = 5
+
+
+def time_call(function: Callable, *args: object) -> tuple[float, object]:
+    """Return the number of seconds taken by function(*args), and its result.
+
+    >>> seconds, result = time_call(sorted, [3, 1, 2])
+    >>> result
+    [1, 2, 3]
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def time_repeated(function: Callable, make_args: Callable,
+                  repeat: int = DEFAULT_REPEAT) -> tuple[float, object]:
+    """Return the smallest number of seconds taken by function(*make_args())
+    over repeat calls, each with a fresh tuple of arguments from make_args,
+    and the result of the last call. As with timeit.repeat, the smallest
+    time is the one least disturbed by other work on the machine, so it is
+    the one compared against a baseline.
+
+    >>> seconds, result = time_repeated(sorted, lambda: ([3, 1, 2],), 3)
+    >>> result
+    [1, 2, 3]
+    """
+    best = None
+    for _ in range(max(repeat, 1)):
+        seconds, result = time_call(function, *make_args())
+        if best is None or seconds < best:
+            best = seconds
+    return best, result
+
+
+def compare_results(results: list[dict], baseline: list[dict],
+                    tolerance: float) -> list[str]:
+    """Return a report line for each case in results that is also in
+    baseline, marking the cases that are more than tolerance (a fraction)
+    slower than in baseline.
+
+    >>> compare_results([{'case': 'a', 'size': 10, 'seconds': 2.0}],
+    ...                 [{'case': 'a', 'size': 10, 'seconds': 1.0}], 0.2)
+    ['a @ 10: 1.0000s -> 2.0000s (x2.00) REGRESSION']
+    >>> compare_results([{'case': 'a', 'size': 10, 'seconds': 1.0}],
+    ...                 [{'case': 'b', 'size': 10, 'seconds': 1.0}], 0.2)
+    []
+    """
+    previous = {(result['case'], result['size']): result['seconds']
+                for result in baseline}
+    lines = []
+    for result in results:
+        key = (result['case'], result['size'])
+        if key in previous and previous[key] > 0:
+            ratio = result['seconds'] / previous[key]
+            line = '{} @ {}: {:.4f}s -> {:.4f}s (x{:.2f})'.format(
+                result['case'], result['size'], previous[key],
+                result['seconds'], ratio)
+            if ratio > 1 + tolerance:
+                line += ' REGRESSION'
+            lines.append(line)
+    return lines
+
+
+def add_report_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add to parser the --output, --baseline and --tolerance arguments
+    used by finish_report, and the --repeat argument for time_repeated.
+
+    >>> parser = argparse.ArgumentParser()
+    >>> add_report_arguments(parser)
+    >>> parser.parse_args(['--tolerance', '0.5']).tolerance
+    0.5
+    """
+    parser.add_argument('--output', help='write the JSON results here')
+    parser.add_argument('--baseline', help='JSON results to compare against')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help='time each case this many times, keeping the '
+                        'fastest')
+
+
+def finish_report(report: dict, args: argparse.Namespace) -> int:
+    """Write report, whose 'results' are the benchmark results, as JSON to
+    args.output if given, print the comparison of the results against
+    those in the JSON file args.baseline if given, and return the exit
+    status: 1 if a case is more than args.tolerance slower than in the
+    baseline, 0 otherwise.
+
+    Docstring examples not given since the function reads from a file.
+    """
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(report, output_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)['results']
+        lines = compare_results(report['results'], baseline, args.tolerance)
+        print('\n'.join(lines))
+        if any(line.endswith('REGRESSION') for line in lines):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
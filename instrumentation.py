@@ -0,0 +1,358 @@
+"""Opt-in instrumentation of the functions in the assignment modules, such
+as tickets, bridge_functions and arxiv_functions.
+
+instrument_module replaces the functions defined in a module with
+wrappers that, while instrumentation is enabled, record for each function
+its number of calls, cumulative time, latency percentiles and the size of
+its first argument. Calls made inside the module go through the wrappers
+too. Modules that imported a function by name before it was instrumented
+keep calling the original, so modules should be instrumented before the
+code that uses them is imported. For generator functions, such as
+iter_arxiv_file, only the creation of the generator is timed.
+
+When instrumentation is disabled, a wrapper only checks a flag before
+calling the original function; uninstrument_module removes the wrappers
+altogether. Statistics can be written as JSON or in the Prometheus text
+format. To run a script with modules instrumented:
+
+    python instrumentation.py --module path/to/arxiv_functions.py \\
+        --json stats.json --prometheus stats.prom script.py [args ...]
+"""
+import argparse
+from functools import wraps
+import importlib
+import inspect
+import json
+import os
+import random
+import runpy
+import sys
+import time
+from types import ModuleType
+from typing import Callable
+
+# The number of latencies kept per function, by reservoir sampling, to
+# estimate percentiles.
+SAMPLE_SIZE = 1024
+PERCENTILES = [0.5, 0.9, 0.99]
+
+_enabled = True
+_stats = {}
+_originals = {}
+_rng = random.Random(0)
+
+
+class FunctionStats:
+    """The statistics of the calls to one function."""
+
+    def __init__(self) -> None:
+        """Initialize the statistics of a function not yet called."""
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.sized_calls = 0
+        self.total_size = 0
+        self.max_size = 0
+        self.sample = []
+
+    def record(self, seconds: float, size: int) -> None:
+        """Record a call that took seconds seconds, with a first argument
+        of size size (None if it has no size).
+
+        >>> stats = FunctionStats()
+        >>> stats.record(0.5, 3)
+        >>> stats.record(1.5, None)
+        >>> stats.calls, stats.seconds, stats.max_size
+        (2, 2.0, 3)
+        """
+        self.calls += 1
+        self.seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+        if size is not None:
+            self.sized_calls += 1
+            self.total_size += size
+            if size > self.max_size:
+                self.max_size = size
+        if len(self.sample) < SAMPLE_SIZE:
+            self.sample.append(seconds)
+        else:
+            index = _rng.randrange(self.calls)
+            if index < SAMPLE_SIZE:
+                self.sample[index] = seconds
+
+    def get_percentile(self, fraction: float) -> float:
+        """Return the estimated latency below which fraction of the calls
+        finished, or 0.0 if there were no calls.
+
+        >>> stats = FunctionStats()
+        >>> for seconds in range(1, 101):
+        ...     stats.record(seconds, None)
+        >>> stats.get_percentile(0.5), stats.get_percentile(0.99)
+        (50, 99)
+        """
+        if not self.sample:
+            return 0.0
+        sample = sorted(self.sample)
+        return sample[max(0, min(len(sample) - 1,
+                                 round(fraction * len(sample)) - 1))]
+
+    def to_dict(self) -> dict:
+        """Return these statistics as a dict of numbers.
+
+        >>> FunctionStats().to_dict()['calls']
+        0
+        """
+        stats = {'calls': self.calls, 'seconds': self.seconds,
+                 'max_seconds': self.max_seconds,
+                 'mean_size': (self.total_size / self.sized_calls
+                               if self.sized_calls else None),
+                 'max_size': self.max_size}
+        for fraction in PERCENTILES:
+            stats['p{:g}'.format(fraction * 100)] = self.get_percentile(
+                fraction)
+        return stats
+
+
+def get_size(args: tuple) -> int:
+    """Return the length of the first argument in args, or None if there
+    is none or it has no length.
+
+    >>> get_size(([1, 2, 3], 'x'))
+    3
+    >>> get_size((5,)), get_size(())
+    (None, None)
+    """
+    if args:
+        try:
+            return len(args[0])
+        except TypeError:
+            pass
+    return None
+
+
+def instrument(function: Callable, name: str = None) -> Callable:
+    """Return a wrapper of function that records the statistics of its
+    calls under name (function's qualified name by default) while
+    instrumentation is enabled.
+
+    >>> reset()
+    >>> wrapped_sorted = instrument(sorted, 'sorted')
+    >>> wrapped_sorted([3, 1, 2])
+    [1, 2, 3]
+    >>> get_stats()['sorted']['calls']
+    1
+    """
+    if name is None:
+        name = function.__module__ + '.' + function.__qualname__
+    perf_counter = time.perf_counter
+
+    @wraps(function)
+    def wrapper(*args: object, **kwargs: object) -> object:
+        """Call function, recording the call if enabled."""
+        if not _enabled:
+            return function(*args, **kwargs)
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            seconds = perf_counter() - start
+            stats = _stats.get(name)
+            if stats is None:
+                stats = _stats[name] = FunctionStats()
+            stats.record(seconds, get_size(args))
+
+    return wrapper
+
+
+def instrument_module(module: ModuleType) -> list[str]:
+    """Replace each function defined in module (not imported into it) with
+    an instrumented wrapper, and return the names of the functions
+    replaced, in sorted order. Functions already instrumented are left
+    alone.
+
+    Docstring examples not given since the function changes a module.
+    """
+    names = []
+    for name, function in sorted(vars(module).items()):
+        if (inspect.isfunction(function)
+                and function.__module__ == module.__name__
+                and (module.__name__, name) not in _originals):
+            _originals[(module.__name__, name)] = function
+            setattr(module, name, instrument(
+                function, module.__name__ + '.' + name))
+            names.append(name)
+    return names
+
+
+def uninstrument_module(module: ModuleType) -> None:
+    """Put back the original functions of module replaced by
+    instrument_module.
+
+    Docstring examples not given since the function changes a module.
+    """
+    for key in [key for key in _originals if key[0] == module.__name__]:
+        setattr(module, key[1], _originals.pop(key))
+
+
+def enable() -> None:
+    """Start recording the calls to instrumented functions."""
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    """Stop recording the calls to instrumented functions.
+
+    >>> reset()
+    >>> disable()
+    >>> instrument(sorted, 'sorted')([2, 1])
+    [1, 2]
+    >>> get_stats()
+    {}
+    >>> enable()
+    """
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """Return True if and only if calls are being recorded.
+
+    >>> is_enabled()
+    True
+    """
+    return _enabled
+
+
+def reset() -> None:
+    """Forget the statistics recorded so far."""
+    _stats.clear()
+
+
+def get_stats() -> dict[str, dict]:
+    """Return a dict that maps the name of each function called while
+    instrumentation was enabled to its statistics, in sorted order.
+
+    >>> reset()
+    >>> instrument(len, 'len')('abc')
+    3
+    >>> stats = get_stats()['len']
+    >>> stats['calls'], stats['max_size']
+    (1, 3)
+    """
+    return {name: _stats[name].to_dict() for name in sorted(_stats)}
+
+
+def get_label(name: str) -> str:
+    """Return the Prometheus label for the function named name.
+
+    >>> print(get_label('tickets.get_date'))
+    function="tickets.get_date"
+    """
+    return 'function="{}"'.format(name.replace('\\', '\\\\').replace(
+        '"', '\\"').replace('\n', '\\n'))
+
+
+def to_prometheus() -> str:
+    """Return the statistics in the Prometheus text exposition format:
+    a summary of the latencies and a counter of the argument sizes per
+    function.
+
+    >>> reset()
+    >>> instrument(len, 'len')('abc')
+    3
+    >>> print(to_prometheus())  # doctest: +ELLIPSIS
+    # HELP function_seconds Latency of instrumented functions.
+    # TYPE function_seconds summary
+    function_seconds{function="len",quantile="0.5"} ...
+    function_seconds_count{function="len"} 1
+    # HELP function_input_size Total length of the first argument.
+    # TYPE function_input_size counter
+    function_input_size_total{function="len"} 3
+    <BLANKLINE>
+    """
+    stats = get_stats()
+    lines = ['# HELP function_seconds Latency of instrumented functions.',
+             '# TYPE function_seconds summary']
+    for name, function_stats in stats.items():
+        label = get_label(name)
+        for fraction in PERCENTILES:
+            lines.append('function_seconds{{{},quantile="{:g}"}} {!r}'.format(
+                label, fraction,
+                function_stats['p{:g}'.format(fraction * 100)]))
+        lines.append('function_seconds_sum{{{}}} {!r}'.format(
+            label, function_stats['seconds']))
+        lines.append('function_seconds_count{{{}}} {}'.format(
+            label, function_stats['calls']))
+    lines.extend(['# HELP function_input_size Total length of the first '
+                  'argument.', '# TYPE function_input_size counter'])
+    for name in stats:
+        lines.append('function_input_size_total{{{}}} {}'.format(
+            get_label(name), _stats[name].total_size))
+    return '\n'.join(lines) + '\n'
+
+
+def write_json(path: str) -> None:
+    """Write the statistics as JSON to the file at path.
+
+    Docstring examples not given since the function writes to a file.
+    """
+    with open(path, 'w', encoding='utf-8') as stats_file:
+        json.dump(get_stats(), stats_file, indent=2)
+
+
+def write_prometheus(path: str) -> None:
+    """Write the statistics in the Prometheus text format to the file at
+    path.
+
+    Docstring examples not given since the function writes to a file.
+    """
+    with open(path, 'w', encoding='utf-8') as stats_file:
+        stats_file.write(to_prometheus())
+
+
+def load_module(path: str) -> ModuleType:
+    """Return the module in the file at path, imported under its file name
+    with its directory added to the module search path, so that later
+    imports of the same name get the same module.
+
+    Docstring examples not given since the function reads from a file.
+    """
+    directory, file_name = os.path.split(os.path.abspath(path))
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    return importlib.import_module(os.path.splitext(file_name)[0])
+
+
+def main(argv: list[str] = None) -> None:
+    """Run a script with the modules given in the command line arguments
+    argv instrumented, then write the statistics.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--module', action='append', default=[],
+                        help='path of a module to instrument')
+    parser.add_argument('--json', help='write JSON statistics here')
+    parser.add_argument('--prometheus',
+                        help='write Prometheus statistics here')
+    parser.add_argument('script')
+    parser.add_argument('args', nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+
+    for path in args.module:
+        load_module(path)
+        instrument_module(sys.modules[os.path.splitext(
+            os.path.basename(path))[0]])
+    sys.argv = [args.script] + args.args
+    sys.path.insert(0, os.path.dirname(os.path.abspath(args.script)))
+    try:
+        runpy.run_path(args.script, run_name='__main__')
+    finally:
+        if args.json:
+            write_json(args.json)
+        if args.prometheus:
+            write_prometheus(args.prometheus)
+
+
+if __name__ == '__main__':
+    main()
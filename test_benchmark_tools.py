@@ -0,0 +1,85 @@
+"""Tests for the reports of the benchmark harnesses in benchmark_tools.
+
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+import benchmark_tools
+
+
+class TestFinishReport(unittest.TestCase):
+    """Test writing a report and comparing it against a baseline."""
+
+    def setUp(self):
+        """Create a temporary directory for the reports."""
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.parser = argparse.ArgumentParser()
+        benchmark_tools.add_report_arguments(self.parser)
+
+    def finish(self, seconds: float, *argv: str) -> tuple[int, str]:
+        """Return the exit status and printed output of finish_report for a
+        report of one case that took seconds seconds, with the command
+        line arguments argv.
+
+        """
+
+        report = {'results': [{'case': 'a', 'size': 10,
+                               'seconds': seconds}]}
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            status = benchmark_tools.finish_report(
+                report, self.parser.parse_args(argv))
+        return status, output.getvalue()
+
+    def test_baseline(self):
+        """Test that a report is written, and that a later report is
+        compared against it.
+
+        """
+
+        path = os.path.join(self.directory.name, 'baseline.json')
+        self.assertEqual(self.finish(1.0, '--output', path), (0, ''))
+        with open(path, encoding='utf-8') as baseline_file:
+            self.assertEqual(json.load(baseline_file)['results'][0]['case'],
+                             'a')
+        self.assertEqual(self.finish(1.1, '--baseline', path),
+                         (0, 'a @ 10: 1.0000s -> 1.1000s (x1.10)\n'))
+        status, output = self.finish(1.5, '--baseline', path)
+        self.assertEqual(status, 1)
+        self.assertTrue(output.endswith('REGRESSION\n'))
+        self.assertEqual(self.finish(1.5, '--baseline', path,
+                                     '--tolerance', '1')[0], 0)
+
+
+class TestTimeRepeated(unittest.TestCase):
+    """Test timing a case several times."""
+
+    def test_fresh_arguments(self):
+        """Test that the case is called repeat times, each time with fresh
+        arguments.
+
+        """
+
+        made = []
+
+        def make_args() -> tuple[list]:
+            """Return a fresh list as the only argument."""
+            made.append([])
+            return (made[-1],)
+
+        seconds, result = benchmark_tools.time_repeated(sorted, make_args, 4)
+        self.assertEqual(len(made), 4)
+        self.assertEqual(len({id(items) for items in made}), 4)
+        self.assertEqual(result, [])
+        self.assertGreaterEqual(seconds, 0)
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)
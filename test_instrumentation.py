@@ -0,0 +1,92 @@
+"""Tests for the instrumentation of assignment modules in instrumentation.
+
+"""
+
+import json
+import os
+import tempfile
+import unittest
+import instrumentation
+
+TICKETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            'Assignment 1 CSCA08', 'tickets.py')
+TICKET = '20230915YYZYEG12F1236'
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Test recording the calls to the functions in tickets."""
+
+    def setUp(self):
+        """Instrument tickets, with no statistics recorded."""
+
+        self.tickets = instrumentation.load_module(TICKETS_PATH)
+        self.original_get_date = self.tickets.get_date
+        self.names = instrumentation.instrument_module(self.tickets)
+        instrumentation.reset()
+        instrumentation.enable()
+        self.addCleanup(instrumentation.uninstrument_module, self.tickets)
+        self.addCleanup(instrumentation.reset)
+
+    def test_counts(self):
+        """Test that calls, including calls made inside the module, are
+        counted with the sizes of their first arguments.
+
+        """
+
+        self.assertIn('get_date', self.names)
+        self.assertNotIn('get_date', instrumentation.instrument_module(
+            self.tickets))
+        for _ in range(3):
+            self.assertEqual(self.tickets.get_date(TICKET), '20230915')
+        stats = instrumentation.get_stats()
+        self.assertEqual(stats['tickets.get_date']['calls'], 3)
+        self.assertEqual(stats['tickets.get_year']['calls'], 3)
+        self.assertEqual(stats['tickets.get_date']['max_size'], len(TICKET))
+        self.assertLessEqual(stats['tickets.get_date']['p50'],
+                             stats['tickets.get_date']['max_seconds'])
+
+    def test_disable(self):
+        """Test that nothing is recorded while disabled, and that
+        uninstrumenting puts back the original functions.
+
+        """
+
+        instrumentation.disable()
+        self.tickets.get_date(TICKET)
+        self.assertEqual(instrumentation.get_stats(), {})
+        instrumentation.enable()
+        instrumentation.uninstrument_module(self.tickets)
+        self.assertIs(self.tickets.get_date, self.original_get_date)
+        self.tickets.get_date(TICKET)
+        self.assertEqual(instrumentation.get_stats(), {})
+
+    def test_exceptions(self):
+        """Test that calls that raise an exception are recorded."""
+
+        with self.assertRaises(ValueError):
+            self.tickets.is_valid_date('YYYYMMDD')
+        self.assertEqual(
+            instrumentation.get_stats()['tickets.is_valid_date']['calls'], 1)
+
+    def test_export(self):
+        """Test writing the statistics as JSON and Prometheus text."""
+
+        self.tickets.get_date(TICKET)
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = os.path.join(directory, 'stats.json')
+            prometheus_path = os.path.join(directory, 'stats.prom')
+            instrumentation.write_json(json_path)
+            instrumentation.write_prometheus(prometheus_path)
+            with open(json_path, encoding='utf-8') as stats_file:
+                self.assertEqual(json.load(stats_file),
+                                 instrumentation.get_stats())
+            with open(prometheus_path, encoding='utf-8') as stats_file:
+                lines = stats_file.read().splitlines()
+        self.assertIn('function_seconds_count{function="tickets.get_date"} 1',
+                      lines)
+        self.assertIn('function_input_size_total'
+                      '{function="tickets.get_day"} 21', lines)
+
+
+if __name__ == '__main__':
+    unittest.main(exit=False)